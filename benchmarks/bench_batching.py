@@ -0,0 +1,59 @@
+"""Compares CPU time per decision of CloseFoodAgents hosted by one process, deciding one by one or in batches.
+Every bot has its own decision thread, like bots spawned with bots_per_process, and all bots are woken up on every tick.
+
+	python -m benchmarks.bench_batching --bots 1 10 50 --food 200 --ticks 200
+"""
+import argparse
+import threading
+from time import perf_counter, process_time
+
+import numpy as np
+
+from src import CloseFoodAgent
+from src.base.replay import _unwrapped
+
+
+def states(count: int, food: int, players: int, board: int =1000):
+	rng = np.random.default_rng(2137)
+	food_list = rng.integers(0, board, (food, 2)).tolist()
+	others = [{"n": f"p{i}", "x": int(rng.integers(board)), "y": int(rng.integers(board)), "r": int(rng.integers(5, 40))} for i in range(players)]
+	return [{"p": {"n": f"bot{i}", "x": int(rng.integers(board)), "y": int(rng.integers(board)), "r": int(rng.integers(5, 40))},
+			 "ps": others, "f": food_list, "b": [board, board], "delta": 0.05, "d": False} for i in range(count)]
+
+def measure(count: int, food: int, players: int, ticks: int, batched: bool):
+	agents = [CloseFoodAgent(np.random.default_rng(i), batched=batched) for i in range(count)]
+	for agent, state in zip(agents, states(count, food, players)):
+		_unwrapped(agent, "handle_new_states")(state)
+	barrier = threading.Barrier(count + 1)
+
+	def play(agent):
+		choose_action = _unwrapped(agent, "choose_action")
+		for _ in range(ticks):
+			barrier.wait()
+			choose_action()
+
+	threads = [threading.Thread(target=play, args=(agent,), daemon=True) for agent in agents]
+	for thread in threads: thread.start()
+	start, cpu_start = perf_counter(), process_time()
+	for _ in range(ticks):
+		barrier.wait()
+	for thread in threads: thread.join()
+	wall, cpu = perf_counter() - start, process_time() - cpu_start
+	return cpu / (count * ticks), count * ticks / wall
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--bots", type=int, nargs="+", default=[1, 10, 50])
+	parser.add_argument("--food", type=int, default=200)
+	parser.add_argument("--players", type=int, default=20)
+	parser.add_argument("--ticks", type=int, default=200)
+	args = parser.parse_args()
+
+	print(f"{'bots':>6}{'mode':>10}{'CPU us/decision':>18}{'decisions/s':>14}")
+	for count in args.bots:
+		for batched in (False, True):
+			cpu, rate = measure(count, args.food, args.players, args.ticks, batched)
+			print(f"{count:>6}{'batched' if batched else 'single':>10}{1e6 * cpu:>18.1f}{rate:>14.1f}")
+
+if __name__ == "__main__":
+	main()
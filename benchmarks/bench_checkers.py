@@ -0,0 +1,92 @@
+"""Compares move generation of CheckersBoard and BitboardCheckersBoard on positions of random games, and nodes per second
+of a walk of the game tree from the initial position with copied boards (make_move) and with push/pop.
+
+	python -m benchmarks.bench_checkers --games 20 --depth 5
+"""
+import argparse
+from time import perf_counter
+from timeit import timeit
+
+import numpy as np
+
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.checkers_board import CheckersBoard
+from src.checkers.checkers_board import initial_board
+
+
+def positions(games: int):
+	"""Returns states of random games between both players."""
+	rng = np.random.default_rng(2137)
+	states = []
+	for _ in range(games):
+		board = CheckersBoard({"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True})
+		for _ in range(200):
+			moves = board.get_possible_moves()
+			if not moves or board.get_win(): break
+			states.append({"board": board.board, "player": board.current_player, "last_move": board.last_move,
+						   "game_status": "playing", "your_move": True})
+			board = board.make_move(moves[rng.integers(len(moves))])
+	return states
+
+def per_position(function, boards, number: int) -> float:
+	return timeit(lambda: [function(board) for board in boards], number=number) / number / max(1, len(boards))
+
+def bitboard_moves(board: BitboardCheckersBoard):
+	board._moves = None
+	return board.moves()
+
+def bitboard_lists(board: BitboardCheckersBoard):
+	board._moves = None
+	return board.get_possible_moves()
+
+def walk_copies(board, depth: int) -> int:
+	"""Returns count of nodes of the game tree, every node is a new board."""
+	if depth == 0: return 1
+	return 1 + sum(walk_copies(board.make_move(move), depth - 1) for move in board.get_possible_moves())
+
+def walk_in_place(board, depth: int) -> int:
+	"""Returns count of nodes of the game tree, moves are pushed and popped on the same board."""
+	if depth == 0: return 1
+	nodes = 1
+	for move in (board.moves() if isinstance(board, BitboardCheckersBoard) else board.get_possible_moves()):
+		board.push(move)
+		nodes += walk_in_place(board, depth - 1)
+		board.pop()
+	return nodes
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--games", type=int, default=20)
+	parser.add_argument("--depth", type=int, default=5, help="depth of the walk of the game tree")
+	args = parser.parse_args()
+
+	states = positions(args.games)
+	with_jumps = [bool(CheckersBoard(state).get_possible_multi_jump_moves()) for state in states]
+	rows = {}
+	for jumps in (False, True):
+		selected = [state for state, has_jumps in zip(states, with_jumps) if has_jumps == jumps]
+		boards, bitboards = [CheckersBoard(state) for state in selected], [BitboardCheckersBoard(state) for state in selected]
+		first = {id(board): board.get_possible_moves()[0] for board in boards}
+		first.update((id(bitboard), first[id(board)]) for board, bitboard in zip(boards, bitboards))
+		make_move = lambda board: board.make_move(first[id(board)])
+		rows.setdefault("reference moves", []).append(per_position(CheckersBoard.get_possible_moves, boards, 1))
+		rows.setdefault("bitboard moves (squares)", []).append(per_position(bitboard_moves, bitboards, 10))
+		rows.setdefault("bitboard moves (coordinates)", []).append(per_position(bitboard_lists, bitboards, 10))
+		rows.setdefault("reference make_move", []).append(per_position(make_move, boards, 1))
+		rows.setdefault("bitboard make_move", []).append(per_position(make_move, bitboards, 10))
+
+	print(f"{len(states)} positions, {sum(with_jumps)} with jumps")
+	print(f"{'us per position':<30}{'quiet':>10}{'jumps':>10}")
+	for name, (quiet, jumps) in rows.items():
+		print(f"{name:<30}{1e6 * quiet:>10.2f}{1e6 * jumps:>10.2f}")
+
+	initial = {"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True}
+	print(f"\n{'walk to depth ' + str(args.depth):<30}{'nodes':>10}{'nodes/s':>12}")
+	for name, walk, board_type in (("CheckersBoard make_move", walk_copies, CheckersBoard), ("CheckersBoard push/pop", walk_in_place, CheckersBoard),
+								   ("bitboard make_move", walk_copies, BitboardCheckersBoard), ("bitboard push/pop", walk_in_place, BitboardCheckersBoard)):
+		start = perf_counter()
+		nodes = walk(board_type(initial), args.depth)
+		print(f"{name:<30}{nodes:>10}{nodes / (perf_counter() - start):>12.0f}")
+
+if __name__ == "__main__":
+	main()
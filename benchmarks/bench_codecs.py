@@ -0,0 +1,86 @@
+"""Compares wire codecs on agarnt and checkers frames: size of frame and time of encoding and decoding.
+Frames are synthesized to resemble the ones sent by the server.
+
+	python -m benchmarks.bench_codecs --food 200 1000 --repeat 2000
+"""
+import argparse
+import gzip
+from timeit import timeit
+
+import numpy as np
+import orjson
+
+from src.base.codec import RawCodec, GzipCodec, ZlibCodec, MsgpackCodec
+
+
+class _GzipModuleCodec:
+	"""Former hardwired format of frames: gzip module and orjson."""
+
+	def encode(self, obj): return gzip.compress(orjson.dumps(obj))
+
+	def decode(self, data): return orjson.loads(gzip.decompress(data))
+
+
+def agarnt_frames(food: int, count: int =32, players: int =10, board=(1000, 1000)):
+	rng = np.random.default_rng(2137)
+	return [{
+		"p": {"n": "bot", "x": int(rng.integers(board[0])), "y": int(rng.integers(board[1])), "r": 10},
+		"ps": [{"n": f"p{i}", "x": int(rng.integers(board[0])), "y": int(rng.integers(board[1])), "r": int(rng.integers(5, 50))}
+			   for i in range(players)],
+		"f": rng.integers(0, board[0], size=(food, 2)).tolist(),
+		"b": list(board),
+		"delta": 0.05,
+		"d": False
+	} for _ in range(count)]
+
+def checkers_frames(count: int =32):
+	board = [[" "] * 8 for _ in range(8)]
+	for x in range(8):
+		for y in range(8):
+			if (x + y) % 2 == 1 and x < 3: board[x][y] = "r"
+			if (x + y) % 2 == 1 and x > 4: board[x][y] = "a"
+	return [{"board": board, "player": "r", "last_move": [[2, 1], [3, 2]], "game_status": "playing", "your_move": bool(i % 2)}
+			for i in range(count)]
+
+def codecs():
+	result = {"gzip module (former)": _GzipModuleCodec, "gzip": GzipCodec, "gzip level 1": lambda: GzipCodec(1),
+			  "zlib raw": ZlibCodec, "zlib stream": lambda: ZlibCodec(stream=True), "raw": RawCodec}
+	try:
+		MsgpackCodec()
+		result["msgpack"] = MsgpackCodec
+	except ImportError: pass
+	return result
+
+def measure(name, make_codec, frames, repeat):
+	sender, receiver = make_codec(), make_codec()
+	encoded = [sender.encode(frame) for frame in frames]
+	views = [memoryview(frame) for frame in encoded]
+	size = sum(map(len, encoded)) / len(encoded)
+
+	fresh = make_codec()
+	encode = timeit(lambda: [fresh.encode(frame) for frame in frames], number=max(1, repeat // len(frames)))
+	if isinstance(receiver, ZlibCodec) and receiver._stream:
+		# stream decompressor cannot rewind, so decoding of every frame is timed once per fresh stream
+		def decode():
+			r = make_codec()
+			[r.decode(view) for view in views]
+	else:
+		decode = lambda: [receiver.decode(view) for view in views]
+	decode_time = timeit(decode, number=max(1, repeat // len(frames)))
+	calls = max(1, repeat // len(frames)) * len(frames)
+	print(f"{name:<24}{size:>12.0f}{1e6 * encode / calls:>14.1f}{1e6 * decode_time / calls:>14.1f}")
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--food", type=int, nargs="+", default=[200, 1000])
+	parser.add_argument("--repeat", type=int, default=2000)
+	args = parser.parse_args()
+
+	suites = [(f"agarnt, {food} food", agarnt_frames(food)) for food in args.food] + [("checkers", checkers_frames())]
+	for title, frames in suites:
+		print(f"\n{title}\n{'codec':<24}{'bytes/frame':>12}{'encode us':>14}{'decode us':>14}")
+		for name, make_codec in codecs().items():
+			measure(name, make_codec, frames, args.repeat)
+
+if __name__ == "__main__":
+	main()
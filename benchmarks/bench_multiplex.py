@@ -0,0 +1,64 @@
+"""Compares per-bot memory and decisions per second of one-process-per-bot model with bots multiplexed
+on a single event-loop per worker process. Memory is read from procfs, so the benchmark runs on Linux only.
+
+	python -m benchmarks.bench_multiplex --count 20 --bots-per-process 10 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+from time import perf_counter, sleep
+
+import numpy as np
+
+from src import spawn_bots, RandomAgent
+from src import _set_var
+from src.localserver import LocalServer
+
+
+def _memory_of(pid: int, key: str) -> int:
+	"""Returns a memory counter of a process in kB, read from procfs (Linux only)."""
+	for path in (f"/proc/{pid}/smaps_rollup", f"/proc/{pid}/status"):
+		try:
+			with open(path) as file:
+				for line in file:
+					if line.startswith(key):
+						return int(line.split()[1])
+		except OSError: continue
+	return 0
+
+def _measure(server: LocalServer, session_id: str, count: int, bots_per_process: int, warmup: float, duration: float):
+	manager = spawn_bots(f"ws://127.0.0.1:{server.port}", session_id, RandomAgent, count,
+						 bots_per_process=bots_per_process, generator=np.random.default_rng(2137))
+	sleep(warmup)
+	pids = [child.pid for child in multiprocessing.active_children()]
+	rss = sum(_memory_of(pid, "VmRSS") for pid in pids)
+	pss = sum(_memory_of(pid, "Pss:") for pid in pids)
+
+	actions, start = server.actions, perf_counter()
+	sleep(duration)
+	rate = (server.actions - actions) / (perf_counter() - start)
+	manager.terminate(5)
+	return len(pids), rss / count, pss / count, rate
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--count", type=int, default=20)
+	parser.add_argument("--bots-per-process", type=int, default=10)
+	parser.add_argument("--warmup", type=float, default=3.0)
+	parser.add_argument("--duration", type=float, default=10.0)
+	parser.add_argument("--port", type=int, default=int(os.environ.get("WS_PORT", 2137)))
+	args = parser.parse_args()
+
+	_set_var("game_type", "agarnt")
+	server = LocalServer(port=args.port, http_port=None)
+	server.start()
+	server.wait_ready()
+	session_id = server.create_game("bench_multiplex", "agarnt")
+
+	print(f"{'model':<28}{'processes':>10}{'RSS/bot kB':>14}{'PSS/bot kB':>14}{'decisions/s':>14}")
+	for name, bots_per_process in (("process per bot", 1), (f"{args.bots_per_process} bots per process", args.bots_per_process)):
+		processes, rss, pss, rate = _measure(server, session_id, args.count, bots_per_process, args.warmup, args.duration)
+		print(f"{name:<28}{processes:>10}{rss:>14.0f}{pss:>14.0f}{rate:>14.2f}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,44 @@
+"""Measures speedup of the parallel root search of checkers over the serial one: every count of workers searches
+the same suite of positions to the same depth, and time is compared with the search in a single process.
+
+	python -m benchmarks.bench_parallel_search --workers 4 --depth 8 --positions 5
+"""
+import argparse
+import os
+from time import perf_counter
+
+from benchmarks.bench_search import positions
+from src.checkers.parallel import ParallelSearch
+from src.checkers.search import AlphaBetaSearch
+
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="greatest count of workers")
+	parser.add_argument("--depth", type=int, default=8, help="fixed depth of every search")
+	parser.add_argument("--positions", type=int, default=5)
+	parser.add_argument("--table-size", type=int, default=1 << 18)
+	args = parser.parse_args()
+
+	boards = positions(args.positions)
+	start = perf_counter()
+	for board in boards:
+		AlphaBetaSearch(args.table_size).search(board, None, args.depth)
+	serial = perf_counter() - start
+
+	print(f"{os.cpu_count()} cores, {len(boards)} positions to depth {args.depth}")
+	print(f"{'workers':>8}{'seconds':>10}{'nodes':>10}{'speedup':>9}")
+	print(f"{'serial':>8}{serial:>10.2f}{'':>10}{1.0:>9.2f}")
+	for workers in range(1, args.workers + 1):
+		search = ParallelSearch(workers, args.table_size)
+		search.start()
+		nodes, start = 0, perf_counter()
+		for board in boards:
+			search.search(board, None, args.depth)
+			nodes += search.nodes
+		elapsed = perf_counter() - start
+		search.close()
+		print(f"{workers:>8}{elapsed:>10.2f}{nodes:>10}{serial / elapsed:>9.2f}")
+
+if __name__ == "__main__":
+	main()
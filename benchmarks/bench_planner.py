@@ -0,0 +1,48 @@
+"""Measures decision time of GradAgent planning k steps ahead, with all 8^k sequences or a beam, and the depth
+reached within a time budget.
+
+	python -m benchmarks.bench_planner --depth 1 2 3 4 --beam 64 --budget 0.005 --food 5000
+"""
+import argparse
+from timeit import timeit
+
+import numpy as np
+
+from src import GradAgent
+from src.base.replay import _unwrapped
+
+
+def state(food: int, players: int, board: int):
+	rng = np.random.default_rng(2137)
+	return {"p": {"n": "bot", "x": board // 2, "y": board // 2, "r": 10},
+			"ps": [{"n": f"p{i}", "x": int(rng.integers(board)), "y": int(rng.integers(board)), "r": int(rng.integers(5, 30))} for i in range(players)],
+			"f": rng.integers(0, board, (food, 2)).tolist(), "b": [board, board], "delta": 0.05, "d": False}
+
+def measure(game_state, repeat: int, **kwds):
+	agent = GradAgent(np.random.default_rng(0), **kwds)
+	_unwrapped(agent, "handle_new_states")(game_state)
+	choose_action = _unwrapped(agent, "choose_action")
+	elapsed = timeit(choose_action, number=repeat) / repeat
+	planner = agent._GradAgent__planner
+	return elapsed, planner.reached, planner.evaluated
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--depth", type=int, nargs="+", default=[1, 2, 3, 4])
+	parser.add_argument("--beam", type=int, default=64)
+	parser.add_argument("--budget", type=float, default=0.005, help="time budget of a decision in seconds")
+	parser.add_argument("--food", type=int, default=5000)
+	parser.add_argument("--players", type=int, default=20)
+	parser.add_argument("--board", type=int, default=2000)
+	parser.add_argument("--repeat", type=int, default=20)
+	args = parser.parse_args()
+
+	game_state = state(args.food, args.players, args.board)
+	print(f"{'depth':>6}{'mode':>10}{'ms/decision':>14}{'reached':>9}{'points':>9}")
+	for depth in args.depth:
+		for mode, kwds in (("full", {}), ("beam", {"beam": args.beam}), ("budget", {"beam": args.beam, "budget": args.budget})):
+			elapsed, reached, evaluated = measure(game_state, args.repeat, depth=depth, **kwds)
+			print(f"{depth:>6}{mode:>10}{1e3 * elapsed:>14.2f}{reached:>9}{evaluated:>9}")
+
+if __name__ == "__main__":
+	main()
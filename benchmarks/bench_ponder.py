@@ -0,0 +1,59 @@
+"""Measures what pondering gives AlphaBetaBot: the same game is played by a bot that ponders for as long as the opponent
+thinks and by a bot that does not, and depths reached within the budget of a move and the hit rate of expected replies are compared.
+
+	python -m benchmarks.bench_ponder --budget 0.5 --moves 10
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+
+from src.base.replay import _unwrapped
+from src.checkers.alphabeta_bot import AlphaBetaBot
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.search import AlphaBetaSearch
+from src.checkers.checkers_board import initial_board
+
+
+def play(pondering: bool, budget: float, moves: int):
+	"""Returns depths reached by the bot in its moves, count of ponders and count of hits."""
+	bot = AlphaBetaBot(np.random.default_rng(0), budget=budget, pondering=pondering)
+	opponent = AlphaBetaSearch()
+	board = BitboardCheckersBoard({"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True})
+	handle_new_states, choose_action = _unwrapped(bot, "handle_new_states"), _unwrapped(bot, "choose_action")
+	depths = []
+	for _ in range(moves):
+		state = board.to_state()
+		handle_new_states(state)
+		move = choose_action().chosen_move
+		if not move: break
+		depths.append(bot.search.depth)
+		board = board.make_move(move)
+		if not board.moves(): break
+
+		state = board.to_state()
+		state["your_move"] = False
+		handle_new_states(state)
+		# the bot ponders while the opponent thinks, as they would run on different machines
+		deadline = perf_counter() + budget
+		bot.ponder(lambda: perf_counter() > deadline)
+		reply = opponent.search(board, budget)
+		if reply is None: break
+		board.push(reply)
+		board.steps_without_hitting = {"r": 0, "a": 0}
+		if not board.moves(): break
+	return depths, bot.ponders, bot.ponder_hits
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--budget", type=float, default=0.5, help="time budget of a move in seconds")
+	parser.add_argument("--moves", type=int, default=10, help="count of moves of the bot")
+	args = parser.parse_args()
+
+	print(f"{'':<12}{'moves':>7}{'mean depth':>12}{'max depth':>11}{'ponders':>9}{'hits':>6}")
+	for name, pondering in (("no ponder", False), ("ponder", True)):
+		depths, ponders, hits = play(pondering, args.budget, args.moves)
+		print(f"{name:<12}{len(depths):>7}{np.mean(depths):>12.2f}{max(depths):>11}{ponders:>9}{hits:>6}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,85 @@
+"""Compares evaluation of the potential of GradAgent at its 8 candidate points. Food: rasterization of the whole board,
+like GradAgent did every tick, sparse evaluation at the points, and sparse evaluation of food found by the grid index
+of an incremental observation, with a few changed food per tick. Players: a Gaussian rasterized over the whole board per
+player, like the former commented out terms, and Gaussians evaluated in closed form at the points.
+
+	python -m benchmarks.bench_potential --board 500 2000 5000 --food 1000 --players 20
+"""
+import argparse
+from time import perf_counter
+from timeit import timeit
+
+import numpy as np
+
+from src import AgarntObservation
+from src.agarnt.potential import FoodPotential, PlayersPotential
+
+
+def state(food, board):
+	return {"p": {"n": "bot", "x": board // 2, "y": board // 2, "r": 20}, "ps": [], "f": food, "b": [board, board], "delta": 0.05, "d": False}
+
+def dense_players(players_xy, players_r, radius, board, points):
+	"""Rasterizes Gaussians of players over the whole board, summing repulsions and taking minimum of attractions."""
+	x = np.arange(board, dtype=np.float64)
+	repulsion, attraction = np.zeros((board, board)), np.zeros((board, board))
+	for (px, py), r in zip(players_xy.tolist(), players_r.tolist()):
+		threat = r >= radius
+		fwhm = r * (2 if threat else 15)
+		values = (5 if threat else -5) * np.exp(-4 * np.log(2) * ((x[:, None] - px)**2 + (x[None, :] - py)**2) / fwhm**2)
+		if threat: repulsion += values
+		else: np.fmin(attraction, values, out=attraction)
+	return repulsion[points[:, 0], points[:, 1]], attraction[points[:, 0], points[:, 1]]
+
+def measure(board: int, food: int, players: int, changes: int, repeat: int):
+	rng = np.random.default_rng(2137)
+	food_list = rng.integers(0, board, (food, 2)).tolist()
+	positions = np.array(food_list)
+	players_xy, players_r = rng.integers(0, board, (players, 2)), rng.integers(5, 60, players)
+	center = board // 2
+	points = np.array([(center + dx, center + dy) for dx in (-15, 0, 15) for dy in (-15, 0, 15) if dx or dy])
+	field, players_field = FoodPotential(), PlayersPotential()
+
+	def dense():
+		values = field.dense(positions, (board, board))
+		return values[points[:, 0], points[:, 1]]
+
+	observation = AgarntObservation(incremental=True).update(state(food_list, board))
+	observation.food_index
+
+	def incremental(number: int) -> float:
+		"""Returns mean time of evaluation, without updating the observation itself."""
+		elapsed = 0.0
+		for _ in range(number):
+			for _ in range(changes):
+				food_list[rng.integers(food)] = rng.integers(0, board, 2).tolist()
+			observation.update(state(food_list, board))
+			start = perf_counter()
+			field.near(observation.food_index, points)
+			elapsed += perf_counter() - start
+		return elapsed / number
+
+	assert np.array_equal(dense(), field.at(positions, points))
+	assert np.allclose(dense_players(players_xy, players_r, 20, board, points), players_field.at(players_xy, players_r, 20, points))
+	number = max(1, repeat // 20)
+	return {"food dense": timeit(dense, number=number) / number,
+			"food sparse": timeit(lambda: field.at(positions, points), number=repeat) / repeat,
+			"food incremental index": incremental(number),
+			"players dense": timeit(lambda: dense_players(players_xy, players_r, 20, board, points), number=1),
+			"players closed form": timeit(lambda: players_field.at(players_xy, players_r, 20, points), number=repeat) / repeat}
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--board", type=int, nargs="+", default=[500, 2000, 5000])
+	parser.add_argument("--food", type=int, default=1000)
+	parser.add_argument("--players", type=int, default=20)
+	parser.add_argument("--changes", type=int, default=5, help="count of food eaten and respawned per tick")
+	parser.add_argument("--repeat", type=int, default=200)
+	args = parser.parse_args()
+
+	rows = {board: measure(board, args.food, args.players, args.changes, args.repeat) for board in args.board}
+	print(f"{'method (us per tick)':<30}" + "".join(f"{board:>12}" for board in args.board))
+	for method in next(iter(rows.values())):
+		print(f"{method:<30}" + "".join(f"{1e6 * rows[board][method]:>12.1f}" for board in args.board))
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,63 @@
+"""Measures decisions per second and latency of stages of agarnt agents on recorded frames. If the recording does not exist,
+a game of a RandomAgent on the local server is recorded first, so every run of agents uses the same states.
+
+	python -m benchmarks.bench_replay --recording records/agarnt.bbr --record-duration 10 --agents CloseFoodAgent GradAgent
+"""
+import argparse
+import os
+import shutil
+import tempfile
+from time import sleep
+
+import numpy as np
+
+from src import spawn_bots, set_connection_options, RandomAgent, CloseFoodAgent, GradAgent
+from src import _set_var
+from src.base.replay import Recording, replay
+from src.localserver import LocalServer
+
+_AGENTS = {"RandomAgent": RandomAgent, "CloseFoodAgent": CloseFoodAgent, "GradAgent": GradAgent}
+
+
+def record(path: str, duration: float, port: int, food: int, players: int):
+	"""Records frames obtained by a single bot playing on the local server."""
+	server = LocalServer(port=port, http_port=None, food=food, players=players, seed=2137)
+	server.start()
+	server.wait_ready()
+	session_id = server.create_game("bench_replay", "agarnt")
+
+	with tempfile.TemporaryDirectory() as directory:
+		set_connection_options(record_path=os.path.join(directory, "bot.bbr"))
+		manager = spawn_bots(f"ws://127.0.0.1:{port}", session_id, RandomAgent, 1, generator=np.random.default_rng(2137))
+		sleep(duration)
+		manager.terminate(5)
+		set_connection_options(record_path=None)
+		server.stop()
+		if os.path.dirname(path): os.makedirs(os.path.dirname(path), exist_ok=True)
+		shutil.move(os.path.join(directory, "bot.bbr"), path)
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--recording", default="records/agarnt.bbr")
+	parser.add_argument("--record-duration", type=float, default=10.0)
+	parser.add_argument("--food", type=int, default=200)
+	parser.add_argument("--players", type=int, default=10)
+	parser.add_argument("--agents", nargs="+", default=list(_AGENTS), choices=list(_AGENTS))
+	parser.add_argument("--pace", type=float, default=None, help="speed relative to the original pace, full speed by default")
+	parser.add_argument("--port", type=int, default=int(os.environ.get("WS_PORT", 2137)))
+	args = parser.parse_args()
+
+	_set_var("game_type", "agarnt")
+	if not os.path.exists(args.recording):
+		record(args.recording, args.record_duration, args.port, args.food, args.players)
+
+	with Recording(args.recording) as recording:
+		print(f"{len(recording)} frames recorded in {recording.duration:.1f} s")
+		print(f"{'agent':<16}{'decisions/s':>14}{'decode p50 ms':>15}{'handle p50 ms':>15}{'choose p50 ms':>15}{'choose p99 ms':>15}{'decision p99 ms':>17}")
+		for name in args.agents:
+			result = replay(_AGENTS[name](np.random.default_rng(2137)), recording, args.pace)
+			print(f"{name:<16}{result['decisions_per_second']:>14.1f}{result['decode_p50_ms']:>15.3f}{result['handle_p50_ms']:>15.3f}"
+				  f"{result['choose_action_p50_ms']:>15.3f}{result['choose_action_p99_ms']:>15.3f}{result['decision_p99_ms']:>17.3f}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,46 @@
+"""Measures throughput of the checkers alpha-beta search: nodes per second and depth reached within a time budget
+on the initial position and on positions of random games, so it can be compared across releases.
+
+	python -m benchmarks.bench_search --budget 1.0 --positions 5
+"""
+import argparse
+
+import numpy as np
+
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.search import AlphaBetaSearch
+from src.checkers.checkers_board import initial_board
+
+
+def positions(count: int, plies: int =20):
+	"""Returns the initial position and positions after random plies of random games."""
+	rng = np.random.default_rng(2137)
+	initial = {"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True}
+	boards = [BitboardCheckersBoard(initial)]
+	while len(boards) < count:
+		board = BitboardCheckersBoard(initial)
+		for _ in range(plies):
+			moves = board.moves()
+			if not moves: break
+			board = board.make_move(moves[rng.integers(len(moves))])
+		if board.moves(): boards.append(board)
+	return boards
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--budget", type=float, default=1.0, help="time budget of a search in seconds")
+	parser.add_argument("--positions", type=int, default=5)
+	parser.add_argument("--table-size", type=int, default=1 << 18)
+	args = parser.parse_args()
+
+	print(f"{'position':>9}{'depth':>7}{'nodes':>10}{'nodes/s':>10}{'score':>8}")
+	nodes = elapsed = 0
+	for index, board in enumerate(positions(args.positions)):
+		search = AlphaBetaSearch(args.table_size)
+		search.search(board, args.budget)
+		nodes, elapsed = nodes + search.nodes, elapsed + search.elapsed
+		print(f"{index:>9}{search.depth:>7}{search.nodes:>10}{search.nodes_per_second:>10.0f}{search.score:>8}")
+	print(f"{'total':>9}{'':>7}{nodes:>10}{nodes / elapsed:>10.0f}")
+
+if __name__ == "__main__":
+	main()
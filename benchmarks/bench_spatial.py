@@ -0,0 +1,81 @@
+"""Compares nearest-food queries of CloseFoodAgent: the former Python scan with euclidean_dist, a vectorized NumPy scan
+and the grid index, rebuilt every tick or moved incrementally with a few changed food per tick. Cost of diffing
+food into slots of incremental observation is reported separately.
+
+	python -m benchmarks.bench_spatial --food 1000 10000 50000 --changes 5
+"""
+import argparse
+from time import perf_counter
+from timeit import timeit
+
+import numpy as np
+
+from src import AgarntObservation
+from src.agarnt.close_food_agent import euclidean_dist
+from src.agarnt.spatial import GridIndex
+
+
+def python_scan(food, player):
+	near_food = next(iter(food), None)
+	for f in food:
+		if euclidean_dist(f[0], f[1], player[0], player[1]) < euclidean_dist(near_food[0], near_food[1], player[0], player[1]):
+			near_food = f
+	return near_food
+
+def numpy_scan(food: np.ndarray, player):
+	return food[np.argmin(np.hypot(food[:, 0] - player[0], food[:, 1] - player[1]))]
+
+def state(food, board):
+	return {"p": {"n": "bot", "x": board // 2, "y": board // 2, "r": 10}, "ps": [], "f": food, "b": [board, board], "delta": 0.05, "d": False}
+
+def measure(count: int, changes: int, board: int, repeat: int):
+	rng = np.random.default_rng(2137)
+	food = rng.integers(0, board, (count, 2)).tolist()
+	player = (board // 2, board // 2)
+	array = np.array(food)
+	results = {}
+
+	number = max(1, repeat // 50) if count > 5000 else repeat
+	results["python scan"] = timeit(lambda: python_scan(food, player), number=max(1, number // 20)) / max(1, number // 20)
+	results["numpy scan"] = timeit(lambda: numpy_scan(array, player), number=repeat) / repeat
+
+	index = GridIndex()
+	results["grid rebuild + query"] = timeit(lambda: (index.rebuild(array), index.nearest(player)), number=number) / number
+	results["grid query"] = timeit(lambda: index.nearest(player), number=repeat) / repeat
+
+	def ticks(observation: AgarntObservation, query: bool):
+		"""Returns mean time of update of observation and mean time of update of index and query."""
+		observation.update(state(food, board))
+		if query: observation.food_index
+		updates = queries = 0.0
+		for _ in range(number):
+			for _ in range(changes):
+				food[rng.integers(count)] = rng.integers(0, board, 2).tolist()
+			start = perf_counter()
+			observation.update(state(food, board))
+			updated = perf_counter()
+			if query: observation.food_index.nearest(player)
+			updates, queries = updates + updated - start, queries + perf_counter() - updated
+		return updates / number, queries / number
+
+	columnar, _ = ticks(AgarntObservation(), False)
+	incremental, query = ticks(AgarntObservation(incremental=True), True)
+	results["slots sync (per tick)"] = incremental - columnar
+	results["incremental index + query"] = query
+	return results
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--food", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+	parser.add_argument("--changes", type=int, default=5, help="count of food eaten and respawned per tick")
+	parser.add_argument("--board", type=int, default=1000)
+	parser.add_argument("--repeat", type=int, default=200)
+	args = parser.parse_args()
+
+	rows = {count: measure(count, args.changes, args.board, args.repeat) for count in args.food}
+	print(f"{'method (us per tick)':<30}" + "".join(f"{count:>12}" for count in args.food))
+	for method in next(iter(rows.values())):
+		print(f"{method:<30}" + "".join(f"{1e6 * rows[count][method]:>12.1f}" for count in args.food))
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,80 @@
+"""Measures the endgame tablebase and the opening book of checkers: time of a probe of the memory-mapped files,
+and depth, score and nodes of searches of endgames with and without the tablebase. Missing files are generated first.
+
+	python -m benchmarks.bench_tablebase --tablebase tablebases/checkers_3.bbtb --book tablebases/checkers.bbob --budget 1.0
+"""
+import argparse
+import os
+from time import perf_counter
+from timeit import timeit
+
+import numpy as np
+
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.book import OpeningBook, build_book
+from src.checkers.search import AlphaBetaSearch
+from src.checkers.tablebase import EndgameTablebase, _positions, _signatures, build_tablebase
+from src.checkers.checkers_board import initial_board
+
+
+def endgames(tablebase: EndgameTablebase, count: int):
+	"""Returns random positions with the most pieces of the tablebase, that the player to move wins."""
+	rng = np.random.default_rng(2137)
+	signatures = [signature for signature in _signatures(tablebase.pieces) if sum(signature) == tablebase.pieces]
+	boards = []
+	while len(boards) < count:
+		candidates = list(_positions(signatures[rng.integers(len(signatures))]))
+		red, ai, kings = candidates[rng.integers(len(candidates))]
+		board = BitboardCheckersBoard.from_bitboards(red, ai, kings, "r")
+		value = tablebase.probe(board)
+		# longer wins may be draws by moves without hitting, then the tablebase is not used
+		if value is not None and value[0] == 1 and 5 < value[1] < 19: boards.append(board)
+	return boards
+
+def book_line(book: OpeningBook):
+	"""Returns positions of the game that follows book moves from the initial position."""
+	board = BitboardCheckersBoard({"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True})
+	boards = []
+	entry = book.probe(board)
+	while entry is not None:
+		boards.append(board.copy())
+		board.push(entry[0])
+		entry = book.probe(board)
+	return boards
+
+def main():
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--tablebase", default="tablebases/checkers_3.bbtb")
+	parser.add_argument("--pieces", type=int, default=3, help="count of pieces of a generated tablebase")
+	parser.add_argument("--book", default="tablebases/checkers.bbob")
+	parser.add_argument("--games", type=int, default=20, help="count of games of a generated book")
+	parser.add_argument("--budget", type=float, default=1.0, help="time budget of a search in seconds")
+	parser.add_argument("--positions", type=int, default=5)
+	args = parser.parse_args()
+
+	for path, build in ((args.tablebase, lambda: build_tablebase(args.tablebase, args.pieces, verbose=True)),
+						(args.book, lambda: build_book(args.book, args.games, budget=0.2, verbose=True))):
+		if not os.path.exists(path):
+			start = perf_counter()
+			build()
+			print(f"Generated {path} in {perf_counter() - start:.1f} s")
+	tablebase, book = EndgameTablebase(args.tablebase), OpeningBook(args.book)
+	print(f"tablebase: {os.path.getsize(args.tablebase)} bytes, {len(tablebase)} signatures; book: {os.path.getsize(args.book)} bytes, {len(book)} positions")
+
+	boards = endgames(tablebase, args.positions)
+	openings = book_line(book)
+	number = 1000
+	print(f"{'us per probe':<30}{1e6 * timeit(lambda: [tablebase.probe(board) for board in boards], number=number) / number / len(boards):>10.2f}")
+	if openings:
+		print(f"{'us per book probe':<30}{1e6 * timeit(lambda: [book.probe(board) for board in openings], number=number) / number / len(openings):>10.2f}")
+	print(f"{'plies of book line':<30}{len(openings):>10}")
+
+	print(f"\n{'endgame':>8}{'distance':>10}{'tablebase':>11}{'depth':>7}{'score':>8}{'nodes':>9}{'seconds':>9}")
+	for index, board in enumerate(boards):
+		for name, probed in (("no", None), ("yes", tablebase)):
+			search = AlphaBetaSearch(1 << 16, tablebase=probed)
+			search.search(board, args.budget)
+			print(f"{index:>8}{tablebase.probe(board)[1]:>10}{name:>11}{search.depth:>7}{search.score:>8}{search.nodes:>9}{search.elapsed:>9.2f}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,75 @@
+"""Load test of a game-server: spawns many simulated players and reports aggregate actions per second and connection success rate.
+
+	python load_test.py --server ws://127.0.0.1:2137 --session session_65a369d72b64deef --count 2000 --duration 60
+	python load_test.py --stand-in --count 200 --players 10
+
+Bots are sharded across pools and processes by spawn_bots. Unless --bots-per-process is given, a short calibration run measures
+the share of a core used by a single bot and the shard size is chosen from it and the count of cores.
+"""
+import argparse
+from time import sleep
+import numpy as np
+import signal
+
+from src import spawn_bots, RandomAgent, RandomBot, CloseFoodAgent, _get_var
+
+_BOTS = {bot_class.__name__: bot_class for bot_class in (RandomAgent, RandomBot, CloseFoodAgent)}
+
+global_done = False
+def terminate_bots(*args, **kwargs):
+	global global_done
+	global_done = True
+
+def run(server: str, session_id: str, bot_class, count: int, duration: float, bots_per_process=None, bot_cost=None):
+	manager = spawn_bots(server, session_id, bot_class, count, bots_per_process=bots_per_process, bot_cost=bot_cost,
+						 generator=np.random.default_rng(2137))
+	print(f"Spawned {manager.count} bots in {manager.processes} processes")
+	waited = 0.0
+	while not global_done and waited < duration:
+		sleep(0.1)
+		waited += 0.1
+	stats = manager.stats()
+	failed = manager.terminate(30)
+	if failed: print(f"Bots No. {failed} did not exit in time")
+	return manager.summary(), stats
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--server", default="ws://127.0.0.1:2137")
+	parser.add_argument("--session", default=None, help="session identifier, a new game is created with --stand-in")
+	parser.add_argument("--bot", choices=sorted(_BOTS), default="RandomAgent")
+	parser.add_argument("--count", type=int, default=100)
+	parser.add_argument("--duration", type=float, default=30.0)
+	parser.add_argument("--bots-per-process", type=int, default=None)
+	parser.add_argument("--calibration-count", type=int, default=4)
+	parser.add_argument("--calibration-duration", type=float, default=5.0)
+	parser.add_argument("--stand-in", action="store_true", help="run against the local server, see src.localserver")
+	parser.add_argument("--game-type", default="agarnt", help="type of game created on the local server")
+	parser.add_argument("--tick-rate", type=float, default=5.0, help="tick rate of the local server")
+	parser.add_argument("--players", type=int, default=0, help="count of players simulated by the local server")
+	args = parser.parse_args()
+
+	if args.stand_in:
+		from src.localserver import LocalServer
+		local_server = LocalServer(port=int(args.server.rsplit(":", 1)[-1].strip("/")), http_port=int(_get_var("http_port")),
+								   tick_rate=args.tick_rate, players=args.players)
+		local_server.start()
+		local_server.wait_ready()
+		args.session = local_server.create_game("load_test", args.game_type)
+
+	signal.signal(signal.SIGINT, terminate_bots)
+	bot_class, bot_cost = _BOTS[args.bot], None
+
+	if args.bots_per_process is None and args.calibration_count > 0:
+		calibration, _ = run(args.server, args.session, bot_class, args.calibration_count, args.calibration_duration, bots_per_process=args.calibration_count)
+		bot_cost = calibration["bot_cost"]
+		print(f"Measured cost of a bot: {100 * bot_cost:.2f}% of a core")
+
+	summary, stats = run(args.server, args.session, bot_class, args.count, args.duration, args.bots_per_process, bot_cost)
+	print(f"Connected bots:          {summary['connected_bots']}/{summary['requested_bots']}")
+	print(f"Connection success rate: {100 * summary['connection_success_rate']:.1f}%")
+	print(f"Sent actions:            {summary['sent_actions']}")
+	print(f"Actions per second:      {summary['actions_per_second']:.2f}")
+	print(f"{'stage':<16}{'samples':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+	for stage in ("recv", "decode", "update", "handle", "choose_action", "encode", "send", "decision"):
+		print(f"{stage:<16}{stats[f'{stage}_count']:>10}{stats[f'{stage}_p50_ms']:>10.3f}{stats[f'{stage}_p90_ms']:>10.3f}{stats[f'{stage}_p99_ms']:>10.3f}")
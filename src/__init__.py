@@ -7,7 +7,7 @@ from typing import Any as _Any, Type as _Type, Dict as _Dict, Tuple as _Tup
 _level = _logging.WARNING if 'PRODUCTION' in os.environ else _logging.DEBUG
 _logger = _logging.getLogger(__name__)
 _logger.setLevel(_level)
-_logger.info("Logging level is equal to: ", _logging.getLevelName(_level))
+_logger.info(f"Logging level is equal to: {_logging.getLevelName(_level)}")
 
 _ENV_VARS = {
 	"name":"",
@@ -23,6 +23,39 @@ _UPDATERS: _Dict[str, _Tup[_Type[StateUpdater], _Tup[_Any], _Dict[str, _Any]]] =
 	"":...
 }
 
+_CONNECTION_OPTIONS: _Dict[str, _Any] = {
+	"send_queue_size": 8,
+	"send_backpressure": "drop",
+	"send_timeout": 1.0,
+	"conflate_states": False,
+	"dispatch_queue_size": 64,
+	"tick_mode": "state",
+	"tick_pace": 1.0,
+	"tick_timeout": 1.0,
+	"max_decision_rate": None,
+	"reconnect_attempts": 5,
+	"reconnect_base_delay": 0.1,
+	"reconnect_max_delay": 5.0,
+	"record_path": None,
+}
+
+def set_connection_options(**options: _Any):
+	unknown = set(options) - set(_CONNECTION_OPTIONS)
+	if unknown:
+		raise ValueError(f"Unknown connection options: {sorted(unknown)}, available options: {sorted(_CONNECTION_OPTIONS)}")
+	_CONNECTION_OPTIONS.update(options)
+
+def _get_connection_option(key: str) -> _Any: return _CONNECTION_OPTIONS[key]
+
+def _get_connection_options() -> _Dict[str, _Any]: return dict(_CONNECTION_OPTIONS)
+
+_CODECS: _Dict[str, _Tup[_Type[Codec], _Tup[_Any], _Dict[str, _Any]]] = {}
+
+def register_codec(game_type: str, type: _Type[Codec], *args, **kwargs):
+	_CODECS[game_type] = (type, args, kwargs)
+
+def _get_codec_initialization_params(key: str): return _CODECS.get(key, None)
+
 def _get_var(key: str) -> str:
 	return _ENV_VARS.get(key, "")
 
@@ -39,13 +72,17 @@ def register_updater(game_type: str, type: _Type[StateUpdater]):
 
 def _get_updater_initialization_params(key: str): return _UPDATERS.get(key, None)
 
-from .base import Agent, Action, make_env, spawn_bots, get_session_id, cleanup, StateUpdater
-from .agarnt import AgarntAction, RandomAgent, CloseFoodAgent, GradAgent, AgarntStateUpdater
-from .checkers import CheckersAction, RandomBot, CheckersStateUpdater
+from .base import Agent, Action, make_env, spawn_bots, get_session_id, cleanup, StateUpdater, connection_stats
+from .base.codec import Codec, RawCodec, GzipCodec, ZlibCodec, MsgpackCodec
+from .base.replay import Recorder, Recording, replay
+from .agarnt import AgarntAction, RandomAgent, CloseFoodAgent, GradAgent, AgarntStateUpdater, AgarntObservation, EntitySlots
+from .checkers import CheckersAction, RandomBot, AlphaBetaBot, CheckersStateUpdater
 
 __all__ = [
 	Agent, Action, make_env, spawn_bots, get_session_id, cleanup, StateUpdater,
-	AgarntAction, RandomAgent, CheckersAction, RandomBot, CheckersStateUpdater, CloseFoodAgent, GradAgent, AgarntStateUpdater, register_updater, register_updater_args
+	AgarntAction, RandomAgent, CheckersAction, RandomBot, AlphaBetaBot, CheckersStateUpdater, CloseFoodAgent, GradAgent, AgarntStateUpdater, AgarntObservation, EntitySlots, register_updater, register_updater_args,
+	set_connection_options, connection_stats, register_codec, Codec, RawCodec, GzipCodec, ZlibCodec, MsgpackCodec,
+	Recorder, Recording, replay
 ]
 
 register_updater("agarnt", AgarntStateUpdater)
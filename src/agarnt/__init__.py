@@ -4,5 +4,7 @@ from .random_agent import RandomAgent
 from .close_food_agent import CloseFoodAgent
 from .grad_agent import GradAgent
 
+from .entities import EntitySlots
+from .observation import AgarntObservation
 from .stateupdater import AgarntStateUpdater
 
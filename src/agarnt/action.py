@@ -38,7 +38,9 @@ class AgarntAction(Action, Enum):
 			Dict[str, Dict[str, bool]]: Dictionary that contains boolean flags for each available basic action (Left, Down, Right, Up) -> if action is complex, more than one basic action is active.
 		"""
 		name = self.name
-		d = {k:False for k in AgarntAction.__KEYS.value}
+		keys = AgarntAction.__KEYS
+		# since Python 3.11 private names of Enum are not converted to members
+		d = {k:False for k in getattr(keys, "value", keys)}
 		for char in name: d[char] = True
 		return {"directions" : d}
 	
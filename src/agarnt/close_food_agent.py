@@ -1,68 +1,142 @@
 from ..base import Agent
+from ..base._batching import _MicroBatcher
 from .action import AgarntAction
+from .observation import AgarntObservation
+from typing import Dict, List, Optional
 import numpy as np
+import os
+import weakref
 
 def euclidean_dist(x1,y1,x2,y2):
     return np.linalg.norm(np.array([x1,y1]) - np.array([x2,y2]))
 
+def close_food_direction(observation: AgarntObservation) -> Optional[Dict[str, bool]]:
+    """Chooses direction of a single bot: it goes to the nearest smaller player, unless the nearest food is at least 1.5 times closer.
+    Nearest entities are the first minima, like in the former loops over the state.
+
+    Args:
+        observation (AgarntObservation): observation of bot.
+
+    Returns:
+        Optional[Dict[str, bool]]: directions, None if there is neither food nor a smaller player.
+    """
+    near_enemy = near_food = None
+    # buffers of the observation are overwritten by updates from the thread that receives states
+    with observation.lock:
+        player = observation.position
+        enemies = observation.players_xy[observation.players_r < observation.r]
+        if len(enemies):
+            enemy_dists = np.hypot(*(enemies - player).T)
+            nearest = int(np.argmin(enemy_dists))
+            near_enemy, enemy_dist = enemies[nearest], enemy_dists[nearest]
+        if len(observation.food):
+            food_dists = np.hypot(*(observation.food - player).T)
+            nearest = int(np.argmin(food_dists))
+            near_food, food_dist = observation.food[nearest].copy(), food_dists[nearest]
+    # eating other player is more important than food, but food is also good
+    near = near_enemy if near_enemy is not None else near_food
+    if near_enemy is not None and near_food is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if enemy_dist / food_dist >= 1.5: near = near_food
+    if near is None: return None
+    direction = {"L": bool(near[0] < player[0]), "D": bool(near[1] < player[1]),
+                 "R": bool(near[0] > player[0]), "U": bool(near[1] > player[1])}
+    if not any(direction.values()): direction['U'] = True
+    return direction
+
+def _padded(arrays: List[np.ndarray], width: int) -> np.ndarray:
+    """Stacks arrays of rows of different lengths into one array, missing rows are filled with inf."""
+    stacked = np.full((len(arrays), max(map(len, arrays), default=0), width), np.inf)
+    for row, array in zip(stacked, arrays):
+        row[:len(array)] = array
+    return stacked
+
+def close_food_directions(observations: List[AgarntObservation]) -> List[Optional[Dict[str, bool]]]:
+    """Chooses directions of many bots in one vectorized pass, the same as close_food_direction of every bot.
+    Entities of bots are padded into arrays of shape (bots, entities), so the first minima are found by argmin along rows.
+
+    Args:
+        observations (List[AgarntObservation]): observations of bots, e.g. bots hosted by the same process.
+
+    Returns:
+        List[Optional[Dict[str, bool]]]: directions of every bot, None if there is neither food nor a smaller player.
+    """
+    if len(observations) == 1: return [close_food_direction(observations[0])]
+    players = np.empty((len(observations), 3), dtype=np.float64)
+    food, enemies = [], []
+    # every observation is copied at once under its lock, so its arrays come from the same tick
+    for row, observation in enumerate(observations):
+        with observation.lock:
+            players[row] = observation.x, observation.y, observation.r
+            food.append(observation.food.copy())
+            enemies.append(np.column_stack((observation.players_xy, observation.players_r)))
+    px, py = players[:, 0, None], players[:, 1, None]
+    rows = np.arange(len(observations))
+
+    food = _padded(food, 2)
+    food_dists = np.hypot(food[..., 0] - px, food[..., 1] - py)
+    enemies = _padded(enemies, 3)
+    # only players smaller than the bot are targets
+    enemy_dists = np.where(enemies[..., 2] < players[:, 2, None], np.hypot(enemies[..., 0] - px, enemies[..., 1] - py), np.inf)
+
+    nearest_food = food_dists.argmin(axis=1) if food_dists.shape[1] else np.zeros(len(rows), dtype=np.int64)
+    nearest_enemy = enemy_dists.argmin(axis=1) if enemy_dists.shape[1] else np.zeros(len(rows), dtype=np.int64)
+    food_dist = food_dists[rows, nearest_food] if food_dists.shape[1] else np.full(len(rows), np.inf)
+    enemy_dist = enemy_dists[rows, nearest_enemy] if enemy_dists.shape[1] else np.full(len(rows), np.inf)
+    has_food, has_enemy = np.isfinite(food_dist), np.isfinite(enemy_dist)
+
+    # eating other player is more important than food, but food is also good
+    with np.errstate(divide="ignore", invalid="ignore"):
+        go_for_food = has_food & (~has_enemy | (enemy_dist / food_dist >= 1.5))
+    near = np.zeros((len(rows), 2))
+    near[go_for_food] = food[rows, nearest_food][go_for_food] if food.shape[1] else 0
+    go_for_enemy = has_enemy & ~go_for_food
+    near[go_for_enemy] = enemies[rows, nearest_enemy, :2][go_for_enemy] if enemies.shape[1] else 0
+
+    left, right = near[:, 0] < players[:, 0], near[:, 0] > players[:, 0]
+    down, up = near[:, 1] < players[:, 1], near[:, 1] > players[:, 1]
+    up |= ~(left | right | down | up)
+    return [{"L": bool(l), "D": bool(d), "R": bool(r), "U": bool(u)} if target else None
+            for l, d, r, u, target in zip(left, down, right, up, go_for_food | go_for_enemy)]
+
+
 class CloseFoodAgent(Agent):
-    
-    def __init__(self, generator: np.random.Generator):
+    """Goes to the nearest smaller player or to the nearest food.
+
+    In the batched mode decisions of all batched CloseFoodAgents of the process are evaluated together: the first bot
+    that decides waits up to batch_delay for observations of the others and evaluates them in one vectorized pass.
+    """
+
+    def __init__(self, generator: np.random.Generator, batched: bool =False, batch_delay: float =0.002):
         super().__init__(AgarntAction)
         self.__rng = generator
-        self.first = True
-  
+        self.__observation = AgarntObservation()
+        self.__batcher = None
+        if batched:
+            self.__batcher = _batcher_of_process(batch_delay)
+            self.__batcher.join()
+            # a finalizer runs once, whichever comes first: close, death of bot or its collection
+            self.__leave = weakref.finalize(self, self.__batcher.leave)
+
     def choose_action(self) -> AgarntAction:
         if self.current_state:
-        # take a list of other players
-            enemies = self.current_state['ps']
-            player = self.current_state['p']
-
-        # remove those bigger than you
-            smaller_enemies = []
-            for e in enemies:
-                if e['r'] < player['r']:
-                    smaller_enemies.append(e)
-            # search for the nearest one - near_enemy
-            near_enemy = next(iter(smaller_enemies), None)
-            for se in smaller_enemies:
-                if euclidean_dist(se['x'],se['y'],player['x'],player['y']) < euclidean_dist(near_enemy['x'],near_enemy['y'],player['x'],player['y']):
-                    near_enemy = se
-            # search for the closest food - near_food
-            foods = self.current_state['f']
-            near_food = next(iter(foods), None)
-            for f in foods:
-                if euclidean_dist(f[0],f[1],player['x'],player['y']) < euclidean_dist(near_food[0],near_food[1],player['x'],player['y']):
-                    near_food = f
-            if near_food:
-                near_food = {'x':near_food[0], 'y': near_food[1]}
-            # eating other player is more important than food, but food is also good
-            near = near_enemy if near_enemy is not None else near_food
-            if near_enemy and near_food and euclidean_dist(near_enemy['x'],near_enemy['y'],player['x'],player['y'])/euclidean_dist(near_food['x'],near_food['y'],player['x'],player['y']) >= 1.5:
-                near = near_food
-            # check in what direction to go
-            direction = {"L":False, "D":False, "R":False, "U":False}
-            if near:
-                if near['x'] < player['x']:
-                    direction['L'] = True
-                elif near['x'] > player['x']:
-                    direction['R'] = True
-                if near['y'] < player['y']:
-                    direction['D'] = True
-                elif near['y'] > player['y']:
-                    direction['U'] = True
-                if not np.any(list(direction.values())): direction['U'] = True
-                return self.action_provider.decode({"directions":direction})
+            observation = self.current_state
+            if self.__batcher is not None and self.is_done: self.close()
+            directions = self.__batcher(observation) if self.__batcher else close_food_direction(observation)
+            if directions:
+                return self.action_provider.decode({"directions":directions})
         return self.__rng.choice(self.action_provider.get_all())
-        
+
     def handle_new_states(self, msg):
-        if self.first:
-            self.current_state = msg
-            self.first = False
-        else:
-            self.current_state= (msg)
-        
-    
+        # states merged into dicts are converted into reused columnar buffers, unless the updater is columnar already
+        self.current_state = msg if isinstance(msg, AgarntObservation) else self.__observation.update(msg)
+
+    def close(self):
+        """Leaves the batch, the leader does not wait for a bot that does not decide anymore."""
+        if self.__batcher is not None:
+            self.__leave()
+            self.__batcher = None
+
     @property
     def is_done(self) -> bool:
         if "d" in self.current_state:
@@ -70,4 +144,14 @@ class CloseFoodAgent(Agent):
         return False
 
     def update(self):
-        ...
\ No newline at end of file
+        ...
+
+
+_batchers: Dict[int, _MicroBatcher] = {}
+
+def _batcher_of_process(max_delay: float) -> _MicroBatcher:
+    """Returns a batcher shared by CloseFoodAgents of the current process, forked processes create their own."""
+    batcher = _batchers.get(os.getpid(), None)
+    if batcher is None:
+        batcher = _batchers[os.getpid()] = _MicroBatcher(close_food_directions, max_delay)
+    return batcher
\ No newline at end of file
@@ -0,0 +1,197 @@
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class EntitySlots:
+	"""Entities of agarnt, e.g. food or players, kept in slots of preallocated arrays. An entity keeps its slot as long as
+	it exists, so the slot is a stable index that may be used by agents and spatial indexes. Slots of removed entities
+	are reused through a free list. Every slot remembers the tick of its last change, so consumers may update only
+	entities changed since the tick they saw.
+
+	The server sends full lists of entities, so changes are found by sync, a diff of the list with the current slots.
+	Entities keyed by integer codes with values determined by codes, e.g. food keyed by packed position, are diffed
+	by sync_codes, a vectorized diff of sorted codes.
+	"""
+
+	def __init__(self, width: int, capacity: int =256, history: int =64) -> None:
+		"""Creates empty slots.
+
+		Args:
+			width (int): count of values of entity, e.g. 2 for position of food, 3 for position and radius of player.
+			capacity (int, optional): initial count of slots. Defaults to 256.
+			history (int, optional): count of ticks for which removals are remembered. Defaults to 64.
+		"""
+		self.values = np.zeros((capacity, width), dtype=np.int64)
+		self.alive = np.zeros(capacity, dtype=bool)
+		self.changed = np.full(capacity, -1, dtype=np.int64)
+		self.codes = np.zeros(capacity, dtype=np.int64)
+		self.keys: List[Hashable] = [None] * capacity
+		self.rows: List[Optional[Tuple[int, ...]]] = [None] * capacity
+		self.tick = -1
+		self.__history = history
+		self.__slots: Dict[Hashable, int] = {}
+		self.__free: List[int] = list(range(capacity - 1, -1, -1))
+		self.__removed: List[Tuple[int, int]] = []
+
+	def __len__(self) -> int:
+		return len(self.__slots) if self.__slots else int(np.count_nonzero(self.alive))
+
+	def slot_of(self, key: Hashable) -> Optional[int]:
+		"""Returns slot of entity with given key.
+
+		Args:
+			key (Hashable): key of entity, e.g. name of player.
+
+		Returns:
+			Optional[int]: slot, None if there is no such entity.
+		"""
+		if key in self.__slots: return self.__slots[key]
+		if not isinstance(key, int): return None
+		slots = np.flatnonzero(self.alive & (self.codes == key))
+		return int(slots[0]) if len(slots) else None
+
+	def active(self) -> np.ndarray:
+		"""Returns slots of existing entities.
+
+		Returns:
+			np.ndarray: indices of slots.
+		"""
+		return np.flatnonzero(self.alive)
+
+	def changed_since(self, tick: int) -> np.ndarray:
+		"""Returns slots of existing entities added or changed after given tick.
+
+		Args:
+			tick (int): the last tick seen by consumer, -1 returns all entities.
+
+		Returns:
+			np.ndarray: indices of slots.
+		"""
+		return np.flatnonzero(self.alive & (self.changed > tick))
+
+	def removed_since(self, tick: int) -> np.ndarray:
+		"""Returns slots of entities removed after given tick. A slot may be reused by a new entity, which is reported
+		by changed_since as well.
+
+		Args:
+			tick (int): the last tick seen by consumer.
+
+		Raises:
+			ValueError: if the tick is older than remembered history, the consumer has to rebuild from active slots.
+
+		Returns:
+			np.ndarray: indices of slots.
+		"""
+		if tick < self.tick - self.__history:
+			raise ValueError(f"Removals before tick {self.tick - self.__history} are forgotten, requested tick: {tick}")
+		return np.array([slot for removed, slot in self.__removed if removed > tick], dtype=np.int64)
+
+	def __grow(self):
+		capacity = len(self.alive)
+		self.values = np.concatenate((self.values, np.zeros_like(self.values)))
+		self.alive = np.concatenate((self.alive, np.zeros(capacity, dtype=bool)))
+		self.changed = np.concatenate((self.changed, np.full(capacity, -1, dtype=np.int64)))
+		self.codes = np.concatenate((self.codes, np.zeros(capacity, dtype=np.int64)))
+		self.keys.extend([None] * capacity)
+		self.rows.extend([None] * capacity)
+		self.__free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+	def __add(self, key: Hashable, row: Sequence[int]) -> int:
+		if not self.__free: self.__grow()
+		slot = self.__free.pop()
+		self.values[slot] = row
+		self.rows[slot] = tuple(row)
+		self.alive[slot] = True
+		self.changed[slot] = self.tick
+		self.keys[slot] = key
+		return slot
+
+	def __remove(self, slot: int):
+		self.alive[slot] = False
+		self.keys[slot] = None
+		self.rows[slot] = None
+		self.__free.append(slot)
+		self.__removed.append((self.tick, slot))
+
+	def sync(self, keys: Sequence[Hashable], rows: Sequence[Sequence[int]], tick: int, static: bool =False):
+		"""Applies the full list of entities of a new tick: adds new entities, updates changed values and removes missing ones.
+		Repeated keys, e.g. two food at the same position, are stored as (key, 1), (key, 2)... except the last occurrence.
+
+		Args:
+			keys (Sequence[Hashable]): keys of entities, e.g. positions of food or names of players.
+			rows (Sequence[Sequence[int]]): values of entities, sequences of width values.
+			tick (int): tick of the list, it has to grow.
+			static (bool, optional): flag that indicates whether or not values are determined by keys, e.g. positions of food,
+			so values of kept entities are not compared. Defaults to False.
+		"""
+		self.tick = tick
+		incoming = dict(zip(keys, range(len(keys))))
+		if len(incoming) < len(keys):
+			keys = list(keys)
+			repeats: Dict[Hashable, int] = {}
+			for index in sorted(set(range(len(keys))) - set(incoming.values())):
+				key = keys[index]
+				repeats[key] = repeats.get(key, 0) + 1
+				keys[index] = (key, repeats[key])
+			incoming = dict(zip(keys, range(len(keys))))
+
+		# every key is a single entity, so the diff is done by operations on sets of keys
+		current = self.__slots
+		for key in current.keys() - incoming.keys():
+			self.__remove(current.pop(key))
+		for key in incoming.keys() - current.keys():
+			current[key] = self.__add(key, rows[incoming[key]])
+		if not static:
+			for key, index in incoming.items():
+				slot, row = current[key], tuple(rows[index])
+				if self.rows[slot] != row:
+					self.values[slot] = row
+					self.rows[slot] = row
+					self.changed[slot] = tick
+
+		if self.__removed and self.__removed[0][0] < tick - self.__history:
+			self.__removed = [removal for removal in self.__removed if removal[0] >= tick - self.__history]
+
+	def sync_codes(self, codes: np.ndarray, rows: np.ndarray, tick: int):
+		"""Applies the full list of entities keyed by integer codes, values of entity are determined by its code.
+		Codes may repeat, entities of the same code are matched in order of slots and rows.
+
+		Args:
+			codes (np.ndarray): int64 codes of entities, e.g. positions of food packed by (x << 32) | (y & 0xFFFFFFFF).
+			rows (np.ndarray): values of entities, array of shape (len(codes), width).
+			tick (int): tick of the list, it has to grow.
+		"""
+		self.tick = tick
+		old_slots = np.flatnonzero(self.alive)
+		old_order = np.argsort(self.codes[old_slots], kind="stable")
+		old_sorted = self.codes[old_slots][old_order]
+		new_order = np.argsort(codes, kind="stable")
+		new_sorted = codes[new_order]
+
+		# an occurrence is kept if its rank among equal codes is lower than count of the code in the other list
+		kept_of_old = np.searchsorted(new_sorted, old_sorted, "right") - np.searchsorted(new_sorted, old_sorted, "left")
+		removed = old_slots[old_order[_ranks(old_sorted) >= kept_of_old]]
+		kept_of_new = np.searchsorted(old_sorted, new_sorted, "right") - np.searchsorted(old_sorted, new_sorted, "left")
+		added = new_order[_ranks(new_sorted) >= kept_of_new]
+
+		self.alive[removed] = False
+		self.__free.extend(removed.tolist())
+		self.__removed.extend((tick, slot) for slot in removed.tolist())
+		while len(self.__free) < len(added): self.__grow()
+		slots = np.array([self.__free.pop() for _ in range(len(added))], dtype=np.int64)
+		self.values[slots] = rows[added]
+		self.codes[slots] = codes[added]
+		self.alive[slots] = True
+		self.changed[slots] = tick
+
+		if self.__removed and self.__removed[0][0] < tick - self.__history:
+			self.__removed = [removal for removal in self.__removed if removal[0] >= tick - self.__history]
+
+
+def _ranks(sorted_values: np.ndarray) -> np.ndarray:
+	"""Returns rank of every element among equal elements of a sorted array."""
+	if not len(sorted_values): return np.zeros(0, dtype=np.int64)
+	indices = np.arange(len(sorted_values))
+	starts = np.concatenate(([True], sorted_values[1:] != sorted_values[:-1]))
+	return indices - np.maximum.accumulate(np.where(starts, indices, 0))
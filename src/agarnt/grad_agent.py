@@ -1,84 +1,73 @@
 from ..base import Agent
 from .action import AgarntAction
+from .observation import AgarntObservation
+from .planner import LookaheadPlanner
+from .potential import FoodPotential, PlayersPotential, gaussian
+from typing import Optional
 import numpy as np
 import math
 
 class GradAgent(Agent):
 	
-	def __init__(self, generator: np.random.Generator):
+	def __init__(self, generator: np.random.Generator, players: bool =True, incremental: bool =False,
+				 depth: int =1, beam: Optional[int] =None, budget: Optional[float] =None):
+		"""Creates an agent that goes down the potential field of food and other players.
+
+		Args:
+			generator (np.random.Generator): generator of random actions.
+			players (bool, optional): flag that indicates whether or not other players repel or attract the agent. Defaults to True.
+			incremental (bool, optional): flag that indicates whether or not food is tracked incrementally between ticks,
+			so only food near the agent is read. Defaults to False.
+			depth (int, optional): count of steps planned ahead, see LookaheadPlanner. Defaults to 1.
+			beam (Optional[int], optional): count of sequences of steps expanded at every level. Defaults to None, that is, all of them.
+			budget (Optional[float], optional): time in seconds available for planning of a decision. Defaults to None, that is, unlimited.
+		"""
 		super().__init__(AgarntAction)
 		self.__rng = generator
 		self.last_dir = {"L":True, "D":False, "R":False, "U":False}
 		self.first = True
+		self.__observation = AgarntObservation(incremental=incremental)
+		self.__field = FoodPotential(radius=20, fwhm=20, height=-1)
+		self.__players = PlayersPotential(threat_height=5, threat_width=2, prey_height=-5, prey_width=15) if players else None
+		self.__planner = LookaheadPlanner(depth=depth, beam=beam, budget=budget)
   
 	def choose_action(self) -> AgarntAction:
 		if self.current_state:
-			size = self.current_state['b']
-
-			Z = np.zeros(size)
-			ring_size = 40
-			radius = 20
-			food_z = self.makeGaussian(ring_size, fwhm=radius, center=(20,20), height=-1)
-			foods = self.current_state['f']
-
-			for f in foods:
-				start_x = f[0]-radius if f[0]-radius > 0 else 0
-				end_x = f[0]+radius if f[0]+radius < size[0] else size[0]
-				start_y = f[1]-radius if f[1]-radius > 0 else 0
-				end_y = f[1]+radius if f[1]+radius < size[1] else size[1]
-
-				s_x = 0 if f[0]-radius > 0 else radius-f[0]
-				e_x = ring_size if f[0]+radius < size[0] else size[0]-f[0]+radius
-				s_y = 0 if f[1]-radius > 0 else radius-f[1]
-				e_y = ring_size if f[1]+radius < size[1] else size[1]-f[1]+radius
-				Z[start_x:end_x,start_y:end_y] = np.fmin(food_z[s_x:e_x,s_y:e_y], Z[start_x:end_x,start_y:end_y])
-
-			other_players = self.current_state['ps']
-
-			# for p in other_players:
-			# 	if self.current_state['p']['r'] <= p['r']:
-			# 		Z = np.fmin(Z , self.makeGaussian(size[0], fwhm=2*p['r'], center=(p['x'],p['y']), height=5))
-			# 	else:
-			# 		Z = np.fmin(Z ,self.makeGaussian(size[0], fwhm=15*p['r'], center=(p['x'],p['y']), height=-5))
-			
-			directions = ['L', 'R', 'U', 'D', 'LU', 'LD', 'RU', 'RD']
-			potentials = []
-			for d in directions:
-				x_n,y_n = self.current_state['p']['x'], self.current_state['p']['y']
-			
-				if 'U' in d:
-					y_n += self.get_velocity(20, self.current_state['p']['r']) * self.current_state['delta'] + self.current_state['p']['r']
-				if 'D' in d:
-					y_n -= self.get_velocity(20, self.current_state['p']['r']) * self.current_state['delta'] + self.current_state['p']['r']
-				y_n = int(np.clip(y_n, 0, self.current_state['b'][0]-1))
-				if 'L' in d:
-					x_n -= self.get_velocity(20, self.current_state['p']['r']) * self.current_state['delta'] + self.current_state['p']['r']
-				if 'R' in d:
-					x_n += self.get_velocity(20, self.current_state['p']['r']) * self.current_state['delta'] + self.current_state['p']['r']
-				x_n = int(np.clip(x_n, 0, self.current_state['b'][1]-1))
-				print(x_n, y_n)
-				potentials.append(Z[x_n,y_n])
-			minimal_potential = min(range(len(potentials)), key=potentials.__getitem__)
-			if potentials[minimal_potential] == 0.0:
+			observation = self.current_state
+			# buffers of the observation are overwritten by updates from the thread that receives states
+			with observation.lock:
+				size = observation['b']
+				player = observation['p']
+				step = self.get_velocity(20, player['r']) * observation['delta'] + player['r']
+				dir = self.__planner.decide((player['x'], player['y']), step, (size[1]-1, size[0]-1), self.__potential)
+			if dir is None:
 				# last dir
 				return self.action_provider.decode({"directions":self.last_dir})
-			dir = directions[minimal_potential]
 			direction = {"L":False, "D":False, "R":False, "U":False}
 			if 'L' in dir: direction['L'] = True
 			elif 'R' in dir: direction['R'] = True
 			if 'D' in dir: direction['D'] = True
 			elif 'U' in dir: direction['U'] = True
 			self.last_dir = direction
-			print(f"chosen min: {potentials[minimal_potential]}, and action: {self.action_provider.decode({'directions':direction})} from:", potentials)
 			return self.action_provider.decode({"directions":direction})
 
-		print("Random action is chosen instead")
-		print(self.current_state)
 		return self.__rng.choice(self.action_provider.get_all())
 
+	def __potential(self, points: np.ndarray) -> np.ndarray:
+		# the field is evaluated only at the candidate points, not rasterized over the whole board
+		observation = self.current_state
+		if observation.food_slots is not None:
+			potentials = self.__field.near(observation.food_index, points)
+		else:
+			potentials = self.__field.at(observation.food, points)
+		if self.__players is not None:
+			repulsion, attraction = self.__players.at(observation.players_xy, observation.players_r, observation.r, points)
+			potentials = np.fmin(potentials, attraction) + repulsion
+		return potentials
+
 	def handle_new_states(self, msg):
-		
-		self.current_state = (msg)
+		# food is read from the reused columnar buffers, unless the updater is columnar already
+		self.current_state = msg if isinstance(msg, AgarntObservation) else self.__observation.update(msg)
 
 	def get_velocity(self, max_velocity, radius):
 		log_value = np.log(radius) + 1
@@ -87,16 +76,7 @@ class GradAgent(Agent):
 
 
 	def makeGaussian(self, size, fwhm = 3, center=None, height=1):
-		x = np.arange(0, size, 1, float)
-		y = x[:,np.newaxis]
-
-		if center is None:
-			x0 = y0 = size // 2
-		else:
-			x0 = center[0]
-			y0 = center[1]
-
-		return height * np.exp(-4*np.log(2) * ((x-x0)**2 + (y-y0)**2) / fwhm**2)
+		return gaussian(size, fwhm, None if center is None else tuple(center), height).copy()
 	
 	@property
 	def is_done(self) -> bool:
@@ -0,0 +1,171 @@
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .entities import EntitySlots
+from .spatial import GridIndex
+
+
+def _food_codes(food: np.ndarray) -> np.ndarray:
+	"""Returns int64 codes of positions of food, x in the upper and y in the lower 32 bits, so different positions never collide.
+
+	Args:
+		food (np.ndarray): int64 positions of shape (n, 2), coordinates have to fit in 32-bit signed integers.
+
+	Raises:
+		ValueError: if a coordinate does not fit in 32 bits.
+
+	Returns:
+		np.ndarray: codes of positions.
+	"""
+	if len(food) and (food.min() < -2**31 or food.max() >= 2**31):
+		raise ValueError("Coordinates of food have to fit in 32-bit signed integers")
+	return (food[:, 0] << 32) | (food[:, 1] & 0xFFFFFFFF)
+
+
+class AgarntObservation:
+	"""Columnar view of agarnt state: food and other players are kept in NumPy arrays, so agents may process them
+	without Python loops. Buffers are preallocated and reused between ticks, they grow only if a state does not fit.
+	Arrays are overwritten in place by update, which holds lock; a reader in another thread than the one that updates
+	the observation has to hold lock as well while it reads arrays, spatial indexes or slots, e.g.
+
+		with observation.lock:
+			enemies = observation.players_xy[observation.players_r < observation.r]
+
+	The raw state is still available by indexing, e.g. observation["ps"], so agents written for dict states keep working.
+
+	An incremental observation also keeps food and other players in EntitySlots, where every entity has a stable slot
+	and consumers may process only entities changed since the last tick they saw.
+
+	Spatial indexes of food and other players are created on first use and brought up to date when they are accessed:
+	moved incrementally if the observation is incremental, rebuilt once per tick otherwise.
+	"""
+
+	def __init__(self, food_capacity: int =256, players_capacity: int =32, incremental: bool =False) -> None:
+		"""Creates an empty observation.
+
+		Args:
+			food_capacity (int, optional): initial capacity of food buffer. Defaults to 256.
+			players_capacity (int, optional): initial capacity of buffers of other players. Defaults to 32.
+			incremental (bool, optional): flag that indicates whether or not entities are tracked in slots. Defaults to False.
+		"""
+		self.state: Dict[str, Any] = {}
+		self.lock = threading.Lock()
+		self.tick = -1
+		self.food_slots: Optional[EntitySlots] = EntitySlots(2, food_capacity) if incremental else None
+		self.players_slots: Optional[EntitySlots] = EntitySlots(3, players_capacity) if incremental else None
+		self.__food_index: Optional[GridIndex] = None
+		self.__players_index: Optional[GridIndex] = None
+		self.__food = np.zeros((food_capacity, 2), dtype=np.int64)
+		self.__players_xy = np.zeros((players_capacity, 2), dtype=np.int64)
+		self.__players_r = np.zeros(players_capacity, dtype=np.int64)
+		self.food = self.__food[:0]
+		self.players_xy = self.__players_xy[:0]
+		self.players_r = self.__players_r[:0]
+		self.players_names: List[str] = []
+		self.name = ""
+		self.x = self.y = self.r = 0
+		self.board: Tuple[int, int] = (0, 0)
+		self.delta = 0.0
+		self.dead = False
+
+	@property
+	def position(self) -> np.ndarray:
+		"""Returns position of the player.
+
+		Returns:
+			np.ndarray: coordinates x and y.
+		"""
+		return np.array((self.x, self.y), dtype=np.int64)
+
+	@property
+	def food_index(self) -> GridIndex:
+		"""Returns spatial index of food. Identifiers are slots of food_slots if the observation is incremental, rows of food otherwise.
+
+		Returns:
+			GridIndex: index of the current tick.
+		"""
+		if self.__food_index is None: self.__food_index = GridIndex()
+		index = self.__food_index
+		if self.food_slots is not None:
+			index.update(self.food_slots)
+		elif index.tick != self.tick:
+			index.rebuild(self.food)
+			index.tick = self.tick
+		return index
+
+	@property
+	def players_index(self) -> GridIndex:
+		"""Returns spatial index of other players, rows of index are x, y and r. Identifiers are slots of players_slots
+		if the observation is incremental, indices of players_xy otherwise.
+
+		Returns:
+			GridIndex: index of the current tick.
+		"""
+		if self.__players_index is None: self.__players_index = GridIndex()
+		index = self.__players_index
+		if self.players_slots is not None:
+			index.update(self.players_slots)
+		elif index.tick != self.tick:
+			index.rebuild(np.column_stack((self.players_xy, self.players_r)))
+			index.tick = self.tick
+		return index
+
+	def update(self, state: Dict[str, Any]) -> "AgarntObservation":
+		"""Fills buffers with a state, under lock.
+
+		Args:
+			state (Dict[str, Any]): merged agarnt state with keys p, ps, f, b, delta and d.
+
+		Returns:
+			AgarntObservation: self.
+		"""
+		with self.lock:
+			self.state = state
+			player = state.get("p", None) or {}
+			self.name = player.get("n", "")
+			self.x, self.y, self.r = player.get("x", 0), player.get("y", 0), player.get("r", 0)
+			board = state.get("b", None) or (0, 0)
+			self.board = (board[0], board[1])
+			self.delta = state.get("delta", 0.0)
+			self.dead = bool(state.get("d", False))
+
+			food = state.get("f", None) or ()
+			if len(food) > len(self.__food):
+				self.__food = np.zeros((2 * len(food), 2), dtype=np.int64)
+			self.food = self.__food[:len(food)]
+			if len(food):
+				values = np.asarray(food)
+				# positions are integers, a fractional one would be truncated by the int64 buffer
+				if values.dtype.kind not in "iu" and not np.array_equal(values, np.trunc(values)):
+					raise ValueError("Positions of food have to be integers")
+				self.food[:] = values
+
+			players = state.get("ps", None) or ()
+			if len(players) > len(self.__players_r):
+				self.__players_xy = np.zeros((2 * len(players), 2), dtype=np.int64)
+				self.__players_r = np.zeros(2 * len(players), dtype=np.int64)
+			self.players_xy, self.players_r = self.__players_xy[:len(players)], self.__players_r[:len(players)]
+			if len(players):
+				self.players_xy[:] = [(p["x"], p["y"]) for p in players]
+				self.players_r[:] = [p["r"] for p in players]
+			self.players_names = [p.get("n", "") for p in players]
+
+			self.tick += 1
+			if self.food_slots is not None:
+				self.food_slots.sync_codes(_food_codes(self.food), self.food, self.tick)
+				self.players_slots.sync(self.players_names, [(p["x"], p["y"], p["r"]) for p in players], self.tick)
+		return self
+
+	def __getitem__(self, key: str) -> Any:
+		return self.state[key]
+
+	def __contains__(self, key: str) -> bool:
+		return key in self.state
+
+	def __len__(self) -> int:
+		return len(self.state)
+
+	def get(self, key: str, default: Optional[Any] =None) -> Any:
+		return self.state.get(key, default)
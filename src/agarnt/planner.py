@@ -0,0 +1,94 @@
+from time import perf_counter
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+
+# directions of GradAgent and displacements of a step in every direction
+DIRECTIONS = ('L', 'R', 'U', 'D', 'LU', 'LD', 'RU', 'RD')
+_MOVES = np.array([(-1, 0), (1, 0), (0, 1), (0, -1), (-1, 1), (-1, -1), (1, 1), (1, -1)], dtype=np.float64)
+
+Potential = Callable[[np.ndarray], np.ndarray]
+
+
+class LookaheadPlanner:
+	"""Plans sequences of moves of an agarnt player by rolling out all sequences of 8 directions level by level.
+	Positions of a level are computed from the previous one as NumPy arrays and the potential is evaluated at all of them
+	in one call, the score of a sequence is the discounted sum of potentials along it, lower is better.
+
+	If the beam is set, only that many best sequences are expanded further; the rest of the plan chosen on the previous
+	tick is always kept in the beam. With a time budget levels are expanded while the next level is expected to fit in it,
+	so the depth is reduced under load, and if the budget is exhausted before the first level, the previous plan is reused.
+	"""
+
+	def __init__(self, depth: int =3, beam: Optional[int] =None, budget: Optional[float] =None, discount: float =0.9) -> None:
+		"""Creates a planner.
+
+		Args:
+			depth (int, optional): maximal count of steps of a plan. Defaults to 3.
+			beam (Optional[int], optional): count of sequences expanded at every level. Defaults to None, that is, all 8^depth sequences.
+			budget (Optional[float], optional): time in seconds available for a single decision. Defaults to None, that is, unlimited.
+			discount (float, optional): weight of potential of every next step relative to the previous one. Defaults to 0.9.
+		"""
+		if depth < 1: raise ValueError(f"Depth has to be positive, got: {depth}")
+		self.depth = depth
+		self.beam = beam
+		self.budget = budget
+		self.discount = discount
+		self.plan: np.ndarray = np.zeros(0, dtype=np.int8)
+		self.reached = 0
+		self.evaluated = 0
+
+	def decide(self, start: Sequence[float], step: float, bounds: Sequence[float], potential: Potential) -> Optional[str]:
+		"""Plans moves from the start and returns the first of them, the rest is kept in plan.
+
+		Args:
+			start (Sequence[float]): position of player.
+			step (float): length of a step along every axis.
+			bounds (Sequence[float]): maximal coordinates x and y, positions are clipped to them and to zero.
+			potential (Potential): function that returns values of potential at an array of integer points of shape (P, 2).
+
+		Returns:
+			Optional[str]: the first direction of the best plan, None if potential of every sequence is zero.
+		"""
+		deadline = None if self.budget is None else perf_counter() + self.budget
+		previous = self.plan[1:]
+		self.reached = self.evaluated = 0
+		if deadline is not None and self.budget <= 0 and len(previous):
+			self.plan = previous
+			return DIRECTIONS[previous[0]]
+
+		positions = np.array([start], dtype=np.float64)
+		sequences = np.zeros((1, 0), dtype=np.int8)
+		scores = np.zeros(1)
+		weight = 1.0
+		moves = _MOVES * step
+		for level in range(self.depth):
+			started = perf_counter()
+			positions = np.clip(positions[:, None, :] + moves[None, :, :], 0, bounds).reshape(-1, 2)
+			sequences = np.column_stack((np.repeat(sequences, len(DIRECTIONS), axis=0),
+										 np.tile(np.arange(len(DIRECTIONS), dtype=np.int8), len(sequences))))
+			# positions are truncated like coordinates of cells of the potential
+			scores = np.repeat(scores, len(DIRECTIONS)) + weight * potential(positions.astype(np.int64))
+			weight *= self.discount
+			self.evaluated += len(positions)
+			expanded = len(positions)
+			if self.beam is not None and len(scores) > self.beam:
+				keep = np.argsort(scores, kind="stable")[:self.beam]
+				if len(previous) > level:
+					kept = np.flatnonzero(np.all(sequences == previous[:level + 1], axis=1))
+					if len(kept) and kept[0] not in keep: keep[-1] = kept[0]
+				# order of enumeration is kept, so ties are broken by the first sequence
+				keep.sort()
+				positions, sequences, scores = positions[keep], sequences[keep], scores[keep]
+			self.reached = level + 1
+			if deadline is not None:
+				# cost of the next level is estimated from cost of a position of this one
+				now = perf_counter()
+				if now + (now - started) * len(positions) * len(DIRECTIONS) / expanded > deadline: break
+
+		best = int(np.argmin(scores))
+		if scores[best] == 0.0:
+			self.plan = np.zeros(0, dtype=np.int8)
+			return None
+		self.plan = sequences[best]
+		return DIRECTIONS[self.plan[0]]
@@ -0,0 +1,156 @@
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from .spatial import GridIndex
+
+
+@lru_cache(maxsize=64)
+def gaussian(size: int, fwhm: float, center: Optional[Tuple[float, float]] =None, height: float =1) -> np.ndarray:
+	"""Returns a square array of a Gaussian, cached per arguments, so it is read-only.
+
+	Args:
+		size (int): length of side of array.
+		fwhm (float): full width at half maximum.
+		center (Optional[Tuple[float, float]], optional): peak of Gaussian. Defaults to None, that is, the middle of array.
+		height (float, optional): value at the peak. Defaults to 1.
+
+	Returns:
+		np.ndarray: array of shape (size, size).
+	"""
+	x = np.arange(0, size, 1, float)
+	y = x[:, np.newaxis]
+	x0, y0 = (size // 2, size // 2) if center is None else center
+	kernel = height * np.exp(-4 * np.log(2) * ((x - x0)**2 + (y - y0)**2) / fwhm**2)
+	kernel.setflags(write=False)
+	return kernel
+
+
+class FoodPotential:
+	"""Potential field of food: a Gaussian kernel of side 2 * radius is stamped around every food and the field
+	is the minimum of all kernels and zero.
+
+	dense rasterizes the field over the whole board, like GradAgent used to every tick; at evaluates the same values
+	only at the given points, so its cost depends on count of food near the points instead of area of the board.
+	"""
+
+	def __init__(self, radius: int =20, fwhm: float =20, height: float =-1) -> None:
+		"""Creates a field.
+
+		Args:
+			radius (int, optional): half of side of kernel. Defaults to 20.
+			fwhm (float, optional): full width at half maximum of kernel. Defaults to 20.
+			height (float, optional): value of kernel at food. Defaults to -1.
+		"""
+		self.radius = radius
+		self.kernel = gaussian(2 * radius, fwhm, (radius, radius), height)
+
+	def dense(self, food: np.ndarray, board: Sequence[int]) -> np.ndarray:
+		"""Rasterizes the field over the whole board.
+
+		Args:
+			food (np.ndarray): positions of food, array of shape (N, 2).
+			board (Sequence[int]): size of board.
+
+		Returns:
+			np.ndarray: field of shape board, indexed by x and y.
+		"""
+		radius, ring_size = self.radius, 2 * self.radius
+		field = np.zeros(tuple(board))
+		for fx, fy in np.asarray(food).reshape(-1, 2).tolist():
+			start_x, end_x = max(fx - radius, 0), min(fx + radius, board[0])
+			start_y, end_y = max(fy - radius, 0), min(fy + radius, board[1])
+			s_x, e_x = max(radius - fx, 0), min(ring_size, board[0] - fx + radius)
+			s_y, e_y = max(radius - fy, 0), min(ring_size, board[1] - fy + radius)
+			field[start_x:end_x, start_y:end_y] = np.fmin(self.kernel[s_x:e_x, s_y:e_y], field[start_x:end_x, start_y:end_y])
+		return field
+
+	def at(self, food: np.ndarray, points: np.ndarray) -> np.ndarray:
+		"""Evaluates the field at points of the board, values are equal to the rasterized field at the points.
+
+		Args:
+			food (np.ndarray): positions of food, array of shape (N, 2).
+			points (np.ndarray): integer coordinates inside the board, array of shape (P, 2).
+
+		Returns:
+			np.ndarray: values of field at points, array of shape (P,).
+		"""
+		points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+		food = np.asarray(food, dtype=np.int64).reshape(-1, 2)
+		radius, ring_size = self.radius, 2 * self.radius
+		if len(food) and len(points):
+			# kernel of food covers points from food - radius to food + radius - 1
+			low, high = points.min(axis=0) - radius + 1, points.max(axis=0) + radius
+			food = food[np.all((food >= low) & (food <= high), axis=1)]
+		if not len(food) or not len(points):
+			return np.zeros(len(points))
+		offsets = points[:, None, :] - food[None, :, :] + radius
+		inside = np.all((offsets >= 0) & (offsets < ring_size), axis=2)
+		offsets = np.clip(offsets, 0, ring_size - 1)
+		values = np.where(inside, self.kernel[offsets[..., 0], offsets[..., 1]], 0.0)
+		return np.min(values, axis=1, initial=0.0)
+
+	def near(self, index: GridIndex, points: np.ndarray) -> np.ndarray:
+		"""Evaluates the field at points like at, but reads only food found by a spatial index near the points,
+		e.g. observation.food_index of an incremental observation, which moves only food changed since the previous tick.
+
+		Args:
+			index (GridIndex): index of food.
+			points (np.ndarray): integer coordinates inside the board, array of shape (P, 2).
+
+		Returns:
+			np.ndarray: values of field at points, array of shape (P,).
+		"""
+		points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+		if not len(points): return np.zeros(0)
+		center = (points.min(axis=0) + points.max(axis=0)) / 2
+		# every food whose kernel covers a point is within the kernel diagonal from that point
+		reach = float(np.hypot(*(points - center).T).max()) + self.radius * 2**0.5 + 1
+		return self.at(index.values[index.within(center, reach), :2], points)
+
+
+class PlayersPotential:
+	"""Potential of other players: Gaussians over the whole board, which repel from players at least as big as the bot
+	and attract to smaller ones, with widths proportional to radii of players. Gaussians are not truncated, so values
+	at points are computed in closed form from distances to players, without rasterizing any kernel.
+
+	Repulsions of bigger players are summed, attractions of smaller players are combined by minimum, like food.
+	"""
+
+	def __init__(self, threat_height: float =5, threat_width: float =2, prey_height: float =-5, prey_width: float =15) -> None:
+		"""Creates a field.
+
+		Args:
+			threat_height (float, optional): value at a player at least as big as the bot. Defaults to 5.
+			threat_width (float, optional): fwhm of Gaussian of such player divided by its radius. Defaults to 2.
+			prey_height (float, optional): value at a smaller player. Defaults to -5.
+			prey_width (float, optional): fwhm of Gaussian of smaller player divided by its radius. Defaults to 15.
+		"""
+		self.threat_height, self.threat_width = threat_height, threat_width
+		self.prey_height, self.prey_width = prey_height, prey_width
+
+	def at(self, players_xy: np.ndarray, players_r: np.ndarray, radius: float, points: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+		"""Evaluates repulsions and attractions of players at points.
+
+		Args:
+			players_xy (np.ndarray): positions of other players, array of shape (M, 2).
+			players_r (np.ndarray): radii of other players, array of shape (M,).
+			radius (float): radius of the bot.
+			points (np.ndarray): coordinates, array of shape (P, 2).
+
+		Returns:
+			Tuple[np.ndarray, np.ndarray]: sums of repulsions and minima of attractions and zero, arrays of shape (P,).
+		"""
+		points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+		players_r = np.asarray(players_r, dtype=np.float64)
+		if not len(players_r):
+			return np.zeros(len(points)), np.zeros(len(points))
+		threat = players_r >= radius
+		height = np.where(threat, self.threat_height, self.prey_height)
+		fwhm = players_r * np.where(threat, self.threat_width, self.prey_width)
+		offsets = points[:, None, :] - np.asarray(players_xy, dtype=np.float64)[None, :, :]
+		with np.errstate(divide="ignore", invalid="ignore"):
+			values = height * np.exp(-4 * np.log(2) * (offsets**2).sum(axis=2) / fwhm**2)
+		values = np.nan_to_num(values)
+		return np.where(threat, values, 0.0).sum(axis=1), np.min(np.where(threat, 0.0, values), axis=1, initial=0.0)
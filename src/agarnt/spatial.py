@@ -0,0 +1,194 @@
+from math import floor
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .entities import EntitySlots
+
+Predicate = Callable[[np.ndarray], np.ndarray]
+# average count of entities per cell of automatically sized grid
+_PER_CELL = 8
+
+
+class GridIndex:
+	"""Uniform grid over positions of agarnt entities, the first two values of every row. Queries visit cells in rings
+	around the queried point, so their cost depends on density of entities near the point, not on count of all entities.
+
+	The index is either kept in sync with EntitySlots, where only slots changed since the previous update are moved,
+	or rebuilt from an array of rows, where identifiers are indices of rows. Ties of distance are broken by identifiers,
+	so nearest of rebuilt index is the first minimum, like argmin of a scan.
+	"""
+
+	def __init__(self, cell_size: Optional[float] =None) -> None:
+		"""Creates an empty index.
+
+		Args:
+			cell_size (Optional[float], optional): size of square cell. Defaults to None, that is, the size is chosen
+			by the first build, so that there are about 8 entities per cell.
+		"""
+		self.cell_size = cell_size
+		self.values: np.ndarray = np.zeros((0, 2), dtype=np.int64)
+		self.tick = -1
+		self.__cells: Dict[Tuple[int, int], Set[int]] = {}
+		self.__cell_of: Dict[int, Tuple[int, int]] = {}
+		self.__slots: Optional[EntitySlots] = None
+		self.__extent = (0, 0, -1, -1)
+
+	def __len__(self) -> int:
+		return len(self.__cell_of)
+
+	def __size_cells(self, positions: np.ndarray):
+		if self.cell_size is not None or not len(positions): return
+		area = float(np.prod(np.ptp(positions, axis=0) + 1))
+		self.cell_size = max(1.0, (area * _PER_CELL / len(positions)) ** 0.5)
+
+	def __cell(self, x: float, y: float) -> Tuple[int, int]:
+		return floor(x / self.cell_size), floor(y / self.cell_size)
+
+	def __insert(self, identifier: int, cell: Tuple[int, int]):
+		self.__cells.setdefault(cell, set()).add(identifier)
+		self.__cell_of[identifier] = cell
+		x0, y0, x1, y1 = self.__extent
+		self.__extent = (min(x0, cell[0]), min(y0, cell[1]), max(x1, cell[0]), max(y1, cell[1]))
+
+	def __discard(self, identifier: int):
+		cell = self.__cell_of.pop(identifier, None)
+		if cell is None: return
+		members = self.__cells[cell]
+		members.discard(identifier)
+		if not members: del self.__cells[cell]
+
+	def rebuild(self, values: np.ndarray):
+		"""Indexes all rows of an array, e.g. observation.food, identifiers are indices of rows.
+
+		Args:
+			values (np.ndarray): array of shape (N, width), positions are the first two columns.
+		"""
+		self.values, self.__slots = values, None
+		self.__cells, self.__cell_of = {}, {}
+		if not len(values):
+			self.__extent = (0, 0, -1, -1)
+			return
+		self.__size_cells(values[:, :2])
+		cells = np.floor_divide(values[:, :2], self.cell_size).astype(np.int64)
+		self.__extent = (int(cells[:, 0].min()), int(cells[:, 1].min()), int(cells[:, 0].max()), int(cells[:, 1].max()))
+		order = np.lexsort((cells[:, 1], cells[:, 0]))
+		sorted_cells = cells[order]
+		starts = np.flatnonzero(np.any(np.diff(sorted_cells, axis=0), axis=1)) + 1
+		for cell, members in zip(map(tuple, sorted_cells[np.concatenate(([0], starts))].tolist()), np.split(order, starts)):
+			members = members.tolist()
+			self.__cells[cell] = set(members)
+			self.__cell_of.update(dict.fromkeys(members, cell))
+
+	def update(self, slots: EntitySlots):
+		"""Moves entities changed since the previous update, the first update indexes all of them.
+
+		Args:
+			slots (EntitySlots): slots of entities, identifiers are slots.
+		"""
+		if slots is not self.__slots:
+			self.__cells, self.__cell_of, self.__extent, self.tick = {}, {}, (0, 0, -1, -1), -1
+			self.__slots = slots
+		if slots.tick == self.tick:
+			self.values = slots.values
+			return
+		try:
+			removed = slots.removed_since(self.tick)
+		except ValueError:
+			# history of removals is forgotten, every entity is indexed again
+			self.__cells, self.__cell_of, self.__extent, self.tick = {}, {}, (0, 0, -1, -1), -1
+			removed = ()
+		for slot in removed:
+			self.__discard(int(slot))
+		changed = slots.changed_since(self.tick)
+		self.values = values = slots.values
+		self.__size_cells(values[changed, :2])
+		for slot, (x, y) in zip(changed.tolist(), values[changed, :2].tolist()):
+			cell = self.__cell(x, y)
+			if self.__cell_of.get(slot, None) == cell: continue
+			self.__discard(slot)
+			self.__insert(slot, cell)
+		self.tick = slots.tick
+
+	def __ring(self, center: Tuple[int, int], distance: int) -> List[int]:
+		"""Returns identifiers of entities in cells at Chebyshev distance from the center cell."""
+		cx, cy = center
+		cells = self.__cells
+		if distance == 0:
+			return list(cells.get(center, ()))
+		members: List[int] = []
+		for x in range(cx - distance, cx + distance + 1):
+			for y in (cy - distance, cy + distance):
+				members.extend(cells.get((x, y), ()))
+		for y in range(cy - distance + 1, cy + distance):
+			for x in (cx - distance, cx + distance):
+				members.extend(cells.get((x, y), ()))
+		return members
+
+	def __max_ring(self, center: Tuple[int, int]) -> int:
+		x0, y0, x1, y1 = self.__extent
+		return max(center[0] - x0, x1 - center[0], center[1] - y0, y1 - center[1], -1)
+
+	def __candidates(self, point: Sequence[float], members: List[int], predicate: Optional[Predicate]) -> Tuple[np.ndarray, np.ndarray]:
+		identifiers = np.array(members, dtype=np.int64)
+		rows = self.values[identifiers]
+		if predicate is not None:
+			mask = predicate(rows)
+			identifiers, rows = identifiers[mask], rows[mask]
+		return identifiers, np.hypot(rows[:, 0] - point[0], rows[:, 1] - point[1])
+
+	def nearest(self, point: Sequence[float], k: int =1, predicate: Optional[Predicate] =None) -> np.ndarray:
+		"""Returns k nearest entities that satisfy the predicate.
+
+		Args:
+			point (Sequence[float]): coordinates x and y.
+			k (int, optional): count of entities. Defaults to 1.
+			predicate (Optional[Predicate], optional): function that gets rows of candidates and returns a boolean mask,
+			e.g. lambda rows: rows[:, 2] < radius for players smaller than a given radius. Defaults to None.
+
+		Returns:
+			np.ndarray: identifiers sorted by distance, fewer than k if there are not enough entities.
+		"""
+		if not self.__cell_of: return np.zeros(0, dtype=np.int64)
+		center = self.__cell(point[0], point[1])
+		found_ids: List[np.ndarray] = []
+		found_dists: List[np.ndarray] = []
+		count = 0
+		for distance in range(self.__max_ring(center) + 1):
+			members = self.__ring(center, distance)
+			if members:
+				identifiers, dists = self.__candidates(point, members, predicate)
+				found_ids.append(identifiers)
+				found_dists.append(dists)
+				count += len(identifiers)
+			# entities in further rings are not closer than distance * cell_size
+			if count >= k and np.partition(np.concatenate(found_dists), k - 1)[k - 1] <= distance * self.cell_size:
+				break
+		if not count: return np.zeros(0, dtype=np.int64)
+		identifiers, dists = np.concatenate(found_ids), np.concatenate(found_dists)
+		return identifiers[np.lexsort((identifiers, dists))[:k]]
+
+	def within(self, point: Sequence[float], radius: float, predicate: Optional[Predicate] =None) -> np.ndarray:
+		"""Returns entities closer than radius that satisfy the predicate.
+
+		Args:
+			point (Sequence[float]): coordinates x and y.
+			radius (float): maximal distance, exclusive.
+			predicate (Optional[Predicate], optional): function that gets rows of candidates and returns a boolean mask. Defaults to None.
+
+		Returns:
+			np.ndarray: identifiers sorted by distance.
+		"""
+		if not self.__cell_of: return np.zeros(0, dtype=np.int64)
+		x0, y0 = self.__cell(point[0] - radius, point[1] - radius)
+		x1, y1 = self.__cell(point[0] + radius, point[1] + radius)
+		cells = self.__cells
+		members: List[int] = []
+		for x in range(max(x0, self.__extent[0]), min(x1, self.__extent[2]) + 1):
+			for y in range(max(y0, self.__extent[1]), min(y1, self.__extent[3]) + 1):
+				members.extend(cells.get((x, y), ()))
+		if not members: return np.zeros(0, dtype=np.int64)
+		identifiers, dists = self.__candidates(point, members, predicate)
+		inside = dists < radius
+		identifiers, dists = identifiers[inside], dists[inside]
+		return identifiers[np.lexsort((identifiers, dists))]
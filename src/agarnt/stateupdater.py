@@ -1,10 +1,25 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Union
 from ..base import StateUpdater
+from .observation import AgarntObservation
 
 
 class AgarntStateUpdater(StateUpdater):
 	_current_state: Dict[str, Any]
+
+	def __init__(self, init_state: Dict[str, Any], columnar: bool =False, incremental: bool =False) -> None:
+		"""Creates an updater of agarnt states.
+
+		Args:
+			init_state (Dict[str, Any]): initial state.
+			columnar (bool, optional): flag that indicates whether or not agents get AgarntObservation with NumPy arrays
+			instead of merged dict, e.g. register_updater_args("agarnt", {}, columnar=True). Defaults to False.
+			incremental (bool, optional): flag that indicates whether or not food and players of the observation are tracked
+			in slots with stable indices and ticks of changes, see EntitySlots. It implies columnar. Defaults to False.
+		"""
+		super().__init__(init_state)
+		self.observation: Optional[AgarntObservation] = AgarntObservation(incremental=incremental) if columnar or incremental else None
  
-	def _update(self, update_to_apply: Dict[str, Any]) -> Dict[str, Any]:
+	def _update(self, update_to_apply: Dict[str, Any]) -> Union[Dict[str, Any], AgarntObservation]:
 		self._current_state.update(**update_to_apply)
-		return self._current_state
\ No newline at end of file
+		if self.observation is None: return self._current_state
+		return self.observation.update(self._current_state)
@@ -1,17 +1,18 @@
-from multiprocessing import Pool
+from multiprocessing import Pool, RawArray
 import threading
 import traceback
-from typing import Optional, Type
-import random
+from typing import Any, Dict, List, Optional, Type
 from websockets.legacy.client import connect, WebSocketClientProtocol
 import asyncio
-from time import sleep
-from ._utils import Event as _Event, _Bots_Manager
-from ._gameproxy import connection_proxy as __connection_proxy, cleanup
+from time import sleep, perf_counter, process_time
+from ._utils import Event as _Event, _Bots_Manager, _plan_shards
+from ._gameproxy import connection_proxy as __connection_proxy, cleanup, connection_stats, new_executor as __new_executor, bind as __bind, \
+	_GameConnectionHandler as __GameConnectionHandler, _handler_of as __handler_of, close_all as __close_all
+from ._metrics import _share, _shared_counts, _SLOT
 from .agent import Agent
 from .action import Action
 from .stateupdater import StateUpdater
-from .. import _logger, _set_var, _get_var
+from .. import _logger, _set_var, _get_var, set_connection_options, _get_connection_options
 
 def get_session_id(): 
 	return _get_var('session_id')
@@ -86,7 +87,99 @@ async def __join(server: str, session_id: str, bot_name: str, spectator=False):
 
 	return socket
 
-def __run_bot(bot_class: Type[Agent], server: str, session_id: str, int_id: int, evt: _Event, game_type:str, **agent_kwds):
+_POLL_INTERVAL = 0.1
+
+def __lower_priority():
+	"""Lowers the priority of the current bot process.
+	"""
+	from sys import platform
+	if platform == "win32":
+		import win32api, win32process, win32con
+
+		pid = win32api.GetCurrentProcessId()
+		handle = win32api.OpenProcess(win32con.PROCESS_ALL_ACCESS, True, pid)
+		win32process.SetPriorityClass(handle, win32process.THREAD_PRIORITY_LOWEST)
+	else:
+		from os import nice
+		nice(20)
+
+def __stop(stopped: threading.Event, handlers: List[__GameConnectionHandler]):
+	"""Stops bots of the current process, bots waiting for the next decision are woken up immediately.
+
+	Args:
+		stopped (threading.Event): event checked by decision loops of the process
+		handlers (List[__GameConnectionHandler]): handlers of bots
+	"""
+	stopped.set()
+	for handler in handlers:
+		if handler.scheduler: handler.scheduler.stop()
+
+def __stop_on_event(evt: _Event, stopped: threading.Event, handlers: List[__GameConnectionHandler]):
+	"""Waits, without polling, for the event broadcast by _Bots_Manager and stops bots of the current process.
+
+	Args:
+		evt (_Event): event shared by all processes of bots
+		stopped (threading.Event): event checked by decision loops of the process
+		handlers (List[__GameConnectionHandler]): handlers of bots
+	"""
+	evt.wait()
+	__stop(stopped, handlers)
+
+def __report(handlers: Dict[int, Optional[__GameConnectionHandler]], start: float, cpu_start: float) -> Dict[str, Any]:
+	"""Makes a report of a worker process returned to the spawning process.
+
+	Args:
+		handlers (Dict[int, Optional[__GameConnectionHandler]]): handlers of bots by identifiers, None if a bot failed to connect.
+		start (float): perf_counter() at start of the worker.
+		cpu_start (float): process_time() at start of the worker.
+
+	Returns:
+		Dict[str, Any]: connection state and counters of every bot, CPU time and wall time of the worker.
+	"""
+	return {
+		"bots": {int_id: {"connected": handler is not None and handler.socket is not None, **(handler.stats() if handler else {})}
+				 for int_id, handler in handlers.items()},
+		"cpu_time": process_time() - cpu_start,
+		"wall_time": perf_counter() - start
+	}
+
+def __play(bot: Agent, int_id: int, stopped: threading.Event) -> int:
+	"""Runs the decision loop of a connected bot until the game is over, the event is set or the connection is lost for good.
+	The bot decides when its scheduler wakes it up, that is, on a new state or with the pace of server.
+	Bots that override Agent.ponder ponder after every decision until a new state arrives. Agent.close is called
+	when the loop ends.
+
+	Args:
+		bot (Agent): connected bot
+		int_id (int): identifier of bot object
+		stopped (threading.Event): event that stops the bot
+
+	Returns:
+		int: identifier of bot object
+	"""
+	handler = __handler_of(bot)
+	scheduler = handler.scheduler
+	ponders = type(bot).ponder is not Agent.ponder
+	interrupted = lambda: stopped.is_set() or handler.closed or scheduler.has_new_state()
+	done = False
+	try:
+		while not done and not stopped.is_set() and not handler.closed:
+			if not scheduler.wait(_POLL_INTERVAL): continue
+
+			_ = bot.choose_action()
+			_logger.info(f"Chosen action {_} goes brr")
+			done = bot.is_done
+			if ponders and not done: bot.ponder(interrupted)
+		else: print(f"BOT: {type(bot)} is dead")
+
+	except Exception as e:
+		_logger.warn(f"BOT: {type(bot)} is dead, exception occurred {e}.")
+		traceback.print_tb(e.__traceback__)
+	finally:
+		bot.close()
+	return int_id
+
+def __run_bot(bot_class: Type[Agent], server: str, session_id: str, int_id: int, evt: _Event, game_type:str, options: Dict[str, Any], **agent_kwds):
 	"""Helper function for bot execution
 
 	Args:
@@ -94,77 +187,140 @@ def __run_bot(bot_class: Type[Agent], server: str, session_id: str, int_id: int,
 		server (str): server URL
 		session_id (str): session identifier
 		int_id (int): identifier of bot object
+		options (Dict[str, Any]): connection options of the spawning process
+
+	Returns:
+		Dict[str, Any]: report of the worker, see __report function
 	"""
-	
+
 	bot_name = f"{bot_class.__name__}_{int_id}"
-	
+
 	def wrapper():
 		"""Wrapper for networking tasks execution during bot interaction with game.
 		"""
-		from sys import platform
 		import signal
-		if platform == "win32":
-			import win32api, win32process, win32con
-
-			pid = win32api.GetCurrentProcessId()
-			handle = win32api.OpenProcess(win32con.PROCESS_ALL_ACCESS, True, pid)
-			win32process.SetPriorityClass(handle, win32process.THREAD_PRIORITY_LOWEST)
-		else:
-			from os import nice
-			nice(20)
-		_set_var('game_type', game_type)	
+		start, cpu_start = perf_counter(), process_time()
+		__lower_priority()
+		_set_var('game_type', game_type)
+		set_connection_options(**options)
 		async def connect_to_url(bot_name): return await __join(server, session_id, bot_name)
 
-		_ = __connection_proxy(connect_to_url)(bot_name)
-  
+		try:
+			_ = __connection_proxy(connect_to_url)(bot_name)
+		except Exception as e:
+			_logger.warn(f"BOT: {bot_name} failed to connect, exception occurred {e}.")
+			cleanup()
+			return __report({int_id: None}, start, cpu_start)
+
 		bot = bot_class(**agent_kwds)
-  
+		__handler_of(bot).metrics.share(_shared_counts(int_id))
+		bot.handle_new_states(None)
 
-		def poll_and_clean(*args, **kwargs):
-			"""Polls a state of stored event and closes bot process if a state is set.
-			"""
-			while not evt.is_set():sleep(0.1)
-			
-			else: 
-				_logger.info(f"Cleaning up bot. No {int_id}")
-				terminate_bot()	
-			
+		stopped, handlers = threading.Event(), [__handler_of(bot)]
 		def terminate_bot(*args, **kwargs):
-			global done
-			done = False
-			evt.set()
+			__stop(stopped, handlers)
 		signal.signal(signal.SIGINT, terminate_bot)
-		conn_cleaner = threading.Thread(daemon=True, target=poll_and_clean)
+		conn_cleaner = threading.Thread(daemon=True, target=__stop_on_event, args=(evt, stopped, handlers))
 		conn_cleaner.start()
-		bot.handle_new_states(None)
-		done = False
    
 		try:
-			while not done and not evt.is_set():
-				sleep(random.random())
-				
-				_ = bot.choose_action()
-				_logger.info(f"Chosen action {_} goes brr")
-				done = bot.is_done
-			else: print(f"BOT: {type(bot)} is dead")
-				
-   
-		except Exception as e:
-			_logger.warn(f"BOT: {type(bot)} is dead, exception occurred {e}.")
-			traceback.print_tb(e.__traceback__)
-		finally: cleanup()
-		return int_id
+			__play(bot, int_id, stopped)
+		finally:
+			_logger.info(f"Cleaning up bot. No {int_id}")
+			report = __report({int_id: handlers[0]}, start, cpu_start)
+			cleanup()
+		return report
 
 	return wrapper()
+
+def __run_bots(bot_class: Type[Agent], server: str, session_id: str, int_ids: List[int], evt: _Event, game_type:str, options: Dict[str, Any], **agent_kwds):
+	"""Helper function for execution of many bots in a single process. Bots share one event-loop and one executor,
+	but every bot has its own connection handler and its own decision thread.
+
+	Args:
+		bot_class (Type[Agent]): Agent initializer
+		server (str): server URL
+		session_id (str): session identifier
+		int_ids (List[int]): identifiers of bot objects
+		evt (_Event): event that stops all bots
+		game_type (str): type of game
+		options (Dict[str, Any]): connection options of the spawning process
+
+	Returns:
+		Dict[str, Any]: report of the worker, see __report function
+	"""
+	import signal
+	start, cpu_start = perf_counter(), process_time()
+	__lower_priority()
+	_set_var('game_type', game_type)
+	set_connection_options(**options)
+
+	executor = __new_executor()
+	stopped = threading.Event()
+	handlers: List[__GameConnectionHandler] = []
+	threads: List[threading.Thread] = []
+	connected: Dict[int, Optional[__GameConnectionHandler]] = {int_id: None for int_id in int_ids}
+
+	def terminate_bots(*args, **kwargs):
+		__stop(stopped, handlers)
+	signal.signal(signal.SIGINT, terminate_bots)
+	threading.Thread(daemon=True, target=__stop_on_event, args=(evt, stopped, handlers)).start()
+
+	async def connect_to_url(bot_name): return await __join(server, session_id, bot_name)
+
+	try:
+		for int_id in int_ids:
+			if stopped.is_set(): break
+			handler = __GameConnectionHandler(executor)
+			handler.metrics.share(_shared_counts(int_id))
+			handlers.append(handler)
+			try:
+				__connection_proxy(connect_to_url, handler)(f"{bot_class.__name__}_{int_id}")
+			except Exception as e:
+				_logger.warn(f"BOT: {bot_class.__name__}_{int_id} failed to connect, exception occurred {e}.")
+				continue
+			connected[int_id] = handler
+
+			bot = bot_class(**agent_kwds)
+			__bind(bot, handler)
+			bot.handle_new_states(None)
+
+			thread = threading.Thread(daemon=True, target=__play, args=(bot, int_id, stopped))
+			thread.start()
+			threads.append(thread)
+
+		while not stopped.is_set() and any(thread.is_alive() for thread in threads):
+			stopped.wait(_POLL_INTERVAL)
+
+	except Exception as e:
+		_logger.warn(f"BOTS: {int_ids} are dead, exception occurred {e}.")
+		traceback.print_tb(e.__traceback__)
+	finally:
+		_logger.info(f"Cleaning up bots. No {int_ids}")
+		__stop(stopped, handlers)
+		for thread in threads:
+			thread.join(timeout=1)
+		__close_all(handlers, timeout=1)
+		report = __report(connected, start, cpu_start)
+		executor.stop()
+		executor.join(timeout=1)
+	return report
 	
-def spawn_bots(server: str, session_id: str, bot_class: Type[Agent], count: int, **agent_kwds):
-	"""Spawns some random bots on server 
+def spawn_bots(server: str, session_id: str, bot_class: Type[Agent], count: int, bots_per_process: Optional[int] =1,
+			   bot_cost: Optional[float] =None, **agent_kwds):
+	"""Spawns some random bots on server. Bots are sharded across worker processes and processes across pools,
+	so the count of bots is not limited.
 
 	Args:
 		server (str): URL of target server
 		session_id (str): session identifier of game
 		bot_class (Type): initializer of bot objects
-		count (int): count of bots to spawn; max of count is 100
+		count (int): count of bots to spawn
+		bots_per_process (Optional[int], optional): count of bots hosted by a single process, bots of the same process share
+			one event-loop. None means that the count is chosen from count of cores and bot_cost. Defaults to 1, that is,
+			every bot has its own process.
+		bot_cost (Optional[float], optional): measured share of a core used by a single bot, e.g. summary()["bot_cost"]
+			of a previous run, applicable if bots_per_process is None. Defaults to None.
 		agent_kwds: agent's constructor parameters
 	"""
 	if _get_var('game_type') == "":
@@ -179,36 +335,23 @@ def spawn_bots(server: str, session_id: str, bot_class: Type[Agent], count: int,
 		response = rq.get(f"{url}/games/{session_id}").json()
 		_set_var('game_type', response.get('game_type', ''))
  
-	from sys import platform
-	_MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS = 63 - 2 #2 workers needed as a overhead for ProcessPoolExecutor and multiprocessing.Pool as well
-	_TOTAL_MAX = 100
-	count = min(count, _TOTAL_MAX)
- 
-	def __make(count_of_workers: int, curr:int =0):
-		executor = Pool(processes=count_of_workers)
+	_event = _Event()
+
+	def __make(chunks: List[List[int]]):
+		# histograms of bots of the pool, workers write and the manager reads them without any messages
+		histograms = RawArray("q", _SLOT * sum(len(ids) for ids in chunks))
+		executor = Pool(processes=len(chunks), initializer=_share, initargs=(histograms, chunks[0][0]))
 		
-		_events = [_Event() for _ in range(count_of_workers)]
-		_futures = {num: executor.apply_async(__run_bot, (bot_class, server, session_id, num, _events[num-curr], _get_var('game_type')), 
-										 	  agent_kwds, callback=lambda _: _logger.info(f"Process of bot No. {_} is finished")
-										) for num in range(curr, curr + count_of_workers)}
+		_futures = [executor.apply_async(__run_bot, (bot_class, server, session_id, ids[0], _event, _get_var('game_type'), _get_connection_options()),
+										 	  agent_kwds, callback=lambda _: _logger.info(f"Process of bot No. {list(_['bots'])} is finished")
+										) if len(ids) == 1 else
+					executor.apply_async(__run_bots, (bot_class, server, session_id, ids, _event, _get_var('game_type'), _get_connection_options()),
+										 	  agent_kwds, callback=lambda _: _logger.info(f"Process of bots No. {list(_['bots'])} is finished")
+										) for ids in chunks]
 		
-		return executor, list( _futures.values()), _events
+		return executor, _futures, chunks, histograms
 
-	if platform == "win32":
-		params = []
-		workers = count - _MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS
-		_curr = 0
-		while workers > 0:
-			params.append(__make(_MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS, _curr))
-			workers -= _MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS
-			_curr += _MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS
-		else:
-			params.append(__make(workers + _MAX_COUNT_OF_WIN32_WAIT_FOR_MULTIPLE_OBJECTS, _curr))
-			
-	else:
-		executor, _futures, _events = __make(count)
-		params = [(executor, _futures, _events)]
-	
-	return _Bots_Manager(params)
+	params = [__make(chunks) for chunks in _plan_shards(count, bots_per_process, bot_cost)]
+	return _Bots_Manager(params, _event)
 	
-__all__ = [Agent, Action, get_session_id, spawn_bots, make_env, cleanup]
\ No newline at end of file
+__all__ = [Agent, Action, get_session_id, spawn_bots, make_env, cleanup, connection_stats]
\ No newline at end of file
@@ -0,0 +1,114 @@
+import threading
+from time import monotonic
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+
+_Item = TypeVar("_Item")
+_Result = TypeVar("_Result")
+
+
+class _Ticket:
+	__slots__ = ("item", "result", "error", "lead", "ready")
+
+	def __init__(self, item: Any) -> None:
+		self.item = item
+		self.result: Any = None
+		self.error: Optional[BaseException] = None
+		self.lead = False
+		self.ready = threading.Event()
+
+
+class _MicroBatcher(Generic[_Item, _Result]):
+	"""Evaluates items submitted by many threads in batches, e.g. observations of bots hosted by the same process.
+	There is no dedicated thread: a submitter becomes the leader, it waits until every member has submitted its item
+	or the delay has elapsed, evaluates the whole batch and wakes up the others. Items submitted during evaluation
+	wait for the next batch, led by the first of them. Every waiting thread has its own event, so a batch costs a single
+	wake-up per item.
+	"""
+
+	def __init__(self, evaluate: Callable[[List[_Item]], List[_Result]], max_delay: float =0.002) -> None:
+		"""Creates a batcher.
+
+		Args:
+			evaluate (Callable[[List[_Item]], List[_Result]]): function that returns results of a batch, in order of items.
+			max_delay (float, optional): maximal time for which the leader waits for items of other members. Defaults to 0.002.
+		"""
+		self.max_delay = max_delay
+		self.members = 0
+		self.batches = 0
+		self.items = 0
+		self.__evaluate = evaluate
+		self.__lock = threading.Lock()
+		self.__arrived = threading.Condition(self.__lock)
+		self.__pending: List[_Ticket] = []
+		self.__leading = False
+
+	def join(self):
+		"""Registers a member, the leader waits for items of all members.
+		"""
+		with self.__lock:
+			self.members += 1
+
+	def leave(self):
+		"""Unregisters a member.
+		"""
+		with self.__lock:
+			self.members = max(0, self.members - 1)
+			self.__arrived.notify()
+
+	def __call__(self, item: _Item) -> _Result:
+		"""Submits an item and waits for its result.
+
+		Args:
+			item (_Item): item to evaluate.
+
+		Raises:
+			BaseException: exception raised by evaluation of the batch of item.
+
+		Returns:
+			_Result: result of item.
+		"""
+		ticket = _Ticket(item)
+		with self.__lock:
+			self.__pending.append(ticket)
+			if not self.__leading:
+				self.__leading = ticket.lead = True
+			elif len(self.__pending) >= self.members:
+				self.__arrived.notify()
+
+		if not ticket.lead:
+			ticket.ready.wait()
+		if ticket.lead:
+			self.__lead()
+		if ticket.error is not None: raise ticket.error
+		return ticket.result
+
+	def __lead(self):
+		"""Collects and evaluates a batch, then hands leadership over to the first item submitted in the meantime."""
+		with self.__lock:
+			deadline = monotonic() + self.max_delay
+			while len(self.__pending) < self.members:
+				remaining = deadline - monotonic()
+				if remaining <= 0: break
+				self.__arrived.wait(remaining)
+			batch, self.__pending = self.__pending, []
+
+		try:
+			results = self.__evaluate([ticket.item for ticket in batch])
+			for ticket, result in zip(batch, results):
+				ticket.result = result
+		except BaseException as e:
+			for ticket in batch:
+				ticket.error = e
+		for ticket in batch:
+			ticket.lead = False
+			ticket.ready.set()
+
+		with self.__lock:
+			self.batches += 1
+			self.items += len(batch)
+			if self.__pending:
+				successor = self.__pending[0]
+				successor.lead = True
+				successor.ready.set()
+			else:
+				self.__leading = False
@@ -0,0 +1,101 @@
+from threading import Thread
+from time import perf_counter
+from typing import Any, Callable, Optional
+
+from .stateupdater import StateUpdater
+from ._queues import _FrameQueue
+from ._metrics import _BotMetrics
+from .. import _logger
+
+
+class _StateDispatcher(Thread):
+	"""Dedicated thread that decodes raw frames, merges them by state updater and delivers states to the agent,
+	so that the event-loop of connection does only I/O.
+	"""
+
+	def __init__(self, frames: _FrameQueue, decode: Callable[[Any], Any], deliver: Callable[[Any], None],
+				 updater: Optional[StateUpdater] =None, conflate: bool =False,
+				 is_closed: Callable[[], bool] =lambda: False, poll_interval: float =0.1,
+				 on_delivered: Callable[[Any], None] =lambda state: None, metrics: Optional[_BotMetrics] =None) -> None:
+		"""Creates a dispatcher of states.
+
+		Args:
+			frames (_FrameQueue): queue of raw frames and their arrival times filled by the event-loop.
+			decode (Callable[[Any], Any]): function that decodes a raw frame.
+			deliver (Callable[[Any], None]): handler of new state bound with agent.
+			updater (Optional[StateUpdater], optional): updater that merges decoded frames. Defaults to None.
+			conflate (bool, optional): flag that indicates whether or not the agent gets only the newest state,
+			every frame is merged anyway. Defaults to False.
+			is_closed (Callable[[], bool], optional): predicate that stops the dispatcher. Defaults to lambda: False.
+			poll_interval (float, optional): time between checks of is_closed predicate. Defaults to 0.1.
+			on_delivered (Callable[[Any], None], optional): callback called with every delivered state. Defaults to lambda state: None.
+			metrics (Optional[_BotMetrics], optional): metrics of bot, times of recv, decode, update and handle stages are recorded. Defaults to new metrics.
+		"""
+		super().__init__(daemon=True)
+		self.received = 0
+		self.delivered = 0
+		self.conflated = 0
+		self.arrival: Optional[float] =None
+		self.__frames = frames
+		self.__decode = decode
+		self.__deliver = deliver
+		self.__updater = updater
+		self.__conflate = conflate
+		self.__is_closed = is_closed
+		self.__poll_interval = poll_interval
+		self.__on_delivered = on_delivered
+		self.__metrics = metrics if metrics is not None else _BotMetrics()
+
+	def __merge(self, arrival: float, frame: Any) -> Any:
+		"""Decodes a frame and merges it with the current state.
+
+		Args:
+			arrival (float): arrival time of frame.
+			frame (Any): raw frame.
+
+		Returns:
+			Any: merged state.
+		"""
+		self.arrival = arrival
+		metrics, start = self.__metrics, perf_counter()
+		metrics.recv.add(start - arrival)
+		state = self.__decode(frame)
+		decoded = perf_counter()
+		metrics.decode.add(decoded - start)
+		_logger.debug("Obtained data from server; raw=%s; decompressed=%s", frame, state)
+		if self.__updater:
+			state = self.__updater(state)
+			metrics.update.add(perf_counter() - decoded)
+		self.received += 1
+		return state
+
+	def __dispatch(self, state: Any):
+		"""Delivers a state to the agent.
+
+		Args:
+			state (Any): merged state.
+		"""
+		self.delivered += 1
+		start = perf_counter()
+		self.__deliver(state)
+		self.__metrics.handle.add(perf_counter() - start)
+		self.__on_delivered(state)
+
+	def run(self):
+		"""Dispatches states as long as the predicate is_closed is not satisfied.
+		"""
+		try:
+			while not self.__is_closed():
+				frames = self.__frames.take(self.__poll_interval)
+				if not frames: continue
+
+				if self.__conflate:
+					for arrival, frame in frames:
+						state = self.__merge(arrival, frame)
+					self.conflated += len(frames) - 1
+					self.__dispatch(state)
+				else:
+					for arrival, frame in frames:
+						self.__dispatch(self.__merge(arrival, frame))
+		except Exception as e:
+			_logger.info(f"Caught an exception: {e}. Ignored...")
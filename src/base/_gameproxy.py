@@ -2,46 +2,78 @@ from __future__ import annotations
 from abc import ABCMeta, abstractmethod
 from asyncio.tasks import Task
 import concurrent.futures as cf
-from typing import Any, Callable, Coroutine, List
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+from copy import deepcopy
 from websockets.legacy.client import WebSocketClientProtocol
-from websockets.exceptions import ConnectionClosedError, ConnectionClosedOK
+from websockets.exceptions import ConnectionClosed, ConnectionClosedError, ConnectionClosedOK
 from websockets.typing import Data
-import orjson
-import gzip
 import asyncio
+import random
+import threading
+from time import perf_counter
 from functools import partial
 import traceback
 
 from .stateupdater import StateUpdater
 from .action import Action
+from .codec import Codec, GzipCodec
 from ._utils import _ThreadedAsyncioExecutor, Event
-from .. import _logger, _get_var, _get_updater_initialization_params
+from ._queues import _SendQueue, _FrameQueue
+from ._dispatch import _StateDispatcher
+from ._scheduler import _TickScheduler
+from ._metrics import _BotMetrics
+from .replay import Recorder, new_recorder
+from .. import _logger, _get_var, _get_updater_initialization_params, _get_codec_initialization_params, _get_connection_option
 
 
-class __GameConnectionHandler:
-	"""Definition of a handler of a connection with a game-server.
+class _GameConnectionHandler:
+	"""Definition of a handler of a connection with a game-server. Every bot owns its own handler, while handlers
+	of bots hosted by the same process may share a single ThreadedAsyncioExecutor.
 	"""
-	__socket: WebSocketClientProtocol =None
-	__coro_thread: _ThreadedAsyncioExecutor = _ThreadedAsyncioExecutor()
-	__host: str= ""
-	__proxies: List[_Proxy] = []
+
+	def __init__(self, coro_executor: Optional[_ThreadedAsyncioExecutor] =None) -> None:
+		"""Creates a handler of a connection with a game-server.
+
+		Args:
+			coro_executor (Optional[_ThreadedAsyncioExecutor], optional): executor shared with other handlers. If not provided, the handler
+			creates and owns its executor. Defaults to None.
+		"""
+		self.__socket: WebSocketClientProtocol =None
+		self.__owns_executor = coro_executor is None
+		self.__coro_thread: Optional[_ThreadedAsyncioExecutor] = coro_executor
+		self.__host: str = ""
+		self.__tasks: List[Task] = []
+		self.__provider: Optional[Callable[[], Coroutine[Any, Any, WebSocketClientProtocol]]] =None
+		self.__reconnecting: Optional[Task] =None
+		self.__updater: StateUpdater =None
+		self.__send_queue: _SendQueue =None
+		self.__dispatcher: _StateDispatcher =None
+		self.__codec: Codec =None
+		self.__scheduler: _TickScheduler =None
+		self.__recorder: Optional[Recorder] =None
+		self._event = threading.Event()
+		self.metrics = _BotMetrics()
 
 	@property
-	def proxies(self):
-		"""Returns current list of active proxies.
+	def closed(self) -> bool:
+		"""Returns information whether or not the handler is closed.
 
 		Returns:
-			List[_Proxy]: list of active proxies.
+			bool: the "closed" state of handler.
 		"""
-		return self.__proxies
+		return self._event.is_set()
 
 	@property
 	def coro_executor(self):
-		"""Returns an instance of ThreadedAsyncioExecutor. It also lazily starts the executor.
+		"""Returns an instance of ThreadedAsyncioExecutor. It also lazily creates and starts the executor, so that the event-loop
+		of the default handler is not inherited by forked bot processes.
 
 		Returns:
 			_ThreadedAsyncioExecutor: an executor used by proxies to submit new coroutines.
 		"""
+		if self.__coro_thread is None:
+			self.__coro_thread = new_executor()
 		if not self.__coro_thread.started:
 			self.__coro_thread.start()
 		return self.__coro_thread
@@ -65,34 +97,286 @@ class __GameConnectionHandler:
 		self.__socket = _socket
 		self.__host = _socket.host
 
-	def close(self):
-		"""Closes all resources, cancels tasks, drops connections.
+	@property
+	def updater(self) -> Optional[StateUpdater]:
+		"""Returns a state updater of the bot served by this handler. It is lazily created for the current game type.
+
+		Returns:
+			Optional[StateUpdater]: state updater or None if there is no updater registered for the current game type.
 		"""
-		_logger.info("In close")
-		for proxy in self.__proxies:
-			proxy.teardown()
+		if self.__updater is None:
+			tup = _get_updater_initialization_params(_get_var("game_type"))
+			if tup:
+				updater_type, args, kwargs = tup
+				# each bot has to own its initial state, the registered arguments are shared by the whole process
+				self.__updater = updater_type(*deepcopy(args), **deepcopy(kwargs))
+		return self.__updater
 
-		self.coro_executor.cancel_tasks()
+	@property
+	def codec(self) -> Codec:
+		"""Returns a wire codec of the current connection. It is lazily created for the current game type and replaced
+		when the connection is resumed, gzip is used by default.
 
-		async def __clean_up_connection():
-			self.__socket.transfer_data_task.cancel()
-			await self.__socket.close_connection()
-			_logger.info("Dropped connection")
+		Returns:
+			Codec: codec of frames.
+		"""
+		if self.__codec is None:
+			self.__codec = self.__new_codec()
+		return self.__codec
+
+	@staticmethod
+	def __new_codec() -> Codec:
+		codec_type, args, kwargs = _get_codec_initialization_params(_get_var("game_type")) or (GzipCodec, (), {})
+		return codec_type(*args, **kwargs)
+
+	@staticmethod
+	def _decode(frame: Tuple[Codec, Data]) -> Any:
+		"""Decodes a frame by the codec of the connection that obtained it, see start_dispatching."""
+		codec, message = frame
+		return codec.decode(message)
+
+	@property
+	def send_queue(self) -> Optional[_SendQueue]:
+		"""Returns a queue of actions waiting to be sent. It exists as long as the handler is connected.
+
+		Returns:
+			Optional[_SendQueue]: queue of pending actions.
+		"""
+		return self.__send_queue
+
+	@property
+	def tick(self) -> int:
+		"""Returns tick of game, that is, count of states obtained so far.
+
+		Returns:
+			int: count of decoded states.
+		"""
+		return self.__dispatcher.received if self.__dispatcher else 0
+
+	@property
+	def scheduler(self) -> Optional[_TickScheduler]:
+		"""Returns a scheduler of decisions of agent. It exists as long as the handler dispatches states.
+
+		Returns:
+			Optional[_TickScheduler]: scheduler woken up by delivered states.
+		"""
+		return self.__scheduler
+
+	@property
+	def recorder(self) -> Optional[Recorder]:
+		"""Returns a recorder of obtained frames. It exists as long as the handler dispatches states and the option "record_path" is set.
+
+		Returns:
+			Optional[Recorder]: recorder of raw frames and their arrival times.
+		"""
+		return self.__recorder
+
+	def start_dispatching(self, deliver: Callable[[Any], None]) -> _FrameQueue:
+		"""Starts a dedicated thread that decodes frames, merges them and delivers states to the agent.
+		The event-loop only puts raw frames, together with their arrival times, into returned queue. A raw frame is
+		a pair of the codec of connection that obtained it and the message, so frames of a dropped connection are still
+		decoded by its codec after the connection is resumed.
+
+		Args:
+			deliver (Callable[[Any], None]): handler of new state bound with agent.
+
+		Returns:
+			_FrameQueue: queue of raw frames to fill.
+		"""
+		frames = _FrameQueue(_get_connection_option("dispatch_queue_size"))
+		if _get_connection_option("record_path"):
+			self.__recorder = new_recorder(_get_connection_option("record_path"), _get_var("game_type"))
+		self.__scheduler = _TickScheduler(_get_connection_option("tick_mode"), _get_connection_option("tick_pace"),
+										  _get_connection_option("max_decision_rate"), _get_connection_option("tick_timeout"))
+		self.__dispatcher = _StateDispatcher(frames, _GameConnectionHandler._decode, deliver, self.updater,
+											 _get_connection_option("conflate_states"), lambda: self.closed,
+											 on_delivered=self.__scheduler.notify, metrics=self.metrics)
+		self.__dispatcher.start()
+		return frames
+
+	def stats(self) -> Dict[str, float]:
+		"""Returns counters of the connection and lag of its event-loop.
+
+		Returns:
+			Dict[str, float]: counters of received and delivered states, sent, coalesced and dropped actions, decision latency.
+		"""
+		queue, dispatcher = self.__send_queue, self.__dispatcher
+		return {
+			"received_states": dispatcher.received if dispatcher else 0,
+			"delivered_states": dispatcher.delivered if dispatcher else 0,
+			"conflated_states": dispatcher.conflated if dispatcher else 0,
+			"sent_actions": queue.sent if queue else 0,
+			"coalesced_actions": queue.coalesced if queue else 0,
+			"dropped_actions": queue.dropped if queue else 0,
+			**self.metrics.summary(),
+			**self.coro_executor.loop_lag
+		}
+
+	def send(self, move: Any) -> bool:
+		"""Encodes a move and queues it to be sent by the event-loop. It returns immediately, unless the queue is full
+		and the "block" backpressure policy is chosen.
+
+		Args:
+			move (Any): encoded action of agent.
+
+		Returns:
+			bool: True if the move is queued, False if it is dropped.
+		"""
+		if self.__send_queue is None: return False
+		arrival = self.__dispatcher.arrival if self.__dispatcher else None
+		return self.__send_queue.put(self.tick, self.codec.encode(move), _get_connection_option("send_timeout"), arrival)
+
+	async def __drain(self):
+		"""Sends queued actions as long as the handler is not closed. Actions that could not be sent because of a dropped connection
+		are lost, the next ones are sent through the resumed connection.
+		"""
+		try:
+			while not self.closed:
+				payload, arrival = await self.__send_queue.get()
+				start = perf_counter()
+				try:
+					await self.__socket.send(payload)
+				except (ConnectionClosedError, OSError) as e:
+					self.metrics.lost_actions += 1
+					if not await self.resume(e): break
+					continue
+				sent = perf_counter()
+				self.metrics.send.add(sent - start)
+				if arrival is not None:
+					self.metrics.decision.add(sent - arrival)
+		except Exception as e:
+			_logger.info(f"Caught an exception: {e}. Ignored...")
+		finally:
 			await asyncio.sleep(0)
+
+	async def resume(self, reason: Exception) -> bool:
+		"""Resumes a dropped connection, that is, joins the same session again with jittered exponential backoff. The agent and
+		its state are kept, only the socket is replaced. It is awaited in the event-loop by both directions of connection,
+		so concurrent calls share a single attempt.
+
+		Args:
+			reason (Exception): exception that dropped the connection.
+
+		Returns:
+			bool: True if the connection is resumed, False if the handler is closed or all attempts failed.
+		"""
+		if self.closed: return False
+		if self.__reconnecting is None or self.__reconnecting.done():
+			self.__reconnecting = asyncio.ensure_future(self.__reconnect(reason))
+		return await asyncio.shield(self.__reconnecting)
+
+	async def __reconnect(self, reason: Exception) -> bool:
+		"""Joins the session again until success or the limit of attempts, delays are drawn from [0, min(cap, base * 2^attempt)].
+
+		Args:
+			reason (Exception): exception that dropped the connection.
+
+		Returns:
+			bool: True if the connection is resumed.
+		"""
+		_logger.warn(f"Connection with host: {self.__host} dropped -> {type(reason)}: {reason}")
+		attempts, base, cap = (_get_connection_option(key) for key in ("reconnect_attempts", "reconnect_base_delay", "reconnect_max_delay"))
+		lost = perf_counter()
+		for attempt in range(attempts if self.__provider else 0):
+			await asyncio.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+			if self.closed: return False
+			self.metrics.reconnect_attempts += 1
+			try:
+				socket = await self.__provider()
+			except Exception as e:
+				_logger.info(f"Attempt No. {attempt + 1} to reconnect failed -> {type(e)}: {e}")
+				continue
+			if self.closed:
+				await socket.close(1000)
+				return False
+			# pending actions are encoded by the codec of the dropped connection, the peer cannot decode them
+			self.metrics.lost_actions += self.__send_queue.clear() if self.__send_queue else 0
+			# a codec may keep the state of compression stream, the peer starts a new one for every connection
+			self.__codec = self.__new_codec()
+			self.socket = socket
+			self.metrics.downtime.add(perf_counter() - lost)
+			_logger.warn(f"Connection with host: {self.__host} resumed after {attempt + 1} attempts")
+			return True
+
+		_logger.warn(f"Unable to resume connection with host: {self.__host}, the bot is stopped")
+		self._event.set()
+		if self.__scheduler: self.__scheduler.stop()
+		return False
+
+	def submit(self, coro: Coroutine[Any, Any, Any]):
+		"""Submits a coroutine into the executor and keeps track of it, so that it can be cancelled on close.
+
+		Args:
+			coro (Coroutine[Any, Any, Any]): coroutine to run.
+
+		Returns:
+			Tuple[Task, Future]: returns Task and Task wrapped by concurrent.futures.Future
+		"""
+		task, future = self.coro_executor.submit(coro)
+		self.__tasks.append(task)
+		future.add_done_callback(lambda _: self.__tasks.remove(task))
+		return task, future
+
+	def connect(self, provider: Callable[[], Coroutine[Any, Any, WebSocketClientProtocol]]) -> WebSocketClientProtocol:
+		"""Runs a coroutine that yields a websocket and stores obtained socket. The provider is kept to resume the connection if it drops.
+
+		Args:
+			provider (Callable[[], Coroutine[Any, Any, WebSocketClientProtocol]]): function that returns a coroutine that connects with server endpoint.
+
+		Returns:
+			WebSocketClientProtocol: Obtained socket
+		"""
+		self.__provider = provider
+		_, future = self.submit(provider())
+		future.add_done_callback(lambda _: _logger.info("Finished an attempt to connect with host"))
+
+		for f in cf.as_completed([future]):
+			socket: WebSocketClientProtocol =f.result()
+
+		self.socket = socket
+		self.__send_queue = _SendQueue(_get_connection_option("send_queue_size"), _get_connection_option("send_backpressure"))
+		self.submit(self.__drain())
+		return socket
+
+	def begin_close(self) -> Optional[cf.Future]:
+		"""Starts closing of the handler: cancels tasks and starts the closing handshake without waiting for it.
+
+		Returns:
+			Optional[cf.Future]: future of the closing handshake, None if the handler is not connected.
+		"""
+		_logger.info("In close")
+		self._event.set()
+		self.coro_executor.cancel_tasks(self.__tasks)
+
+		async def __clean_up_connection():
+			# closing handshake first, otherwise the connection is dropped only after close_timeout
 			await self.__socket.close(1000)
 			_logger.info("Sent a socket disconnection code")
 			await asyncio.sleep(0)
+			await self.__socket.wait_closed()
+			_logger.info("Dropped connection")
+			await asyncio.sleep(0)
+
+		if self.__socket is None: return None
 
-		if self.__socket is not None:
+		_logger.info("Cleaning connection...")
+		_, future = self.coro_executor.submit(__clean_up_connection())
+		future.add_done_callback(lambda _: _logger.info("Finished an attempt to disconnect from host\n"))
+		return future
 
-			_logger.info("Cleaning connection...")
-			_, future = self.coro_executor.submit(__clean_up_connection())
-			future.add_done_callback(lambda _: _logger.info("Finished an attempt to disconnect from host\n"))
+	def finish_close(self, future: Optional[cf.Future], timeout: Optional[float] =None):
+		"""Waits for the closing handshake started by begin_close. Stops the executor only if it is owned by the handler.
 
+		Args:
+			future (Optional[cf.Future]): future returned by begin_close.
+			timeout (Optional[float], optional): maximal time to wait for the handshake. Defaults to None.
+		"""
+		if future is not None:
 			_logger.info("Collecting futures...")
 			try:
-				_logger.info("Collecting a future at:", hex(id(future)))
-				done, _ = cf.wait([future])
+				_logger.info(f"Collecting a future at: {hex(id(future))}")
+				done, _ = cf.wait([future], timeout)
+				if not done: future.cancel()
 				for completed_future in cf.as_completed(done):
 
 					completed_future.result()
@@ -101,25 +385,24 @@ class __GameConnectionHandler:
 
 				future.cancel()
 
-		self.coro_executor.stop()
+		if self.__recorder is not None:
+			self.__recorder.close()
+		if self.__owns_executor:
+			self.coro_executor.stop()
 
+	def close(self, timeout: Optional[float] =None):
+		"""Closes all resources, cancels tasks, drops connections. Stops the executor only if it is owned by the handler.
 
-class _Proxy(metaclass=ABCMeta):
-	"""Base class of proxies.
-	"""
+		Args:
+			timeout (Optional[float], optional): maximal time to wait for the closing handshake. Defaults to None.
+		"""
+		self.finish_close(self.begin_close(), timeout)
 
-	def __init__(self) -> None:
-		self._event = Event()
-		self._task: Task =None
-		_h_conn.proxies.append(self)
 
-	def teardown(self):
-		"""Terminates Proxy object. Sets possessed Event object and cancels, if possible, current task.
-		"""
-		_logger.info(f"Terminating: {self}")
-		self._event.set()
-		if self._task and not self._task.cancelled():
-			self._task.cancel()
+class _Proxy(metaclass=ABCMeta):
+	"""Base class of proxies. Proxies are shared by all instances of an Agent subclass, so every call is routed
+	to the connection handler bound to the calling instance.
+	"""
 
 	@abstractmethod
 	def _call(self, *args: Any, **kwargs: Any):...
@@ -149,14 +432,18 @@ class __ConnectionProxy(_Proxy):
 		and implemented agent
 	"""
 
-	def __init__(self, socket_provider: Callable[..., Coroutine[Any, Any, WebSocketClientProtocol]]) -> None:
+	def __init__(self, socket_provider: Callable[..., Coroutine[Any, Any, WebSocketClientProtocol]],
+				 handler: Optional[_GameConnectionHandler] =None) -> None:
 		"""	Creates an instance of __GameProxy class as a wrapper of provided async function that handles connection with game_server
 
 		Args:
 			socket_provider (*args, **kwargs) -> Coroutine[Any, Any, WebSocketClientProtocol]: Function that connects with server endpoint and yields socket
+			handler (Optional[_GameConnectionHandler], optional): handler that stores obtained socket. Defaults to the handler of the process.
 		"""
 		super().__init__()
+		self.__wrapped__ = socket_provider
 		self.__socket_provider = socket_provider
+		self.__handler = handler
 
 	def _call(self, *args: Any, **kwds: Any) -> WebSocketClientProtocol:
 		"""	Calls wrapped socket_provider function
@@ -164,17 +451,8 @@ class __ConnectionProxy(_Proxy):
 		Returns:
 			WebSocketClientProtocol: Obtained socket
 		"""
-		coro = self.__socket_provider(*args, **kwds)
-
-		self._task, future = _h_conn.coro_executor.submit(coro)
-		future.add_done_callback(lambda _: _logger.info("Finished an attempt to connect with host"))
-
-		for f in cf.as_completed([future]):
-			socket: WebSocketClientProtocol =f.result()
-
-		self._task = None
-		_h_conn.socket = socket
-		return socket
+		handler = self.__handler if self.__handler is not None else _h_conn
+		return handler.connect(partial(self.__socket_provider, *args, **kwds))
 
 
 class __SendProxy(_Proxy):
@@ -189,39 +467,28 @@ class __SendProxy(_Proxy):
 			action_getter (*args, **kwargs) -> Action: Function that returns an action
 		"""
 		super().__init__()
-		_h_conn.coro_executor.register_exception(ConnectionClosedError,
-			lambda e:_logger.warn(f"Connection dropped unsuccessfully, sending an action has been stopped with reason: {e.reason} and error code: {e.code}"))
-		_h_conn.coro_executor.register_exception(ConnectionClosedOK,
-			lambda e:_logger.warn("Connection dropped successfully, sending an action has been stopped"))
+		self.__wrapped__ = action_getter
 		self.__action_getter = action_getter
 
 	def _call(self, *args: Any, **kwds: Any) -> Action:
-		""" Sends to server a chosen action.
+		""" Queues a chosen action to be sent to server. It does not wait for the websocket write.
 
 		Returns:
 			Action: Chosen action
 		"""
+		handler = _handler_of(args[0])
+		metrics, start = handler.metrics, perf_counter()
 		action: Action = self.__action_getter(*args, **kwds)
-		if self._event.is_set(): return action
+		chosen = perf_counter()
+		metrics.choose_action.add(chosen - start)
+		metrics.decisions += 1
+		if handler.closed: return action
 
-		async def __send():
-			move_to_send = action.encode()
-			if move_to_send:
-				coro = _h_conn.socket.send(gzip.compress(orjson.dumps(move_to_send)))
-				try:
-					await coro
-				finally:
-					await asyncio.sleep(0)
-					return action
-
-		self._task, future = _h_conn.coro_executor.submit(__send())
-		try:
-			for f in cf.as_completed([future]):
-				action = f.result()
-		except Exception: pass
-		finally:
-			self._task = None
-			return action
+		move_to_send = action.encode()
+		if move_to_send:
+			handler.send(move_to_send)
+		metrics.encode.add(perf_counter() - chosen)
+		return action
 
 
 class __ReceiveProxy(_Proxy):
@@ -238,42 +505,90 @@ class __ReceiveProxy(_Proxy):
 			new_message_handler (*args, **kwargs) -> None: Function that handles new state.
 		"""
 		super().__init__()
-		_h_conn.coro_executor.register_exception(ConnectionClosedError,
-			lambda e:_logger.warn(f"Connection dropped unsuccessfully, sending an action has been stopped with reason: {e.reason} and error code: {e.code}"))
-		_h_conn.coro_executor.register_exception(ConnectionClosedOK,
-			lambda e:_logger.warn("Connection dropped successfully, sending an action has been stopped"))
+		self.__wrapped__ = new_message_handler
 		self.__handler = new_message_handler
 
-	@property
-	def __updater(self) -> StateUpdater:
-		if not hasattr(self, "_state_updater"):
-			game_type = _get_var("game_type")
-			tup = _get_updater_initialization_params(game_type)
-			if tup:
-				updater_type, args, kwargs =  tup
-				self._state_updater = updater_type(*args, **kwargs)
-			else: return None
-		return self._state_updater
-
 	def _call(self, *args: Any, **kwds: Any) -> None:
-		"""	Runs an infinite loop to handle new states.
+		"""	Runs an infinite loop to receive new states, they are handled by a dispatcher thread.
 		"""
+		handler = _handler_of(args[0])
+		frames = handler.start_dispatching(partial(self.__handler, args[0]))
+		recorder = handler.recorder
+
 		async def __receive():
 			try:
-				while True and not self._event.is_set():
-					coro = _h_conn.socket.recv()
-					message: Data = await coro
-					decompressed = orjson.loads(gzip.decompress(message))
-					_logger.info(f"Obtained data from server; raw={message}; decompressed={decompressed}")
-					if self.__updater:
-						decompressed = self._state_updater(decompressed)
-					self.__handler(args[0], decompressed)
+				while True and not handler.closed:
+					try:
+						message: Data = await handler.socket.recv()
+					except (ConnectionClosedError, OSError) as e:
+						if await handler.resume(e): continue
+						break
+					arrival = perf_counter()
+					if recorder is not None: recorder.write(arrival, message)
+					await frames.put((arrival, (handler.codec, message)))
 			except Exception as e:
 				_logger.info(f"Caught an exception: {e}. Ignored...")
 			finally:
 				await asyncio.sleep(0)
 
-		self._task, _ = _h_conn.coro_executor.submit(__receive())
+		handler.submit(__receive())
+
+
+def new_executor() -> _ThreadedAsyncioExecutor:
+	"""Creates a ThreadedAsyncioExecutor with registered handlers of connection errors.
+
+	Returns:
+		_ThreadedAsyncioExecutor: an executor that may be shared by many connection handlers.
+	"""
+	executor = _ThreadedAsyncioExecutor()
+	executor.register_exception(ConnectionClosedError,
+		lambda e:_logger.warn(f"Connection dropped unsuccessfully, the connection has been stopped with reason: {e.reason} and error code: {e.code}"))
+	executor.register_exception(ConnectionClosedOK,
+		lambda e:_logger.warn("Connection dropped successfully, the connection has been stopped"))
+	return executor
+
+def bind(agent: Any, handler: _GameConnectionHandler):
+	"""Binds an agent with a connection handler, so that proxies of agent use the connection of given handler.
+
+	Args:
+		agent (Agent): instance of agent.
+		handler (_GameConnectionHandler): handler of connection dedicated to the agent.
+	"""
+	_handlers[agent] = handler
+
+def _handler_of(agent: Any) -> _GameConnectionHandler:
+	"""Returns a connection handler bound with given agent.
+
+	Args:
+		agent (Agent): instance of agent.
+
+	Returns:
+		_GameConnectionHandler: bound handler or the handler of the process, if agent is not bound.
+	"""
+	return _handlers.get(agent, _h_conn)
+
+def close_all(handlers: List[_GameConnectionHandler], timeout: Optional[float] =None):
+	"""Closes many handlers at once, closing handshakes of all connections run concurrently.
+
+	Args:
+		handlers (List[_GameConnectionHandler]): handlers to close.
+		timeout (Optional[float], optional): maximal time to wait for all handshakes. Defaults to None.
+	"""
+	futures = [handler.begin_close() for handler in handlers]
+	cf.wait([future for future in futures if future is not None], timeout)
+	for handler, future in zip(handlers, futures):
+		handler.finish_close(future, 0)
+
+def connection_stats(agent: Any) -> Dict[str, float]:
+	"""Returns counters of the connection used by given agent.
+
+	Args:
+		agent (Agent): instance of agent.
+
+	Returns:
+		Dict[str, float]: counters of received and delivered states, sent, coalesced and dropped actions and lag of event-loop.
+	"""
+	return _handler_of(agent).stats()
 
 def cleanup():
 	"""Cleans up the handler of connection with websocket game-server.
@@ -289,6 +604,7 @@ def cleanup():
 connection_proxy = __ConnectionProxy
 send_proxy = __SendProxy
 receive_proxy = __ReceiveProxy
-_h_conn = __GameConnectionHandler()
+_handlers: WeakKeyDictionary = WeakKeyDictionary()
+_h_conn = _GameConnectionHandler()
 
-__all__ = [connection_proxy, send_proxy, receive_proxy, cleanup, Event]
+__all__ = [connection_proxy, send_proxy, receive_proxy, cleanup, Event, new_executor, bind, close_all, connection_stats]
@@ -0,0 +1,203 @@
+from array import array
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence
+
+_STAGES = ("recv", "decode", "update", "handle", "choose_action", "encode", "send", "decision")
+# upper bounds of buckets in seconds, 4 buckets per decade from 1 us to 10 s, the last bucket counts longer samples
+_BOUNDS = [1e-6 * 10 ** (k / 4) for k in range(29)]
+_BUCKETS = len(_BOUNDS) + 1
+_SLOT = len(_STAGES) * _BUCKETS
+
+_shared: Optional[memoryview] = None
+_first_id = 0
+
+
+class _LatencyStats:
+	"""Accumulates samples of latency.
+	"""
+
+	def __init__(self) -> None:
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+		self.last = 0.0
+
+	def add(self, seconds: float):
+		"""Adds a sample.
+
+		Args:
+			seconds (float): measured latency in seconds.
+		"""
+		self.count += 1
+		self.total += seconds
+		self.last = seconds
+		if seconds > self.max: self.max = seconds
+
+	def summary(self, name: str) -> Dict[str, float]:
+		"""Returns summary of samples.
+
+		Args:
+			name (str): prefix of keys.
+
+		Returns:
+			Dict[str, float]: count of samples, mean, maximal and the last latency in milliseconds.
+		"""
+		return {
+			f"{name}_count": self.count,
+			f"{name}_mean_ms": 1e3 * self.total / self.count if self.count else 0.0,
+			f"{name}_max_ms": 1e3 * self.max,
+			f"{name}_last_ms": 1e3 * self.last
+		}
+
+
+def _new_counts(slots: int =1) -> memoryview:
+	"""Creates zeroed counters of histograms.
+
+	Args:
+		slots (int, optional): count of bots. Defaults to 1.
+
+	Returns:
+		memoryview: counters of histograms of all stages of given count of bots.
+	"""
+	return memoryview(array("q", bytes(8 * _SLOT * slots)))
+
+def _share(counts, first_id: int):
+	"""Initializer of a worker process, installs counters shared with the spawning process.
+
+	Args:
+		counts (multiprocessing.RawArray): shared counters of histograms of all bots of a pool.
+		first_id (int): identifier of the first bot of a pool, that is, the bot of the first slot.
+	"""
+	global _shared, _first_id
+	_shared, _first_id = memoryview(counts).cast("B").cast("q"), first_id
+
+def _shared_counts(int_id: int) -> Optional[memoryview]:
+	"""Returns counters of histograms of given bot shared with the spawning process.
+
+	Args:
+		int_id (int): identifier of bot object.
+
+	Returns:
+		Optional[memoryview]: counters of the bot, None outside of a worker process.
+	"""
+	if _shared is None: return None
+	slot = int_id - _first_id
+	return _shared[slot * _SLOT:(slot + 1) * _SLOT]
+
+def _percentile(counts: Sequence[int], q: float) -> float:
+	"""Returns the upper bound of the bucket that holds a percentile.
+
+	Args:
+		counts (Sequence[int]): counters of buckets.
+		q (float): percentile in range [0, 100].
+
+	Returns:
+		float: upper bound in seconds, inf if the percentile is in the overflow bucket, 0 if there are no samples.
+	"""
+	total = sum(counts)
+	if not total: return 0.0
+	rank, seen = q / 100 * total, 0
+	for bucket, count in enumerate(counts):
+		seen += count
+		if seen >= rank and count:
+			return _BOUNDS[bucket] if bucket < len(_BOUNDS) else float("inf")
+	return float("inf")
+
+def _summarize(counts: Sequence[int], percentiles: Sequence[float] =(50, 90, 99)) -> Dict[str, float]:
+	"""Summarizes counters of all stages.
+
+	Args:
+		counts (Sequence[int]): counters of histograms of all stages, e.g. sum of counters of many bots.
+		percentiles (Sequence[float], optional): percentiles to report. Defaults to (50, 90, 99).
+
+	Returns:
+		Dict[str, float]: count of samples and percentiles in milliseconds of every stage.
+	"""
+	summary = {}
+	for index, stage in enumerate(_STAGES):
+		stage_counts = counts[index * _BUCKETS:(index + 1) * _BUCKETS]
+		summary[f"{stage}_count"] = sum(stage_counts)
+		for q in percentiles:
+			summary[f"{stage}_p{q:g}_ms"] = 1e3 * _percentile(stage_counts, q)
+	return summary
+
+
+class _Histogram:
+	"""Histogram of latency with fixed buckets, see _BOUNDS. Counters may live in memory shared with the spawning process.
+	"""
+
+	def __init__(self, counts: Optional[memoryview] =None) -> None:
+		"""Creates a histogram.
+
+		Args:
+			counts (Optional[memoryview], optional): _BUCKETS counters. Defaults to new counters.
+		"""
+		self.counts = counts if counts is not None else _new_counts()[:_BUCKETS]
+
+	def add(self, seconds: float):
+		"""Adds a sample.
+
+		Args:
+			seconds (float): measured latency in seconds.
+		"""
+		self.counts[bisect_right(_BOUNDS, seconds)] += 1
+
+	def percentile(self, q: float) -> float:
+		"""Returns the upper bound of the bucket that holds a percentile.
+
+		Args:
+			q (float): percentile in range [0, 100].
+
+		Returns:
+			float: upper bound in seconds.
+		"""
+		return _percentile(self.counts, q)
+
+
+class _BotMetrics:
+	"""Metrics of a single bot.
+	"""
+
+	def __init__(self) -> None:
+		self.decisions = 0
+		self.counts = _new_counts()
+		self.stages: Dict[str, _Histogram] = {}
+		self.__bind_stages()
+		self.reconnect_attempts = 0
+		self.lost_actions = 0
+		self.downtime = _LatencyStats()
+
+	def __bind_stages(self):
+		for index, stage in enumerate(_STAGES):
+			histogram = _Histogram(self.counts[index * _BUCKETS:(index + 1) * _BUCKETS])
+			self.stages[stage] = histogram
+			setattr(self, stage, histogram)
+
+	def share(self, counts: Optional[memoryview]):
+		"""Moves histograms into given counters, e.g. memory shared with the spawning process. Collected samples are kept.
+
+		Args:
+			counts (Optional[memoryview]): counters of histograms of all stages, nothing happens if None.
+		"""
+		if counts is None: return
+		for index in range(_SLOT):
+			counts[index] += self.counts[index]
+		self.counts = counts
+		self.__bind_stages()
+
+	def summary(self) -> Dict[str, float]:
+		"""Returns summary of metrics.
+
+		Returns:
+			Dict[str, float]: count of decisions, count of resumed connections, attempts to resume them, actions lost while
+			the connection was down, downtime and percentiles of stages, the "decision" stage is the latency from arrival of state to sending of action.
+		"""
+		return {
+			"decisions": self.decisions,
+			"reconnects": self.downtime.count,
+			"reconnect_attempts": self.reconnect_attempts,
+			"lost_actions": self.lost_actions,
+			"downtime_total_ms": 1e3 * self.downtime.total,
+			**self.downtime.summary("downtime"),
+			**_summarize(self.counts, (50, 99))
+		}
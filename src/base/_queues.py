@@ -0,0 +1,196 @@
+from __future__ import annotations
+import asyncio
+from collections import deque
+from threading import Condition
+from typing import Any, Deque, List, Optional, Tuple
+
+_POLICIES = ("drop", "block")
+
+
+class _SendQueue:
+	"""Bounded queue of encoded actions. It is filled by an agent thread and drained by the event-loop of connection.
+	Actions chosen for the same tick are coalesced, that is, only the newest action of a tick waits to be sent.
+	"""
+
+	def __init__(self, maxsize: int =8, policy: str ="drop") -> None:
+		"""Creates a queue of actions.
+
+		Args:
+			maxsize (int, optional): maximal count of pending actions. Defaults to 8.
+			policy (str, optional): backpressure policy applied if queue is full: "drop" drops the oldest pending action,
+			"block" makes the agent thread wait for a free slot. Defaults to "drop".
+
+		Raises:
+			ValueError: if policy is unknown or maxsize is not positive.
+		"""
+		if policy not in _POLICIES:
+			raise ValueError(f"Unknown backpressure policy: {policy}, available policies: {_POLICIES}")
+		if maxsize < 1:
+			raise ValueError("Size of queue has to be positive")
+		self.maxsize = maxsize
+		self.policy = policy
+		self.sent = 0
+		self.coalesced = 0
+		self.dropped = 0
+		self.__items: Deque[Tuple[int, bytes, Optional[float]]] = deque()
+		self.__cond = Condition()
+		self.__loop: Optional[asyncio.AbstractEventLoop] = None
+		self.__ready: Optional[asyncio.Event] = None
+
+	@property
+	def pending(self) -> int:
+		"""Returns count of actions waiting to be sent.
+
+		Returns:
+			int: count of pending actions.
+		"""
+		with self.__cond: return len(self.__items)
+
+	@property
+	def full(self) -> bool:
+		"""Returns information whether or not the queue applies backpressure to the agent.
+
+		Returns:
+			bool: True if the next action of a new tick hits the backpressure policy.
+		"""
+		with self.__cond: return len(self.__items) >= self.maxsize
+
+	def put(self, tick: int, payload: bytes, timeout: Optional[float] =None, arrival: Optional[float] =None) -> bool:
+		"""Puts an encoded action into the queue and returns immediately, unless the queue is full and the policy is "block".
+
+		Args:
+			tick (int): tick of game, that is, count of states obtained so far by the agent.
+			payload (bytes): encoded action.
+			timeout (Optional[float], optional): maximal time to wait for a free slot with "block" policy. Defaults to None.
+			arrival (Optional[float], optional): arrival time of the state that the action is based on. Defaults to None.
+
+		Returns:
+			bool: True if the action is queued, False if it is dropped.
+		"""
+		with self.__cond:
+			if self.__items and self.__items[-1][0] == tick:
+				self.__items[-1] = (tick, payload, arrival)
+				self.coalesced += 1
+				return True
+
+			if len(self.__items) >= self.maxsize:
+				if self.policy == "block":
+					if not self.__cond.wait_for(lambda: len(self.__items) < self.maxsize, timeout):
+						self.dropped += 1
+						return False
+				else:
+					self.__items.popleft()
+					self.dropped += 1
+
+			self.__items.append((tick, payload, arrival))
+			loop, ready = self.__loop, self.__ready
+
+		if loop is not None and not loop.is_closed():
+			loop.call_soon_threadsafe(ready.set)
+		return True
+
+	def clear(self) -> int:
+		"""Drops all pending actions, e.g. actions encoded for a dropped connection.
+
+		Returns:
+			int: count of dropped actions.
+		"""
+		with self.__cond:
+			count = len(self.__items)
+			self.__items.clear()
+			self.__cond.notify_all()
+		return count
+
+	async def get(self) -> Tuple[bytes, Optional[float]]:
+		"""Waits for the oldest pending action. It has to be awaited by a single consumer in the event-loop of connection.
+
+		Returns:
+			Tuple[bytes, Optional[float]]: encoded action and arrival time of the state that the action is based on.
+		"""
+		with self.__cond:
+			if self.__ready is None:
+				self.__loop, self.__ready = asyncio.get_running_loop(), asyncio.Event()
+		while True:
+			with self.__cond:
+				if self.__items:
+					_, payload, arrival = self.__items.popleft()
+					self.sent += 1
+					self.__cond.notify()
+					return payload, arrival
+				self.__ready.clear()
+			await self.__ready.wait()
+
+
+class _FrameQueue:
+	"""Bounded queue of raw frames. It is filled by the event-loop of connection and emptied by a dispatcher thread.
+	If the queue is full, the event-loop stops reading from the socket until the dispatcher catches up.
+	"""
+
+	def __init__(self, maxsize: int =64) -> None:
+		"""Creates a queue of frames.
+
+		Args:
+			maxsize (int, optional): maximal count of frames waiting for the dispatcher. Defaults to 64.
+
+		Raises:
+			ValueError: if maxsize is not positive.
+		"""
+		if maxsize < 1:
+			raise ValueError("Size of queue has to be positive")
+		self.maxsize = maxsize
+		self.stalls = 0
+		self.__items: Deque[Any] = deque()
+		self.__cond = Condition()
+		self.__loop: Optional[asyncio.AbstractEventLoop] = None
+		self.__space: Optional[asyncio.Event] = None
+		self.__waiting = False
+
+	@property
+	def pending(self) -> int:
+		"""Returns count of frames waiting for the dispatcher.
+
+		Returns:
+			int: count of pending frames.
+		"""
+		with self.__cond: return len(self.__items)
+
+	async def put(self, frame: Any):
+		"""Puts a frame into the queue. It waits without blocking the event-loop as long as the queue is full.
+
+		Args:
+			frame (Any): raw frame obtained from server.
+		"""
+		with self.__cond:
+			if self.__space is None:
+				self.__loop, self.__space = asyncio.get_running_loop(), asyncio.Event()
+		while True:
+			with self.__cond:
+				if len(self.__items) < self.maxsize:
+					self.__items.append(frame)
+					self.__cond.notify()
+					return
+				self.__space.clear()
+				self.__waiting = True
+				self.stalls += 1
+			await self.__space.wait()
+
+	def take(self, timeout: Optional[float] =None) -> List[Any]:
+		"""Takes all pending frames.
+
+		Args:
+			timeout (Optional[float], optional): maximal time to wait for at least one frame, None means waiting without limit. Defaults to None.
+
+		Returns:
+			List[Any]: pending frames in order of arrival, empty if timeout expired.
+		"""
+		with self.__cond:
+			if not self.__cond.wait_for(lambda: self.__items, timeout):
+				return []
+			frames = list(self.__items)
+			self.__items.clear()
+			waiting, self.__waiting = self.__waiting, False
+			loop, space = self.__loop, self.__space
+
+		if waiting and not loop.is_closed():
+			loop.call_soon_threadsafe(space.set)
+		return frames
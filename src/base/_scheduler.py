@@ -0,0 +1,94 @@
+from threading import Condition
+from time import perf_counter
+from typing import Any, Optional
+
+_MODES = ("state", "pace")
+
+
+class _TickScheduler:
+	"""Decides when an agent should choose the next action. In the "state" mode the agent is woken up by every new state,
+	in the "pace" mode it decides with a pace derived from the server's delta. Both modes are limited by the maximal rate of decisions.
+	"""
+
+	def __init__(self, mode: str ="state", pace: float =1.0, max_rate: Optional[float] =None, timeout: float =1.0) -> None:
+		"""Creates a scheduler of decisions.
+
+		Args:
+			mode (str, optional): "state" or "pace". Defaults to "state".
+			pace (float, optional): count of server's deltas between decisions in the "pace" mode. Defaults to 1.0.
+			max_rate (Optional[float], optional): maximal count of decisions per second, None means no limit. Defaults to None.
+			timeout (float, optional): time after which the agent decides even without new state; in the "pace" mode it is
+			the interval used until the first delta is known. Defaults to 1.0.
+
+		Raises:
+			ValueError: if mode is unknown.
+		"""
+		if mode not in _MODES:
+			raise ValueError(f"Unknown tick mode: {mode}, available modes: {_MODES}")
+		self.__mode = mode
+		self.__pace = pace
+		self.__min_interval = 1.0 / max_rate if max_rate else 0.0
+		self.__timeout = timeout
+		self.__cond = Condition()
+		self.__version = 0
+		self.__seen = 0
+		self.__delta: Optional[float] = None
+		self.__last = float("-inf")
+		self.__stopped = False
+
+	def notify(self, state: Any =None):
+		"""Notifies the scheduler that a new state has been delivered to the agent.
+
+		Args:
+			state (Any, optional): delivered state, its "delta" sets the pace. Defaults to None.
+		"""
+		with self.__cond:
+			self.__version += 1
+			delta = state.get("delta", None) if isinstance(state, dict) else None
+			if delta: self.__delta = float(delta)
+			self.__cond.notify_all()
+
+	def stop(self):
+		"""Stops the scheduler, every waiting agent is woken up immediately and does not decide anymore.
+		"""
+		with self.__cond:
+			self.__stopped = True
+			self.__cond.notify_all()
+
+	def __due(self) -> float:
+		"""Returns time of the next decision, not limited by the maximal rate."""
+		if self.__mode == "state":
+			return self.__last if self.__version > self.__seen else self.__last + self.__timeout
+		return self.__last + (self.__pace * self.__delta if self.__delta else self.__timeout)
+
+	def has_new_state(self) -> bool:
+		"""Returns information whether or not a state has been delivered since the last decision or the scheduler is stopped,
+		without waiting. Unlike wait, it does not become true when the timeout or the pace is due.
+
+		Returns:
+			bool: True if there is a new state or the scheduler is stopped.
+		"""
+		with self.__cond:
+			return self.__stopped or self.__version > self.__seen
+
+	def wait(self, timeout: float) -> bool:
+		"""Blocks the agent until the next decision.
+
+		Args:
+			timeout (float): maximal time to wait.
+
+		Returns:
+			bool: True if the agent should decide now, False if timeout expired first or the scheduler is stopped.
+		"""
+		end = perf_counter() + timeout
+		with self.__cond:
+			while not self.__stopped:
+				now = perf_counter()
+				due = max(self.__due(), self.__last + self.__min_interval)
+				if now >= due:
+					self.__seen, self.__last = self.__version, now
+					return True
+				if now >= end:
+					return False
+				self.__cond.wait(min(due, end) - now)
+			return False
@@ -1,14 +1,19 @@
-from threading import Thread, RLock as Lock
+from threading import Thread, RLock as Lock, Event as _ThreadEvent
 from multiprocessing import Pipe
-from typing import Any, Callable, Coroutine, Dict, List, Type, Tuple
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Type, Tuple
 from asyncio.events import AbstractEventLoop
 from asyncio.tasks import Task
 import concurrent.futures as cf
 import asyncio
 import traceback
+import numpy as np
 from functools import partial
 from multiprocessing.pool import AsyncResult, Pool as P
+from math import ceil
+from os import cpu_count
+from time import monotonic
 
+from ._metrics import _SLOT, _summarize
 from .. import _logger
 
 
@@ -62,6 +67,10 @@ class Event(object):
 		return self._read_fd.fileno()
  
 
+_LAG_INTERVAL = 0.05
+_STALL_THRESHOLD = 0.05
+
+
 class _ThreadedAsyncioExecutor(Thread):
 	"""	Defines an executor to take a control over submitted tasks to the asyncio.
 	
@@ -73,10 +82,14 @@ class _ThreadedAsyncioExecutor(Thread):
 		asyncio.set_event_loop(self._loop)
 		self.daemon = True
 		self._lock = Lock()
-		self._stopped = Event()
-		self._started = Event()
+		# state of the executor is local to the process, a pipe would be shared with forked workers
+		self._stopped = _ThreadEvent()
+		# set by start, Thread has its own private _started event
+		self._launched = _ThreadEvent()
 		self.__tasks: List[Task] = []
 		self.__exception_handlers: Dict[Exception, List[Callable[..., Any]]] = {}
+		self.__lag_max = self.__lag_total = 0.0
+		self.__lag_samples = self.__stalls = 0
 		self._loop.set_exception_handler(lambda loop, context:partial(self.__handle_errors)(loop, context))
 	
 	@property
@@ -96,8 +109,42 @@ class _ThreadedAsyncioExecutor(Thread):
 		Returns:
 			bool: the "started" state of thread.
 		"""
-		with self._lock: return self._started.is_set()
+		with self._lock: return self._launched.is_set()
+
+	def start(self):
+		"""Starts the thread, the executor is started at once even if start is called before run begins.
+		"""
+		with self._lock: self._launched.set()
+		super().start()
  
+	@property
+	def loop_lag(self) -> Dict[str, float]:
+		"""Returns statistics of event-loop lag, that is, delays of wake-ups of the loop. A stall means that something,
+		for example agent code, blocked the loop for longer than _STALL_THRESHOLD.
+
+		Returns:
+			Dict[str, float]: mean and maximal lag in milliseconds and count of stalls.
+		"""
+		return {
+			"loop_lag_mean_ms": 1e3 * self.__lag_total / self.__lag_samples if self.__lag_samples else 0.0,
+			"loop_lag_max_ms": 1e3 * self.__lag_max,
+			"loop_stalls": self.__stalls
+		}
+
+	async def __monitor_lag(self):
+		"""Measures how late the event-loop wakes up after constant sleep.
+		"""
+		while True:
+			start = self._loop.time()
+			await asyncio.sleep(_LAG_INTERVAL)
+			lag = max(0.0, self._loop.time() - start - _LAG_INTERVAL)
+			self.__lag_total += lag
+			self.__lag_samples += 1
+			self.__lag_max = max(self.__lag_max, lag)
+			if lag > _STALL_THRESHOLD:
+				self.__stalls += 1
+				_logger.info(f"Event-loop was blocked for {1e3 * lag:.1f} ms")
+
 	def _set_stopped(self): 
 		"""Sets the "stopped" Event of ThreadedAsyncioExecutor.
 		"""
@@ -118,7 +165,7 @@ class _ThreadedAsyncioExecutor(Thread):
    
 			if handler_list: [handler(exception) for handler in handler_list]
 			else: 
-				_logger.warn("Unregistered exception occurred: ", type(exception), " -> " , exception)
+				_logger.warn(f"Unregistered exception occurred: {type(exception)} -> {exception}")
 				traceback.print_exception(type(exception), exception, exception.__traceback__)
 		else:
 			msg = context.get("message", None)
@@ -171,16 +218,21 @@ class _ThreadedAsyncioExecutor(Thread):
 		"""Runs ThreadedAsyncioExecutor.
 		"""
 		try:
+			self._loop.create_task(self.__monitor_lag())
 			self._loop.run_forever()
 		except Exception as e: print(e.__traceback__)
 		finally:
 			_logger.warn("Closing a loop")
 			self._loop.close()		
    
-	def cancel_tasks(self):
-		"""Cancels stored tasks.
+	def cancel_tasks(self, tasks: Optional[List[Task]] =None):
+		"""Cancels given tasks or, if not provided, all stored tasks.
+
+		Args:
+			tasks (Optional[List[Task]], optional): tasks to cancel. Defaults to None.
 		"""
-		[task.cancel() for task in self.__tasks]
+		tasks = self.__tasks if tasks is None else tasks
+		[self._loop.call_soon_threadsafe(task.cancel) for task in list(tasks)]
  
 	def stop(self):
 		"""Stops ThreadedAsyncioExecutor object. Cancels all coroutines that are queued in event-loop system and then stops an event-loop. 
@@ -194,7 +246,7 @@ class _ThreadedAsyncioExecutor(Thread):
 
 			for coro in asyncio.all_tasks(self._loop):
     
-				_logger.info(f"The state of a coroutine at {hex(id(coro))}:", coro._state)	
+				_logger.info(f"The state of a coroutine at {hex(id(coro))}: {coro._state}")	
 				if coro is not asyncio.current_task(self._loop):
     
 					if not coro.done():
@@ -202,42 +254,156 @@ class _ThreadedAsyncioExecutor(Thread):
 						tasks.append(coro)
 			if tasks:
 				_logger.info(f"Closing {len(tasks)} tasks")
-				await asyncio.gather(*tasks, loop=self._loop, return_exceptions=True)
+				await asyncio.gather(*tasks, return_exceptions=True)
     
 		_, fut = self.submit(_shutdown())
 		fut.add_done_callback(lambda _: self._set_stopped())
 		cf.wait([fut])
 		fut.result()
   
-		self._loop.stop()		
+		self._loop.call_soon_threadsafe(self._loop.stop)		
   
   
+_MAX_POOL_SIZE = 63 - 2 #2 workers needed as a overhead for ProcessPoolExecutor and multiprocessing.Pool as well, see WaitForMultipleObjects on win32
+_PROCESSES_PER_CORE = 2
+
+
+def _plan_shards(count: int, bots_per_process: Optional[int] =None, bot_cost: Optional[float] =None,
+				 cores: Optional[int] =None) -> List[List[List[int]]]:
+	"""Spreads identifiers of bots across processes and processes across pools.
+
+	Without explicit bots_per_process, the count of processes is bounded by _PROCESSES_PER_CORE processes per core
+	and bots are spread evenly; if the cost of a bot is known, a process gets no more bots than fit into one core.
+
+	Args:
+		count (int): count of bots.
+		bots_per_process (Optional[int], optional): count of bots hosted by a single process, None means chosen automatically. Defaults to None.
+		bot_cost (Optional[float], optional): measured share of a core used by a single bot, e.g. BotsManager.summary()["bot_cost"]. Defaults to None.
+		cores (Optional[int], optional): count of cores, defaults to os.cpu_count(). Defaults to None.
+
+	Returns:
+		List[List[List[int]]]: pools of processes, every process is a list of identifiers of bots.
+	"""
+	if count < 1: return []
+	if bots_per_process is None:
+		processes = min(count, _PROCESSES_PER_CORE * (cores or cpu_count() or 1))
+		bots_per_process = ceil(count / processes)
+		if bot_cost:
+			bots_per_process = min(bots_per_process, max(1, int(1.0 / bot_cost)))
+	bots_per_process = max(1, bots_per_process)
+
+	processes = [list(range(num, min(num + bots_per_process, count))) for num in range(0, count, bots_per_process)]
+	return [processes[num:num + _MAX_POOL_SIZE] for num in range(0, len(processes), _MAX_POOL_SIZE)]
+
+
 class _Bots_Manager:
 	"""Definition of _Bots_Manager to take care of spawned agents.
 	"""
 	
-	def __init__(self, params: List[Tuple[P, List[AsyncResult], List[Event]]]) -> None:
+	def __init__(self, params: List[Tuple[P, List[AsyncResult], List[List[int]], Any]], event: Event) -> None:
+		"""Creates a manager of spawned agents.
+
+		Args:
+			params (List[Tuple[P, List[AsyncResult], List[List[int]], Any]]): pools, results of their workers, identifiers of bots hosted by every worker
+				and histograms of bots shared with workers of a pool.
+			event (Event): event shared by all workers, it stops all bots at once.
+		"""
 		self.__params = params
+		self.__event = event
+		self.__reports: List[Dict[str, Any]] = []
+
+	@property
+	def count(self) -> int:
+		"""Returns count of spawned bots.
+
+		Returns:
+			int: count of bots managed by the object.
+		"""
+		return sum(len(ids) for _, _, chunks, _ in self.__params for ids in chunks)
+
+	@property
+	def processes(self) -> int:
+		"""Returns count of worker processes.
+
+		Returns:
+			int: count of processes hosting bots.
+		"""
+		return sum(len(chunks) for _, _, chunks, _ in self.__params)
   
-	def terminate(self, timeout=10):
-		"""Terminates BotsManager object after given timeout. Sets events to stop managed processes, and collects multiprocessing.AsyncResult objects.
+	def terminate(self, timeout=10) -> List[int]:
+		"""Terminates BotsManager object. Broadcasts the stop event once to all workers and waits for all of them with a single deadline,
+		so time of teardown does not grow with the count of bots. Reports of workers are collected, see summary method.
 
 		Args:
-			timeout (int, optional): time to wait. Defaults to 10.
-		"""
-		for __executor, __futures, __events in self.__params:
-			
-			for event in __events:
-				event.set()
-
-			for future in __futures:
-				try:
-					
-					_logger.info("Wait for the AsyncResult at: ", hex(id(future)))
-					future.get(timeout=timeout)
-				except Exception as _time:
-					_logger.warn(f"Unable to kill bot process safely -> {type(_time)}")
-	
+			timeout (int, optional): time to wait for all workers. Defaults to 10.
+
+		Returns:
+			List[int]: identifiers of bots that failed to exit before the deadline.
+		"""
+		self.__event.set()
+		deadline = monotonic() + timeout
+		failed: List[int] = []
+
+		for __executor, __futures, __ids, _ in self.__params:
+			for future, ids in zip(__futures, __ids):
+				_logger.info(f"Wait for the AsyncResult at: {hex(id(future))}")
+				future.wait(max(0.0, deadline - monotonic()))
+				if not future.ready():
+					failed.extend(ids)
+				elif not future.successful():
+					try: future.get(0)
+					except Exception as e: _logger.warn(f"Bots No. {ids} exited with an exception -> {type(e)}: {e}")
+				else:
+					self.__reports.append(future.get(0))
+
+		if failed:
+			_logger.warn(f"Unable to kill bot processes safely, bots No. {failed} did not exit in {timeout} s")
+
+		for __executor, _, _, _ in self.__params:
 			_logger.info(f"Pool at: {hex(id(__executor))}, is about to shutdown...")
 			__executor.terminate()
-			__executor.close()
\ No newline at end of file
+			__executor.close()
+		return failed
+
+	def stats(self, int_ids: Optional[List[int]] =None) -> Dict[str, float]:
+		"""Aggregates latency histograms of bots on demand, also while bots are running. Every stage of a bot is measured:
+		recv (wait for the dispatcher), decode, update, handle (handle_new_states), choose_action, encode, send and decision,
+		that is, time from arrival of state to sending of action based on it.
+
+		Args:
+			int_ids (Optional[List[int]], optional): identifiers of bots to aggregate, all bots by default. Defaults to None.
+
+		Returns:
+			Dict[str, float]: count of samples and 50th, 90th and 99th percentile in milliseconds of every stage.
+		"""
+		selected = None if int_ids is None else set(int_ids)
+		total = np.zeros(_SLOT, dtype=np.int64)
+		for _, _, chunks, histograms in self.__params:
+			counts = np.frombuffer(histograms, dtype=np.int64).reshape(-1, _SLOT)
+			if selected is None:
+				total += counts.sum(axis=0)
+			else:
+				slots = [slot for slot, int_id in enumerate(int_id for ids in chunks for int_id in ids) if int_id in selected]
+				total += counts[slots].sum(axis=0)
+		return _summarize(total.tolist())
+
+	def summary(self) -> Dict[str, float]:
+		"""Aggregates reports of workers collected by terminate method. Bots of workers that failed or did not exit in time count as not connected.
+
+		Returns:
+			Dict[str, float]: counts of requested and connected bots, connection success rate, sent actions, resumed connections, aggregate actions per second
+			and bot_cost, that is, the mean share of a core used by a single bot.
+		"""
+		bots = [bot for report in self.__reports for bot in report["bots"].values()]
+		connected = sum(1 for bot in bots if bot["connected"])
+		bot_time = sum(report["wall_time"] * len(report["bots"]) for report in self.__reports)
+		return {
+			"requested_bots": self.count,
+			"connected_bots": connected,
+			"connection_success_rate": connected / self.count if self.count else 0.0,
+			"sent_actions": sum(bot.get("sent_actions", 0) for bot in bots),
+			"reconnects": sum(bot.get("reconnects", 0) for bot in bots),
+			"actions_per_second": sum(sum(bot.get("sent_actions", 0) for bot in report["bots"].values()) / report["wall_time"]
+									  for report in self.__reports if report["wall_time"] > 0),
+			"bot_cost": sum(report["cpu_time"] for report in self.__reports) / bot_time if bot_time > 0 else 0.0
+		}
@@ -1,6 +1,7 @@
 from .action import Action
 from ._gameproxy import send_proxy as _send_proxy, receive_proxy as _receive_proxy
 from abc import ABCMeta, abstractmethod, abstractproperty
+from typing import Callable
 
 
 class Agent(metaclass=ABCMeta):
@@ -11,8 +12,11 @@ class Agent(metaclass=ABCMeta):
 		self.init_state = {}
 	
 	def __init_subclass__(cls) -> None:
-		cls.choose_action = _send_proxy(cls.choose_action)	
-		cls.handle_new_states = _receive_proxy(cls.handle_new_states)
+		# only methods defined by the subclass itself are wrapped, inherited ones are proxies already
+		if "choose_action" in cls.__dict__:
+			cls.choose_action = _send_proxy(cls.choose_action)
+		if "handle_new_states" in cls.__dict__:
+			cls.handle_new_states = _receive_proxy(cls.handle_new_states)
   
 	@abstractmethod
 	def choose_action(self) -> Action:
@@ -23,6 +27,23 @@ class Agent(metaclass=ABCMeta):
 		"""
 		...
 	
+	def ponder(self, interrupted: Callable[[], bool]):
+		"""Optional hook that uses idle time between decisions, e.g. searches during the opponent's turn. It is called
+		by the decision loop after every decision, and it should return as soon as interrupted() is true, that is,
+		when a new state arrives or the bot is stopped or disconnected. By default the agent does nothing.
+
+		Args:
+			interrupted (Callable[[], bool]): returns True when pondering should stop.
+		"""
+		...
+
+	def close(self):
+		"""Optional hook that releases resources of the agent shared with other agents, e.g. membership of a batch. It is called
+		by the decision loop when the loop ends: the game is over, the connection is closed or the bot is stopped. By default
+		the agent does nothing.
+		"""
+		...
+
 	@abstractproperty
 	def is_done(self) -> bool:
 		"""Property that should indicate whether current state is terminal.
@@ -0,0 +1,112 @@
+import abc
+import zlib
+from typing import Any, Union
+
+import orjson
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class Codec(metaclass=abc.ABCMeta):
+	"""Abstract class of wire codec, that is, a format of frames exchanged with the server.
+	A codec is created per connection, so it may keep the state of compression stream.
+	"""
+
+	@abc.abstractmethod
+	def encode(self, obj: Any) -> bytes:
+		"""Encodes an object into a frame.
+
+		Args:
+			obj (Any): object to encode, usually an encoded action.
+
+		Returns:
+			bytes: frame to send.
+		"""
+		...
+
+	@abc.abstractmethod
+	def decode(self, data: Buffer) -> Any:
+		"""Decodes a frame. Implementations accept any buffer, e.g. a memoryview of a mapped file, without copying it.
+
+		Args:
+			data (Buffer): obtained frame.
+
+		Returns:
+			Any: decoded object, usually a game-state.
+		"""
+		...
+
+
+class RawCodec(Codec):
+	"""Uncompressed JSON frames.
+	"""
+
+	def encode(self, obj: Any) -> bytes:
+		return orjson.dumps(obj)
+
+	def decode(self, data: Buffer) -> Any:
+		return orjson.loads(data)
+
+
+class GzipCodec(Codec):
+	"""JSON frames compressed by gzip, the default format of botbattles server. The gzip framing is handled
+	by zlib in C, without Python-level header parsing of gzip module.
+	"""
+
+	_WBITS = 16 + zlib.MAX_WBITS
+
+	def __init__(self, level: int =9) -> None:
+		self._level = level
+
+	def encode(self, obj: Any) -> bytes:
+		compressor = zlib.compressobj(self._level, zlib.DEFLATED, self._WBITS)
+		return compressor.compress(orjson.dumps(obj)) + compressor.flush()
+
+	def decode(self, data: Buffer) -> Any:
+		return orjson.loads(zlib.decompress(data, self._WBITS))
+
+
+class ZlibCodec(Codec):
+	"""JSON frames compressed by raw deflate, without gzip header and trailer.
+
+	In the stream mode both sides keep one compression context for the whole connection and finish every frame
+	with a sync flush, so the decompressor object is reused and the sliding window spans many frames.
+	"""
+
+	_WBITS = -zlib.MAX_WBITS
+
+	def __init__(self, level: int =6, stream: bool =False) -> None:
+		self._level = level
+		self._stream = stream
+		self._compressor = zlib.compressobj(level, zlib.DEFLATED, self._WBITS) if stream else None
+		self._decompressor = zlib.decompressobj(self._WBITS) if stream else None
+
+	def encode(self, obj: Any) -> bytes:
+		data = orjson.dumps(obj)
+		if self._stream:
+			return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+		compressor = zlib.compressobj(self._level, zlib.DEFLATED, self._WBITS)
+		return compressor.compress(data) + compressor.flush()
+
+	def decode(self, data: Buffer) -> Any:
+		if self._stream:
+			return orjson.loads(self._decompressor.decompress(data))
+		return orjson.loads(zlib.decompress(data, self._WBITS))
+
+
+class MsgpackCodec(Codec):
+	"""Binary MessagePack frames. It requires optional msgpack package.
+	"""
+
+	def __init__(self) -> None:
+		import msgpack
+		self._packer = msgpack.Packer()
+		self._unpackb = msgpack.unpackb
+
+	def encode(self, obj: Any) -> bytes:
+		return self._packer.pack(obj)
+
+	def decode(self, data: Buffer) -> Any:
+		return self._unpackb(data, raw=False)
+
+__all__ = [Codec, RawCodec, GzipCodec, ZlibCodec, MsgpackCodec]
@@ -0,0 +1,274 @@
+"""Recording and replay of frames obtained from the server.
+
+A recording is an append-only file: a header with the type of game followed by records of raw frames, exactly as they
+were received, together with their arrival times. Frames are replayed from a memory-mapped file without copying, so
+an agent may be profiled on realistic states repeatedly, at full speed or with the original pace.
+"""
+import mmap
+import os
+import struct
+import threading
+from copy import deepcopy
+from functools import partial
+from itertools import count
+from time import perf_counter, sleep, time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import orjson
+
+from .codec import Codec, GzipCodec
+from .stateupdater import StateUpdater
+from ._metrics import _BotMetrics, _summarize
+from .. import _get_updater_initialization_params, _get_codec_initialization_params
+
+_MAGIC = b"BBREPLAY"
+_VERSION = 1
+# magic, version, length of metadata
+_HEADER = struct.Struct("<8sHI")
+# arrival time in seconds since the start of recording, length of frame, flag of text frame
+_RECORD = struct.Struct("<dI?")
+
+_sequence = count()
+
+
+class Recorder:
+	"""Appends raw frames and their arrival times to a file. It may be written by the event-loop and closed by another thread.
+	"""
+
+	def __init__(self, path: str, game_type: str ="") -> None:
+		"""Creates a file of recording, an existing file is overwritten.
+
+		Args:
+			path (str): path of file. Directories are created if needed.
+			game_type (str, optional): type of game, it chooses the codec and the state updater of replay. Defaults to "".
+		"""
+		directory = os.path.dirname(path)
+		if directory: os.makedirs(directory, exist_ok=True)
+		self.path = path
+		self.frames = 0
+		self.__lock = threading.Lock()
+		self.__file = open(path, "wb")
+		self.__start: Optional[float] = None
+		metadata = orjson.dumps({"game_type": game_type, "started": time()})
+		self.__file.write(_HEADER.pack(_MAGIC, _VERSION, len(metadata)) + metadata)
+
+	@property
+	def closed(self) -> bool:
+		"""Returns information whether or not the recorder is closed.
+
+		Returns:
+			bool: the "closed" state of recorder.
+		"""
+		return self.__file is None
+
+	def write(self, arrival: float, frame: Union[bytes, str]):
+		"""Appends a frame, frames written after close are ignored.
+
+		Args:
+			arrival (float): arrival time of frame measured by perf_counter.
+			frame (Union[bytes, str]): raw frame, as obtained from websocket.
+		"""
+		text = isinstance(frame, str)
+		data = frame.encode() if text else frame
+		with self.__lock:
+			if self.__file is None: return
+			if self.__start is None: self.__start = arrival
+			self.__file.write(_RECORD.pack(arrival - self.__start, len(data), text))
+			self.__file.write(data)
+			self.frames += 1
+
+	def close(self):
+		"""Flushes and closes the file.
+		"""
+		with self.__lock:
+			if self.__file is None: return
+			self.__file.close()
+			self.__file = None
+
+	def __enter__(self) -> "Recorder":
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+
+def new_recorder(path_template: str, game_type: str) -> Recorder:
+	"""Creates a recorder of a bot. The template is formatted with the process identifier, "pid", and the sequence number
+	of recorder in the process, "bot", e.g. "records/{pid}_{bot}.bbr".
+
+	Args:
+		path_template (str): template of path.
+		game_type (str): type of game.
+
+	Returns:
+		Recorder: recorder of frames.
+	"""
+	return Recorder(path_template.format(pid=os.getpid(), bot=next(_sequence)), game_type)
+
+
+class Recording:
+	"""Memory-mapped recording. Iteration yields arrival times and frames, every frame is a memoryview of the mapped file.
+	Frames have to be released before close, e.g. decoded and dropped.
+	"""
+
+	def __init__(self, path: str) -> None:
+		"""Opens and indexes a recording.
+
+		Args:
+			path (str): path of file written by Recorder.
+
+		Raises:
+			ValueError: if the file is not a recording.
+		"""
+		self.path = path
+		with open(path, "rb") as file:
+			self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+		self.__view = memoryview(self.__map)
+		if len(self.__view) < _HEADER.size:
+			self.close()
+			raise ValueError(f"File: {path} is not a recording")
+		magic, version, length = _HEADER.unpack_from(self.__view)
+		if magic != _MAGIC or version != _VERSION:
+			self.close()
+			raise ValueError(f"File: {path} is not a recording of version {_VERSION}")
+		self.metadata: Dict[str, Any] = orjson.loads(self.__view[_HEADER.size:_HEADER.size + length])
+		self.times: List[float] = []
+		self.__spans: List[Tuple[int, int, bool]] = []
+		self.__index(_HEADER.size + length)
+
+	def __index(self, offset: int):
+		"""Finds offsets of frames, a truncated record at the end of file, e.g. of a killed bot, is skipped."""
+		size = len(self.__view)
+		while offset + _RECORD.size <= size:
+			arrival, length, text = _RECORD.unpack_from(self.__view, offset)
+			start = offset + _RECORD.size
+			if start + length > size: break
+			self.times.append(arrival)
+			self.__spans.append((start, start + length, text))
+			offset = start + length
+
+	@property
+	def game_type(self) -> str:
+		"""Returns type of the recorded game.
+
+		Returns:
+			str: type of game.
+		"""
+		return self.metadata.get("game_type", "")
+
+	@property
+	def duration(self) -> float:
+		"""Returns time between arrivals of the first and the last frame.
+
+		Returns:
+			float: duration in seconds.
+		"""
+		return self.times[-1] - self.times[0] if self.times else 0.0
+
+	def __len__(self) -> int:
+		return len(self.__spans)
+
+	def __getitem__(self, index: int) -> Union[memoryview, str]:
+		start, end, text = self.__spans[index]
+		return str(self.__view[start:end], "utf-8") if text else self.__view[start:end]
+
+	def __iter__(self) -> Iterator[Tuple[float, Union[memoryview, str]]]:
+		for index, arrival in enumerate(self.times):
+			yield arrival, self[index]
+
+	def close(self):
+		"""Unmaps the file.
+		"""
+		self.__view.release()
+		self.__map.close()
+
+	def __enter__(self) -> "Recording":
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+
+def _unwrapped(agent: Any, name: str) -> Callable[..., Any]:
+	"""Returns a method of agent bound without its proxy, so that replay neither connects nor sends anything."""
+	for cls in type(agent).__mro__:
+		if name in cls.__dict__:
+			method = cls.__dict__[name]
+			return partial(getattr(method, "__wrapped__", method), agent)
+	raise AttributeError(f"{type(agent).__name__} has no method: {name}")
+
+def _codec_of(game_type: str) -> Codec:
+	codec_type, args, kwargs = _get_codec_initialization_params(game_type) or (GzipCodec, (), {})
+	return codec_type(*args, **kwargs)
+
+def _updater_of(game_type: str) -> Optional[StateUpdater]:
+	tup = _get_updater_initialization_params(game_type)
+	if not tup or not isinstance(tup, tuple) or tup[0] is None: return None
+	updater_type, args, kwargs = tup
+	return updater_type(*deepcopy(args), **deepcopy(kwargs))
+
+def replay(agent: Any, recording: Recording, pace: Optional[float] =None, codec: Optional[Codec] =None,
+		   updater: Optional[StateUpdater] =None, decide: bool =True) -> Dict[str, float]:
+	"""Feeds recorded frames into handle_new_states of agent and asks it for an action after every frame, like a bot woken up
+	on every state. Replay stops at the end of recording or when the agent is done.
+
+	Args:
+		agent (Agent): agent to profile, it is not connected to any server.
+		recording (Recording): recorded frames.
+		pace (Optional[float], optional): speed of replay relative to the original pace, e.g. 1.0 keeps arrival times of frames.
+		None replays at full speed. Defaults to None.
+		codec (Optional[Codec], optional): codec of frames. Defaults to the codec registered for the recorded type of game.
+		updater (Optional[StateUpdater], optional): state updater. Defaults to the updater registered for the recorded type of game.
+		decide (bool, optional): flag that indicates whether or not choose_action is called. Defaults to True.
+
+	Returns:
+		Dict[str, float]: count of frames and decisions, time of replay, decisions per second and percentiles of stages in milliseconds.
+	"""
+	codec = codec if codec is not None else _codec_of(recording.game_type)
+	updater = updater if updater is not None else _updater_of(recording.game_type)
+	handle_new_states, choose_action = _unwrapped(agent, "handle_new_states"), _unwrapped(agent, "choose_action")
+	metrics, frames = _BotMetrics(), 0
+
+	start = perf_counter()
+	first = recording.times[0] if len(recording) else 0.0
+	for arrival, frame in recording:
+		if pace:
+			delay = start + (arrival - first) / pace - perf_counter()
+			if delay > 0: sleep(delay)
+
+		received = perf_counter()
+		state = codec.decode(frame)
+		del frame
+		decoded = perf_counter()
+		metrics.decode.add(decoded - received)
+		if updater:
+			state = updater(state)
+			metrics.update.add(perf_counter() - decoded)
+		handled = perf_counter()
+		handle_new_states(state)
+		chosen = perf_counter()
+		metrics.handle.add(chosen - handled)
+		frames += 1
+
+		if decide:
+			action = choose_action()
+			encoding = perf_counter()
+			metrics.choose_action.add(encoding - chosen)
+			codec.encode(action.encode())
+			encoded = perf_counter()
+			metrics.encode.add(encoded - encoding)
+			metrics.decision.add(encoded - received)
+			metrics.decisions += 1
+		if agent.is_done: break
+
+	wall_time = perf_counter() - start
+	return {
+		"frames": frames,
+		"decisions": metrics.decisions,
+		"wall_time": wall_time,
+		"decisions_per_second": metrics.decisions / wall_time if wall_time else 0.0,
+		**{key: value for key, value in _summarize(metrics.counts).items() if not key.startswith(("recv", "send"))}
+	}
+
+
+__all__ = [Recorder, Recording, replay, new_recorder]
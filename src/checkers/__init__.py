@@ -1,5 +1,11 @@
 from .action import CheckersAction
 from .random_bot import RandomBot
+from .alphabeta_bot import AlphaBetaBot
 
 from .stateupdater import CheckersStateUpdater
-from .checkers_board import CheckersBoard
+from .checkers_board import CheckersBoard, initial_board
+from .bitboard import BitboardCheckersBoard
+from .search import AlphaBetaSearch
+from .parallel import ParallelSearch
+from .tablebase import EndgameTablebase, build_tablebase
+from .book import OpeningBook, build_book
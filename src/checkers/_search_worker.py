@@ -0,0 +1,27 @@
+"""Worker process of ParallelSearch: reads pickled requests from stdin, searches its share of root moves and writes
+pickled results to stdout. The worker keeps its AlphaBetaSearch, so its transposition table lives across moves.
+"""
+import sys
+
+from .parallel import read_frame, write_frame
+from .search import AlphaBetaSearch
+from .tablebase import _tablebase_of_process
+
+
+def main():
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    # nothing but frames may be written to stdout
+    sys.stdout = sys.stderr
+    search = None
+    while True:
+        request = read_frame(stdin)
+        if request is None: break
+        table_size, max_depth, path, board, moves, budget, depth = request
+        tablebase = _tablebase_of_process(path) if path else None
+        if search is None or len(search.table) != table_size or search.max_depth != max_depth or search.tablebase is not tablebase:
+            search = AlphaBetaSearch(table_size, max_depth, tablebase)
+        search.search(board, budget, depth, moves)
+        write_frame(stdout, (search.iterations, search.finished, search.nodes, search.elapsed))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from typing import Callable, Optional
+
+import numpy as np
+
+from .. import _logger
+from ..base import Agent
+from .action import CheckersAction
+from .bitboard import BitboardCheckersBoard, Move, coordinates_of
+from .book import _book_of_process
+from .checkers_board import CheckersBoard
+from .parallel import _search_of_process
+from .search import AlphaBetaSearch, zobrist
+from .tablebase import _tablebase_of_process
+
+
+class AlphaBetaBot(Agent):
+    """Chooses moves by iterative deepening alpha-beta search within a time budget per move, see AlphaBetaSearch.
+    Boards other than 8 by 8 are not supported by bitboards, then a random move is chosen like by RandomBot.
+    With more than one worker, root moves are searched in parallel by worker processes shared by bots of the process,
+    see ParallelSearch. During the opponent's turn the bot ponders: it searches the position after the expected reply,
+    so the transposition table is warm when the reply is played. Files of an opening book and an endgame tablebase are
+    memory-mapped once per process, book moves are played without search.
+    """
+
+    def __init__(self, generator: np.random.Generator, budget: float =1.0, max_depth: int =64, table_size: int =1 << 18,
+                 workers: Optional[int] =1, pondering: bool =True, book: Optional[str] =None, tablebase: Optional[str] =None):
+        """Creates a bot.
+
+        Args:
+            generator (np.random.Generator): generator of random moves on unsupported boards.
+            budget (float, optional): time in seconds for a move. Defaults to 1.0.
+            max_depth (int, optional): maximal depth of search. Defaults to 64.
+            table_size (int, optional): count of entries of the transposition table, a power of two. Defaults to 1 << 18.
+            workers (Optional[int], optional): count of worker processes of parallel search, None for count of cores.
+            Defaults to 1, that is, search in the process of the bot.
+            pondering (bool, optional): flag that indicates whether or not the bot searches during the opponent's turn,
+            it is supported by the search in the process of the bot only. Defaults to True.
+            book (Optional[str], optional): path of opening book written by build_book. Defaults to None.
+            tablebase (Optional[str], optional): path of endgame tablebase written by build_tablebase. Defaults to None.
+        """
+        super().__init__(CheckersAction)
+        self.__rng = generator
+        self.budget = budget
+        if workers == 1:
+            self.search = AlphaBetaSearch(table_size, max_depth, _tablebase_of_process(tablebase) if tablebase else None)
+        else:
+            self.search = _search_of_process(workers, table_size, max_depth, tablebase)
+        self.book = _book_of_process(book) if book else None
+        self.pondering = pondering and isinstance(self.search, AlphaBetaSearch)
+        # count of positions pondered on and count of them played by the opponent
+        self.ponders = 0
+        self.ponder_hits = 0
+        # the reply expected by the last pondering
+        self.ponder_move: Optional[Move] = None
+        self.__pondered: Optional[int] = None
+
+    def choose_action(self) -> CheckersAction:
+        if self.current_state and self.current_state.my_move:
+            if isinstance(self.current_state, BitboardCheckersBoard):
+                if self.__pondered is not None and zobrist(self.current_state) == self.__pondered:
+                    self.ponder_hits += 1
+                self.__pondered = None
+                entry = self.book.probe(self.current_state) if self.book is not None else None
+                if entry is not None:
+                    move = entry[0]
+                    _logger.debug(f"Played book move {move} chosen in {entry[1]} games")
+                else:
+                    move = self.search.search(self.current_state, self.budget)
+                    _logger.debug(f"Searched to depth {self.search.depth} with score {self.search.score}: "
+                                  f"{self.search.nodes} nodes, {self.search.nodes_per_second:.0f} nodes/s")
+                if move is not None:
+                    return CheckersAction([list(coordinates_of(square)) for square in move])
+            else:
+                moves = self.current_state.get_possible_moves()
+                if moves:
+                    return CheckersAction(moves[self.__rng.integers(len(moves))])
+
+        return CheckersAction([])
+
+    def ponder(self, interrupted: Callable[[], bool]):
+        """Searches, until interrupted, the position after the reply of the opponent expected by the last search.
+        A reply that is not in the transposition table is chosen by a shallow search of the opponent's position.
+        """
+        board = self.current_state
+        if (not self.pondering or not isinstance(board, BitboardCheckersBoard) or board.my_move
+                or board.game_status != "playing" or interrupted()):
+            return
+        board = board.copy()
+        moves = board.moves()
+        if not moves: return
+        reply = self.search.probe(board)
+        if reply not in moves:
+            reply = self.search.search(board, None, 2, interrupted=interrupted)
+            if interrupted(): return
+        board.push(reply)
+        # counters of moves without hitting are not sent by the server, a board of the next state starts them from zero
+        board.steps_without_hitting = {"r": 0, "a": 0}
+        if not board.moves(): return
+        key = zobrist(board)
+        if key != self.__pondered: self.ponders += 1
+        self.__pondered, self.ponder_move = key, reply
+        self.search.search(board, interrupted=interrupted)
+        _logger.debug(f"Pondered on {reply} to depth {self.search.depth}: {self.search.nodes} nodes")
+
+    def handle_new_states(self, msg):
+        try:
+            self.current_state = BitboardCheckersBoard(msg)
+        except ValueError:
+            self.current_state = CheckersBoard(msg)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Returns nodes per second of the last search."""
+        return self.search.nodes_per_second
+
+    @property
+    def is_done(self) -> bool:
+        if isinstance(self.current_state, (CheckersBoard, BitboardCheckersBoard)):
+            return self.current_state.game_status in ["lost", "won", "draw"]
+        return False
+
+    def update(self):
+        ...
@@ -0,0 +1,315 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+SIZE = 8
+
+Move = Tuple[int, ...]
+
+# playable squares are dark ones, (x + y) % 2 == 1, numbered in order of rows and columns
+_SQUARES: List[Tuple[int, int]] = [(x, y) for x in range(SIZE) for y in range(SIZE) if (x + y) % 2 == 1]
+_SQUARE_OF: Dict[Tuple[int, int], int] = {xy: square for square, xy in enumerate(_SQUARES)}
+
+# directions in order of the reference generator, men of a player use only the first two
+_DELTAS = {"a": ((-1, -1), (-1, 1), (1, -1), (1, 1)), "r": ((1, -1), (1, 1), (-1, -1), (-1, 1))}
+_PROMOTION = {"r": sum(1 << _SQUARE_OF[(SIZE - 1, y)] for y in range(SIZE) if (SIZE - 1 + y) % 2 == 1),
+              "a": sum(1 << _SQUARE_OF[(0, y)] for y in range(SIZE) if y % 2 == 1)}
+
+
+def _tables(player: str, king: bool) -> Tuple[Tuple[Tuple[int, ...], ...], Tuple[Tuple[Tuple[int, int], ...], ...]]:
+    """Returns targets of steps and pairs of jumped over and landing squares of every square, in order of directions."""
+    steps, jumps = [], []
+    for x, y in _SQUARES:
+        square_steps, square_jumps = [], []
+        for dx, dy in _DELTAS[player][:4 if king else 2]:
+            if (x + dx, y + dy) in _SQUARE_OF:
+                square_steps.append(_SQUARE_OF[(x + dx, y + dy)])
+                if (x + 2 * dx, y + 2 * dy) in _SQUARE_OF:
+                    square_jumps.append((_SQUARE_OF[(x + dx, y + dy)], _SQUARE_OF[(x + 2 * dx, y + 2 * dy)]))
+        steps.append(tuple(square_steps))
+        jumps.append(tuple(square_jumps))
+    return tuple(steps), tuple(jumps)
+
+_STEPS = {(player, king): _tables(player, king)[0] for player in "ra" for king in (False, True)}
+_JUMPS = {(player, king): _tables(player, king)[1] for player in "ra" for king in (False, True)}
+
+# squares adjacent to every square, a jump from a square is possible only if an opponent is among them
+_NEIGHBOURS = tuple(sum(1 << target for target in targets) for targets in _STEPS[("r", True)])
+# the same tables with bits of squares, so that tests of occupancy need no shifts
+_STEP_BITS = {key: tuple(tuple((1 << target, target) for target in targets) for targets in steps) for key, steps in _STEPS.items()}
+_JUMP_BITS = {key: tuple(tuple((1 << over, 1 << land, land) for over, land in pairs) for pairs in jumps) for key, jumps in _JUMPS.items()}
+# bit of the square jumped over by every jump
+_OVER = {(start, land): 1 << over for key, jumps in _JUMPS.items() for start, pairs in enumerate(jumps) for over, land in pairs}
+
+
+def _bits(bitboard: int):
+    """Yields indices of set bits in ascending order."""
+    while bitboard:
+        low = bitboard & -bitboard
+        yield low.bit_length() - 1
+        bitboard ^= low
+
+
+def square_of(x: int, y: int) -> int:
+    """Returns index of a dark square.
+
+    Args:
+        x (int): row.
+        y (int): column.
+
+    Raises:
+        ValueError: if the square is not playable.
+
+    Returns:
+        int: index of square, from 0 to 31.
+    """
+    square = _SQUARE_OF.get((x, y), None)
+    if square is None: raise ValueError(f"Square: {(x, y)} is not a dark square of a board of size {SIZE}")
+    return square
+
+def coordinates_of(square: int) -> Tuple[int, int]:
+    """Returns row and column of a square."""
+    return _SQUARES[square]
+
+
+class BitboardCheckersBoard:
+    """Checkers board of CheckersBoard kept in 32-bit bitboards of pieces of both players and of kings, one bit per dark square.
+
+    Moves are generated from precomputed tables of neighbours and jumps of every square, in the same order and with
+    the same rules as CheckersBoard: jumps are mandatory, captured pieces are removed during the chain, a man that reaches
+    the last row is promoted and continues as a king, and chains continue while the piece can jump. get_possible_moves returns
+    moves as lists of coordinates, like CheckersBoard, moves returns them as tuples of indices of squares.
+    """
+
+    __slots__ = ("red", "ai", "kings", "current_player", "steps_without_hitting", "last_move", "game_status",
+                 "chosen_move", "my_move", "_moves", "_undo")
+
+    def __init__(self, state: Dict[str, Any]):
+        """Creates a board from a state sent by the server.
+
+        Args:
+            state (Dict[str, Any]): state with "board", "player", "last_move", "game_status" and "your_move".
+
+        Raises:
+            ValueError: if the board is not 8 by 8 or there is a piece on a light square.
+        """
+        self.red, self.ai, self.kings = self.bitboards(state['board'])
+        self.current_player = state['player']
+        self.steps_without_hitting = {"r": 0, "a": 0}
+        self.last_move = state['last_move']
+        self.game_status = state['game_status']
+        self.chosen_move = None
+        self.my_move = state["your_move"]
+        self._moves: Optional[List[Move]] = None
+        self._undo: List[Tuple[Any, ...]] = []
+
+    @staticmethod
+    def bitboards(board: Sequence[Sequence[str]]) -> Tuple[int, int, int]:
+        """Converts a board of the server into bitboards.
+
+        Args:
+            board (Sequence[Sequence[str]]): board indexed by [x][y], pieces are "r", "a", kings "R", "A", empty squares " ".
+
+        Raises:
+            ValueError: if the board is not 8 by 8 or there is a piece on a light square.
+
+        Returns:
+            Tuple[int, int, int]: bitboards of pieces of "r", pieces of "a" and kings.
+        """
+        if len(board) != SIZE or any(len(row) != SIZE for row in board):
+            raise ValueError(f"Only boards of size {SIZE} are supported")
+        red = ai = kings = 0
+        for x, row in enumerate(board):
+            for y, piece in enumerate(row):
+                if piece == ' ': continue
+                bit = 1 << square_of(x, y)
+                if piece in 'rR': red |= bit
+                elif piece in 'aA': ai |= bit
+                else: raise ValueError(f"Unknown piece: {piece!r}")
+                if piece.isupper(): kings |= bit
+        return red, ai, kings
+
+    @property
+    def men(self) -> int:
+        return (self.red | self.ai) & ~self.kings
+
+    @property
+    def board(self) -> List[List[str]]:
+        """Returns the board in the format of the server, indexed by [x][y]."""
+        board = [[' '] * SIZE for _ in range(SIZE)]
+        for bitboard, piece in ((self.red, 'r'), (self.ai, 'a')):
+            for square in _bits(bitboard):
+                x, y = _SQUARES[square]
+                board[x][y] = piece.upper() if self.kings >> square & 1 else piece
+        return board
+
+    def to_state(self) -> Dict[str, Any]:
+        """Returns the board as a state of the server."""
+        return {"board": self.board, "player": self.current_player, "last_move": self.last_move,
+                "game_status": self.game_status, "your_move": self.my_move}
+
+    @classmethod
+    def from_bitboards(cls, red: int, ai: int, kings: int, player: str ='r') -> "BitboardCheckersBoard":
+        """Creates a board of a playing game from bitboards, e.g. a position enumerated by a generator of databases.
+
+        Args:
+            red (int): pieces of "r".
+            ai (int): pieces of "a".
+            kings (int): kings of both players.
+            player (str, optional): player to move. Defaults to 'r'.
+
+        Returns:
+            BitboardCheckersBoard: board, counters of moves without hitting start from zero.
+        """
+        new = cls.__new__(cls)
+        new.red, new.ai, new.kings = red, ai, kings
+        new.current_player = player
+        new.steps_without_hitting = {"r": 0, "a": 0}
+        new.last_move, new.game_status, new.chosen_move, new.my_move = [], "playing", None, True
+        new._moves = None
+        new._undo = []
+        return new
+
+    def copy(self) -> "BitboardCheckersBoard":
+        new = BitboardCheckersBoard.__new__(BitboardCheckersBoard)
+        new.red, new.ai, new.kings = self.red, self.ai, self.kings
+        new.current_player = self.current_player
+        new.steps_without_hitting = dict(self.steps_without_hitting)
+        new.last_move, new.game_status, new.chosen_move, new.my_move = self.last_move, self.game_status, self.chosen_move, self.my_move
+        new._moves = None
+        new._undo = []
+        return new
+
+    def get_current_player(self):
+        return self.current_player
+
+    def get_win(self):
+        if self.steps_without_hitting["a"] >= 10 and self.steps_without_hitting["r"] >= 10:
+            return 'remis'
+        if self.steps_without_hitting["r"] == -1:
+            return 'a'
+        if self.steps_without_hitting["a"] == -1:
+            return 'r'
+        if len(self.moves()) == 0:
+            return 'a' if self.current_player == 'r' else 'r'
+        return None
+
+    def moves(self) -> List[Move]:
+        """Returns legal moves of the current player as tuples of squares, in order of CheckersBoard.get_possible_moves.
+
+        Returns:
+            List[Move]: moves, every move is a tuple of squares visited by the piece.
+        """
+        if self._moves is None:
+            self._moves = self.__jump_moves() or self.__simple_moves()
+        return self._moves
+
+    def get_possible_moves(self) -> List[List[List[int]]]:
+        """Returns legal moves of the current player as lists of coordinates, the same as CheckersBoard.get_possible_moves."""
+        return [[list(_SQUARES[square]) for square in move] for move in self.moves()]
+
+    def get_possible_jump_for_position(self, x, y, pl):
+        own, opponent = (self.red, self.ai) if pl == 'r' else (self.ai, self.red)
+        square = _SQUARE_OF.get((x, y), None)
+        if square is None or not own >> square & 1: return []
+        empty = ~(self.red | self.ai)
+        return [[[x, y], list(_SQUARES[land])] for over, land in _JUMPS[(pl, bool(self.kings >> square & 1))][square]
+                if opponent >> over & 1 and empty >> land & 1]
+
+    def __simple_moves(self) -> List[Move]:
+        player = self.current_player
+        own = self.red if player == 'r' else self.ai
+        occupied = self.red | self.ai
+        kings = self.kings
+        men_steps, king_steps = _STEP_BITS[(player, False)], _STEP_BITS[(player, True)]
+        moves = []
+        while own:
+            low = own & -own
+            own ^= low
+            square = low.bit_length() - 1
+            for bit, target in (king_steps if kings & low else men_steps)[square]:
+                if not occupied & bit:
+                    moves.append((square, target))
+        return moves
+
+    def __jump_moves(self) -> List[Move]:
+        player = self.current_player
+        own, opponent = (self.red, self.ai) if player == 'r' else (self.ai, self.red)
+        occupied = self.red | self.ai
+        moves: List[Move] = []
+        while own:
+            low = own & -own
+            own ^= low
+            square = low.bit_length() - 1
+            if _NEIGHBOURS[square] & opponent:
+                self.__chains(player, square, bool(self.kings & low), opponent, occupied & ~low, (square,), moves)
+        return moves
+
+    def __chains(self, player: str, square: int, king: bool, opponent: int, occupied: int, path: Move, moves: List[Move]):
+        """Appends chains of jumps of a piece at square, occupied excludes the jumping piece."""
+        extended = False
+        for over, land_bit, land in _JUMP_BITS[(player, king)][square]:
+            if not opponent & over or occupied & land_bit: continue
+            extended = True
+            self.__chains(player, land, king or bool(_PROMOTION[player] & land_bit), opponent & ~over, occupied & ~over,
+                          path + (land,), moves)
+        if not extended and len(path) > 1:
+            moves.append(path)
+
+    def make_move(self, move):
+        """Returns the board after a move of the current player, the same as CheckersBoard.make_move.
+
+        Args:
+            move: move as a list of coordinates or a tuple of squares.
+
+        Returns:
+            BitboardCheckersBoard: new board.
+        """
+        new = self.copy()
+        new.__apply(move)
+        return new
+
+    def push(self, move):
+        """Makes a move in place, pop undoes it. Undo records are a few integers, nothing is copied.
+
+        Args:
+            move: move as a list of coordinates or a tuple of squares.
+        """
+        steps = self.steps_without_hitting
+        self._undo.append((self.red, self.ai, self.kings, steps["r"], steps["a"], self.current_player, self.last_move, self._moves))
+        self.__apply(move)
+
+    def pop(self):
+        """Undoes the last pushed move.
+
+        Raises:
+            IndexError: if there is no pushed move.
+        """
+        steps = self.steps_without_hitting
+        self.red, self.ai, self.kings, steps["r"], steps["a"], self.current_player, self.last_move, self._moves = self._undo.pop()
+
+    def __apply(self, move):
+        squares = [square if isinstance(square, int) else square_of(*square) for square in move]
+        player = self.current_player
+        red, ai, kings = self.red, self.ai, self.kings
+        for start, end in zip(squares, squares[1:]):
+            start_bit, end_bit = 1 << start, 1 << end
+            # the piece at start, if any, is moved to end, whatever is at end is replaced
+            piece_red, piece_ai, piece_king = red & start_bit, ai & start_bit, kings & start_bit
+            cleared = ~(start_bit | end_bit)
+            red, ai, kings = red & cleared, ai & cleared, kings & cleared
+            if piece_red: red |= end_bit
+            if piece_ai: ai |= end_bit
+            if (piece_red or piece_ai) and (piece_king or (piece_red and _PROMOTION["r"] & end_bit) or (piece_ai and _PROMOTION["a"] & end_bit)):
+                kings |= end_bit
+            over = _OVER.get((start, end), None)
+            if over is not None:
+                red, ai, kings = red & ~over, ai & ~over, kings & ~over
+                self.steps_without_hitting[player] = 0
+            elif abs(_SQUARES[end][0] - _SQUARES[start][0]) == 2:
+                # like in CheckersBoard, a move by two rows counts as a capture even if nothing is jumped over
+                self.steps_without_hitting[player] = 0
+            else:
+                self.steps_without_hitting[player] += 1
+        self.red, self.ai, self.kings = red, ai, kings
+        self.current_player = 'a' if player == 'r' else 'r'
+        self.last_move = move
+        self._moves = None
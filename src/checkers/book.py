@@ -0,0 +1,154 @@
+"""Opening book of checkers derived from self-play of AlphaBetaSearch: the move chosen most often in every position of
+the first plies of games, stored in an open-addressing hash table of a file that bots memory-map read-only.
+
+	python -m src.checkers.book --games 200 --plies 12 --budget 0.5 --output tablebases/checkers.bbob
+"""
+import argparse
+import mmap
+import os
+import struct
+from collections import Counter
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .bitboard import BitboardCheckersBoard, Move
+from .checkers_board import initial_board
+from .search import AlphaBetaSearch, zobrist
+
+_MAGIC = b"BBOPBOOK"
+_VERSION = 1
+# magic, version, count of slots, count of positions
+_HEADER = struct.Struct("<8sHII")
+# hash of position, up to 4 squares of move, count of games in which the move was chosen
+_SLOT = struct.Struct("<Q4sI")
+_NO_SQUARE = 0xFF
+_LONGEST = 4
+
+
+def _key(board: BitboardCheckersBoard) -> int:
+    # counters of moves without hitting are not sent by the server, the empty slot has key 0
+    return zobrist(board, counters=False) or 1
+
+
+class OpeningBook:
+    """Memory-mapped opening book, see build_book. A probe reads one or a few slots of the file."""
+
+    def __init__(self, path: str) -> None:
+        """Maps a file of opening book.
+
+        Args:
+            path (str): path of file written by build_book.
+
+        Raises:
+            ValueError: if the file is not an opening book of a supported version.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, slots, self.__count = _HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"File: {path} is not a checkers opening book of version {_VERSION}")
+        self.__mask = slots - 1
+
+    def __len__(self) -> int:
+        """Returns count of positions."""
+        return self.__count
+
+    def close(self):
+        self.__map.close()
+
+    def probe(self, board: BitboardCheckersBoard) -> Optional[Tuple[Move, int]]:
+        """Returns the book move of a position.
+
+        Args:
+            board (BitboardCheckersBoard): board.
+
+        Returns:
+            Optional[Tuple[Move, int]]: legal move and count of games in which it was chosen, None if the position is not in the book.
+        """
+        key = _key(board)
+        slot = key & self.__mask
+        while True:
+            stored, squares, games = _SLOT.unpack_from(self.__map, _HEADER.size + slot * _SLOT.size)
+            if stored == 0: return None
+            if stored == key: break
+            slot = (slot + 1) & self.__mask
+        move = tuple(square for square in squares if square != _NO_SQUARE)
+        return (move, games) if move in board.moves() else None
+
+
+def build_book(path: str, games: int =200, plies: int =12, budget: float =0.5, random_plies: int =2,
+               seed: int =2137, verbose: bool =False) -> OpeningBook:
+    """Plays games of AlphaBetaSearch against itself and writes moves chosen in their first plies.
+
+    Args:
+        path (str): path of file, directories are created if needed.
+        games (int, optional): count of games. Defaults to 200.
+        plies (int, optional): count of plies of every game. Defaults to 12.
+        budget (float, optional): time budget of a move in seconds. Defaults to 0.5.
+        random_plies (int, optional): count of first plies played randomly, so that games differ; moves of the search
+        are recorded in them as well. Defaults to 2.
+        seed (int, optional): seed of random plies. Defaults to 2137.
+        verbose (bool, optional): flag that indicates whether or not progress is printed. Defaults to False.
+
+    Returns:
+        OpeningBook: the written book.
+    """
+    rng = np.random.default_rng(seed)
+    search = AlphaBetaSearch()
+    chosen: Dict[int, Counter] = {}
+    initial = {"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True}
+    for game in range(games):
+        start = perf_counter()
+        board = BitboardCheckersBoard(initial)
+        for ply in range(plies):
+            moves = board.moves()
+            if not moves: break
+            move = search.search(board, budget)
+            if len(move) <= _LONGEST: chosen.setdefault(_key(board), Counter())[move] += 1
+            # the searched move is recorded, a random one is played
+            if ply < random_plies: move = moves[rng.integers(len(moves))]
+            board.push(move)
+        if verbose: print(f"game {game}: {len(chosen)} positions in {perf_counter() - start:.1f} s")
+
+    slots = 1
+    while slots < 2 * len(chosen): slots *= 2
+    table = bytearray(_HEADER.pack(_MAGIC, _VERSION, slots, len(chosen))) + bytes(slots * _SLOT.size)
+    for key, counter in chosen.items():
+        move, count = counter.most_common(1)[0]
+        slot = key & (slots - 1)
+        while _SLOT.unpack_from(table, _HEADER.size + slot * _SLOT.size)[0]:
+            slot = (slot + 1) & (slots - 1)
+        _SLOT.pack_into(table, _HEADER.size + slot * _SLOT.size, key, bytes(move + (_NO_SQUARE,) * (_LONGEST - len(move))), count)
+
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(table)
+    return OpeningBook(path)
+
+
+_books: Dict[Tuple[int, str], OpeningBook] = {}
+
+def _book_of_process(path: str) -> OpeningBook:
+    """Returns the opening book of a file mapped once by the current process."""
+    key = (os.getpid(), path)
+    book = _books.get(key, None)
+    if book is None:
+        book = _books[key] = OpeningBook(path)
+    return book
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--plies", type=int, default=12, help="count of plies of every game")
+    parser.add_argument("--budget", type=float, default=0.5, help="time budget of a move in seconds")
+    parser.add_argument("--random-plies", type=int, default=2, help="count of first plies played randomly")
+    parser.add_argument("--output", default="tablebases/checkers.bbob")
+    args = parser.parse_args()
+    start = perf_counter()
+    book = build_book(args.output, args.games, args.plies, args.budget, args.random_plies, verbose=True)
+    print(f"Wrote {len(book)} positions to {args.output} in {perf_counter() - start:.1f} s")
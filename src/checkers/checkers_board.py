@@ -1,6 +1,20 @@
 import copy
-from copy import deepcopy
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+
+def initial_board(size: int =8, rows: int =3) -> List[List[str]]:
+    """Returns the initial board of checkers, pieces of "r" player move towards higher rows.
+
+    Args:
+        size (int, optional): size of board. Defaults to 8.
+        rows (int, optional): count of rows occupied by pieces of every player. Defaults to 3.
+
+    Returns:
+        List[List[str]]: board indexed by [x][y], empty squares are " ".
+    """
+    return [["r" if (x + y) % 2 == 1 and x < rows else "a" if (x + y) % 2 == 1 and x >= size - rows else " "
+             for y in range(size)] for x in range(size)]
+
 
 class CheckersBoard:
 
@@ -15,6 +29,7 @@ class CheckersBoard:
         self.game_status = state['game_status']
         self.chosen_move = None
         self.my_move = state["your_move"]
+        self.__undo = []
 
 
 
@@ -35,9 +50,47 @@ class CheckersBoard:
         return None
 
 
+    def copy(self):
+        """Returns a copy of the board without history of pushed moves."""
+        new = copy.copy(self)
+        new.board = [row[:] for row in self.board]
+        new.steps_without_hitting = dict(self.steps_without_hitting)
+        new.__undo = []
+        return new
+
     def make_move(self, move):
 
-        newState = deepcopy(self)
+        newState = self.copy()
+        newState.__apply(move)
+        return newState
+
+    def push(self, move):
+        """Makes a move in place, so that search does not copy the board per node. pop undoes the move.
+
+        Args:
+            move (list): move as a list of coordinates.
+        """
+        changes = []
+        self.__undo.append((changes, self.steps_without_hitting["r"], self.steps_without_hitting["a"], self.current_player, self.last_move))
+        self.__apply(move, changes)
+
+    def pop(self):
+        """Undoes the last pushed move.
+
+        Raises:
+            IndexError: if there is no pushed move.
+        """
+        changes, self.steps_without_hitting["r"], self.steps_without_hitting["a"], self.current_player, self.last_move = self.__undo.pop()
+        for x, y, piece in reversed(changes):
+            self.board[x][y] = piece
+
+    def __apply(self, move, changes=None):
+        """Applies a move in place, previous pieces of changed squares are appended to changes."""
+        board = self.board
+        def put(x, y, piece):
+            if changes is not None: changes.append((x, y, board[x][y]))
+            board[x][y] = piece
+
         for index in range(len(move) - 1):
 
             start_x = move[index][0]
@@ -45,36 +98,53 @@ class CheckersBoard:
             end_x = move[index + 1][0]
             end_y = move[index + 1][1]
 
-            newState.board[end_x][end_y] = newState.board[start_x][start_y]
+            put(end_x, end_y, board[start_x][start_y])
 
-            if (end_x == (len(newState.board) - 1) and newState.board[end_x][end_y] == 'r') or (end_x == 0 and newState.board[end_x][end_y] == 'a'):
-                newState.board[end_x][end_y] = newState.board[end_x][end_y].upper()
+            if (end_x == (len(board) - 1) and board[end_x][end_y] == 'r') or (end_x == 0 and board[end_x][end_y] == 'a'):
+                put(end_x, end_y, board[end_x][end_y].upper())
 
-            newState.board[start_x][start_y] = ' '
+            put(start_x, start_y, ' ')
 
             if abs(end_x - start_x) == 2:
-                newState.board[(end_x + start_x) // 2][(end_y + start_y) // 2] = ' '
-                newState.steps_without_hitting[newState.get_current_player()] = 0
+                put((end_x + start_x) // 2, (end_y + start_y) // 2, ' ')
+                self.steps_without_hitting[self.get_current_player()] = 0
             else:
-                newState.steps_without_hitting[newState.get_current_player()] += 1
+                self.steps_without_hitting[self.get_current_player()] += 1
 
-        newState.current_player = 'a' if newState.current_player == 'r' else 'r'
+        self.current_player = 'a' if self.current_player == 'r' else 'r'
 
-        newState.last_move = move
-
-        return newState
+        self.last_move = move
 
 
     def get_possible_moves(self):
 
-        delta = [[-1, -1], [-1, 1], [1, -1], [1, 1]] if self.current_player == 'a' else [
-            [1, -1], [1, 1], [-1, -1], [-1, 1]]
-
         list_jump_moves = self.get_possible_multi_jump_moves()
         if len(list_jump_moves) > 0:
             return list_jump_moves
 
-        list_simple_moves = []
+        return list(self.iter_simple_moves())
+
+
+    def get_possible_multi_jump_moves(self):
+
+        return list(self.iter_jump_moves())
+
+    def iter_moves(self):
+        """Yields legal moves lazily, in order of get_possible_moves: jumps if there are any, simple moves otherwise.
+        The board must not be changed until the iteration is over.
+        """
+        jumps = False
+        for move in self.iter_jump_moves():
+            jumps = True
+            yield move
+        if not jumps:
+            yield from self.iter_simple_moves()
+
+    def iter_simple_moves(self):
+        """Yields moves of the current player to an adjacent empty square lazily, regardless of jumps.
+        """
+        delta = [[-1, -1], [-1, 1], [1, -1], [1, 1]] if self.current_player == 'a' else [
+            [1, -1], [1, 1], [-1, -1], [-1, 1]]
 
         for x in range(len(self.board)):
             for y in range(len(self.board[x])):
@@ -89,72 +159,43 @@ class CheckersBoard:
                         new_x = x + delta[index][0]
                         new_y = y + delta[index][1]
                         if 0 <= new_x < len(self.board) and 0 <= new_y < len(self.board[x]) and self.board[new_x][new_y] == ' ':
-                            list_simple_moves.append([[x, y], [new_x, new_y]])
-
-        return list_simple_moves
-
-
-    def get_possible_multi_jump_moves(self):
-
-        list_jump_moves = []
-
+                            yield [[x, y], [new_x, new_y]]
+
+    def iter_jump_moves(self):
+        """Yields chains of jumps of any length of the current player lazily, the board itself is not changed.
+        A chain continues while the piece can jump, captured pieces are removed after being jumped over
+        and a man that reaches the last row continues as a king.
+        """
+        player = self.current_player
         for x in range(len(self.board)):
             for y in range(len(self.board[x])):
-
-                if self.board[x][y].lower() == self.current_player:
-
-                    list_of_moves_1 = self.get_possible_jump_for_position(x, y,
-                                                                          self.get_current_player())
-                    all_lists = []
-
-                    if len(list_of_moves_1) == 0:
-                        continue
-
-                    for move1 in list_of_moves_1:
-
-                        new_chekers = self.make_move(move1)
-                        list_of_moves_2 = new_chekers.get_possible_jump_for_position(
-                            move1[1][0], move1[1][1], self.get_current_player())
-
-                        if len(list_of_moves_2) == 0:
-                            all_lists.append(move1)
-                            continue
-
-                        for move2 in list_of_moves_2:
-                            move_1_2 = copy.deepcopy(move1)
-                            move_1_2.append(move2[1])
-
-                            new_chekers2 = new_chekers.make_move(move2)
-                            list_of_moves_3 = new_chekers2.get_possible_jump_for_position(
-                                move2[1][0], move2[1][1], self.get_current_player())
-
-                            if len(list_of_moves_3) == 0:
-                                all_lists.append(move_1_2)
-                                continue
-
-                            for move3 in list_of_moves_3:
-                                move_1_2_3 = copy.deepcopy(move_1_2)
-                                move_1_2_3.append(move3[1])
-
-                                new_chekers3 = new_chekers2.make_move(move3)
-                                list_of_moves_4 = new_chekers3.get_possible_jump_for_position(
-                                    move3[1][0], move3[1][1], self.get_current_player())
-
-                                if len(list_of_moves_4) == 0:
-                                    all_lists.append(move_1_2_3)
-                                    continue
-
-                                for move4 in list_of_moves_4:
-                                    move_1_2_3_4 = copy.deepcopy(move_1_2_3)
-                                    move_1_2_3_4.append(move4[1])
-
-                                    all_lists.append(move_1_2_3_4)
-
-                    if len(all_lists) > 0:
-                        for list_moves in all_lists:
-                            list_jump_moves.append(list_moves)
-
-        return list_jump_moves
+                if self.board[x][y].lower() == player:
+                    yield from self.__jump_chains([[x, y]], self.board[x][y].isupper(), set())
+
+    def __jump_chains(self, path, king, captured):
+        """Yields maximal chains that start with path, captured are squares jumped over so far."""
+        player = self.current_player
+        opponent_player = 'a' if player == 'r' else 'r'
+        delta = [[-1, -1], [-1, 1], [1, -1], [1, 1]] if player == 'a' else [[1, -1], [1, 1], [-1, -1], [-1, 1]]
+        (start_x, start_y), (x, y) = path[0], path[-1]
+        extended = False
+
+        for index in range(4 if king else 2):
+            over_x, over_y = x + delta[index][0], y + delta[index][1]
+            new_x, new_y = over_x + delta[index][0], over_y + delta[index][1]
+            if not (0 <= new_x < len(self.board) and 0 <= new_y < len(self.board[x])): continue
+            if (over_x, over_y) in captured or self.board[over_x][over_y].lower() != opponent_player: continue
+            # the piece has left its starting square and captured pieces are already removed
+            if self.board[new_x][new_y] != ' ' and (new_x, new_y) != (start_x, start_y) and (new_x, new_y) not in captured: continue
+
+            extended = True
+            promoted = (player == 'r' and new_x == len(self.board) - 1) or (player == 'a' and new_x == 0)
+            captured.add((over_x, over_y))
+            yield from self.__jump_chains(path + [[new_x, new_y]], king or promoted, captured)
+            captured.discard((over_x, over_y))
+
+        if not extended and len(path) > 1:
+            yield path
 
 
     def get_possible_jump_for_position(self, x, y, pl):
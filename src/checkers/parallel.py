@@ -0,0 +1,210 @@
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import weakref
+from time import perf_counter
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from .. import _logger
+from .bitboard import BitboardCheckersBoard, Move
+from .search import AlphaBetaSearch
+from .tablebase import _tablebase_of_process
+
+# directory that contains the package, so that workers import it the same way
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# requests and results are pickles prefixed by their length
+_LENGTH = struct.Struct("<I")
+# time in seconds for which a worker may answer after the budget of search, then it is considered hung
+_GRACE = 1.0
+
+
+def read_frame(stream: BinaryIO) -> Optional[Any]:
+    """Returns an unpickled frame, None at the end of stream."""
+    header = stream.read(_LENGTH.size)
+    if len(header) < _LENGTH.size: return None
+    (length,) = _LENGTH.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length: return None
+    return pickle.loads(payload)
+
+def write_frame(stream: BinaryIO, value: Any):
+    payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    stream.write(_LENGTH.pack(len(payload)) + payload)
+    stream.flush()
+
+
+class ParallelSearch:
+    """Alpha-beta search that spreads root moves across worker processes, every worker runs iterative deepening
+    of AlphaBetaSearch over its share of moves with its own transposition table.
+
+    Workers are plain subprocesses started by the first search and reused by later ones, since bots are hosted
+    by daemonic processes of multiprocessing pools, which cannot have child processes of multiprocessing.
+    Results are combined at the greatest depth completed by every worker still searching when the budget ran out;
+    a worker that finished earlier, e.g. by a mate, contributes its last result. Bots sharing the search take turns,
+    time spent waiting for the turn is taken from the budget, and a bot that does not get its turn within the budget
+    searches in its own thread. A worker that does not answer within the budget and a grace period is killed,
+    then the search falls back to the current process.
+    """
+
+    def __init__(self, workers: Optional[int] =None, table_size: int =1 << 18, max_depth: int =64, tablebase: Optional[str] =None) -> None:
+        """Creates a search, workers are started by the first search.
+
+        Args:
+            workers (Optional[int], optional): count of worker processes. Defaults to None, that is, count of cores.
+            table_size (int, optional): count of entries of the transposition table of every worker, a power of two. Defaults to 1 << 18.
+            max_depth (int, optional): maximal depth of iterative deepening. Defaults to 64.
+            tablebase (Optional[str], optional): path of endgame tablebase mapped by every worker. Defaults to None.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.table_size = table_size
+        self.max_depth = max_depth
+        self.tablebase = tablebase
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self.elapsed = 0.0
+        # searches in the current process are local to threads of bots, they run without the lock
+        self.__local = threading.local()
+        self.__processes: List[subprocess.Popen] = []
+        self.__results: List[queue.Queue] = []
+        self.__lock = threading.Lock()
+        self.__finalizer = weakref.finalize(self, ParallelSearch._terminate, self.__processes)
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Returns nodes per second of all workers in the last search."""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @staticmethod
+    def _terminate(processes: List[subprocess.Popen]):
+        for process in processes:
+            try:
+                process.stdin.close()
+                process.wait(1)
+            except Exception:
+                process.kill()
+        processes.clear()
+
+    def start(self):
+        """Starts workers, if they are not running yet."""
+        if self.__processes: return
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, (_ROOT, env.get("PYTHONPATH"))))
+        module = f"{__package__}._search_worker"
+        self.__results = []
+        for _ in range(self.workers):
+            process = subprocess.Popen([sys.executable, "-m", module], stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, cwd=_ROOT)
+            self.__processes.append(process)
+            self.__results.append(queue.Queue())
+            threading.Thread(target=ParallelSearch._read_results, args=(process.stdout, self.__results[-1]), daemon=True).start()
+
+    @staticmethod
+    def _read_results(stream: BinaryIO, results: queue.Queue):
+        """Moves frames of a worker to a queue, so they can be awaited with a timeout; None marks the end of stream."""
+        try:
+            while True:
+                result = read_frame(stream)
+                results.put(result)
+                if result is None: break
+        except (OSError, ValueError, pickle.UnpicklingError):
+            results.put(None)
+
+    def close(self):
+        """Stops workers."""
+        ParallelSearch._terminate(self.__processes)
+
+    def search(self, board: BitboardCheckersBoard, budget: Optional[float] =None, max_depth: Optional[int] =None) -> Optional[Move]:
+        """Searches the best move of the player to move, see AlphaBetaSearch.search.
+
+        Args:
+            board (BitboardCheckersBoard): board.
+            budget (Optional[float], optional): time in seconds. Defaults to None, that is, until max_depth.
+            max_depth (Optional[int], optional): maximal depth. Defaults to None, that is, max_depth of the search.
+
+        Returns:
+            Optional[Move]: the best move, None if there are no legal moves.
+        """
+        moves = board.moves()
+        if self.workers <= 1 or len(moves) <= 1:
+            return self.__search_locally(board, budget, max_depth)
+        start = perf_counter()
+        if not self.__lock.acquire(timeout=-1 if budget is None else budget):
+            _logger.info("Workers of parallel search are busy. Searching in the current process...")
+            return self.__search_locally(board, 0.0, max_depth, start)
+        try:
+            if budget is not None: budget = max(0.0, budget - (perf_counter() - start))
+            try:
+                self.start()
+                shares = [moves[index::self.workers] for index in range(self.workers)]
+                shares = [share for share in shares if share]
+                request = board.copy()
+                for process, share in zip(self.__processes, shares):
+                    write_frame(process.stdin, (self.table_size, self.max_depth, self.tablebase, request, share, budget, max_depth))
+                deadline = None if budget is None else perf_counter() + budget + _GRACE
+                results = [self.__result(index, deadline) for index in range(len(shares))]
+            except (OSError, EOFError) as e:
+                _logger.info(f"Parallel search failed -> {type(e)}: {e}. Searching in the current process...")
+                self.close()
+                return self.__search_locally(board, budget, max_depth, start)
+            self.elapsed = perf_counter() - start
+            self.nodes = sum(nodes for _, _, nodes, _ in results)
+            return self.__combine([(iterations, finished) for iterations, finished, _, _ in results], moves)
+        finally:
+            self.__lock.release()
+
+    def __result(self, index: int, deadline: Optional[float]) -> Tuple[List[Tuple[int, int, Move]], bool, int, float]:
+        """Returns the result of a worker.
+
+        Raises:
+            TimeoutError: if the worker does not answer before the deadline.
+            EOFError: if the worker exited.
+        """
+        try:
+            result = self.__results[index].get(timeout=None if deadline is None else max(0.0, deadline - perf_counter()))
+        except queue.Empty:
+            raise TimeoutError("Worker of search did not answer in time") from None
+        if result is None: raise EOFError("Worker of search exited")
+        return result
+
+    def __search_locally(self, board: BitboardCheckersBoard, budget: Optional[float], max_depth: Optional[int],
+                         start: Optional[float] =None) -> Optional[Move]:
+        local = getattr(self.__local, "search", None)
+        if local is None:
+            local = self.__local.search = AlphaBetaSearch(self.table_size, self.max_depth,
+                                                          _tablebase_of_process(self.tablebase) if self.tablebase else None)
+        move = local.search(board, budget, max_depth)
+        self.nodes, self.depth, self.score = local.nodes, local.depth, local.score
+        self.elapsed = local.elapsed if start is None else perf_counter() - start
+        return move
+
+    def __combine(self, results: List[Tuple[List[Tuple[int, int, Move]], bool]], moves: List[Move]) -> Move:
+        """Returns the best move at the greatest depth completed by every worker that did not finish its search.
+        Workers that did not complete any depth are ignored, the first move is returned if no worker did."""
+        searching = [iterations[-1][0] for iterations, finished in results if iterations and not finished]
+        depth = min(searching) if searching else max((iterations[-1][0] for iterations, _ in results if iterations), default=0)
+        self.depth = depth
+        best: Optional[Tuple[int, Move]] = None
+        for iterations, _ in results:
+            completed = [iteration for iteration in iterations if iteration[0] <= depth]
+            if not completed: continue
+            _, score, move = completed[-1]
+            if best is None or score > best[0]: best = (score, move)
+        if best is None: return moves[0]
+        self.score = best[0]
+        return best[1]
+
+
+_searches: Dict[Tuple[int, Optional[int], int, int, Optional[str]], ParallelSearch] = {}
+
+def _search_of_process(workers: Optional[int], table_size: int, max_depth: int, tablebase: Optional[str] =None) -> ParallelSearch:
+    """Returns a parallel search shared by bots of the current process created with the same arguments, its workers are
+    started once and reused."""
+    key = (os.getpid(), workers, table_size, max_depth, tablebase)
+    search = _searches.get(key, None)
+    if search is None:
+        search = _searches[key] = ParallelSearch(workers, table_size, max_depth, tablebase)
+    return search
@@ -13,9 +13,11 @@ class RandomBot(Agent):
     def choose_action(self) -> CheckersAction:
         print("\nfun choose_action()")
         if self.current_state and self.current_state.my_move:
-            chosen_action = self.__rng.choice(self.current_state.get_possible_moves())
+            # jump moves may differ in length, so an index is drawn instead of a move
+            moves = self.current_state.get_possible_moves()
+            chosen_action = moves[self.__rng.integers(len(moves))]
             print("move\n", chosen_action)
-            act = CheckersAction(chosen_action.tolist())
+            act = CheckersAction(chosen_action)
             return act
 
         return CheckersAction([])
@@ -0,0 +1,306 @@
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .bitboard import BitboardCheckersBoard, Move, coordinates_of
+from .tablebase import DRAW, WIN, EndgameTablebase
+
+MATE = 100000
+# scores above are mates, they are stored in the transposition table relative to the node
+_MATE_BOUND = MATE - 1000
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+_MAN, _KING = 100, 160
+# every row a man advances towards promotion is worth that much
+_ADVANCE = 4
+
+
+def _byte_tables(keys: List[int]) -> Tuple[Tuple[int, ...], ...]:
+    """Returns XORs of keys of bits of every value of every byte of a 32-bit bitboard."""
+    tables = []
+    for byte in range(4):
+        table = [0] * 256
+        for value in range(1, 256):
+            low = value & -value
+            table[value] = table[value ^ low] ^ keys[8 * byte + low.bit_length() - 1]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+def _byte_sums(weights: List[int]) -> Tuple[Tuple[int, ...], ...]:
+    """Returns sums of weights of bits of every value of every byte of a 32-bit bitboard."""
+    tables = []
+    for byte in range(4):
+        table = [0] * 256
+        for value in range(1, 256):
+            low = value & -value
+            table[value] = table[value ^ low] + weights[8 * byte + low.bit_length() - 1]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+_keys = np.random.default_rng(2137).integers(0, 2**63, 4 * 32 + 1 + 2 * 12, dtype=np.int64).tolist()
+# red men, red kings, ai men, ai kings
+_ZOBRIST = tuple(_byte_tables(_keys[32 * kind:32 * (kind + 1)]) for kind in range(4))
+_SIDE = _keys[128]
+# steps without hitting of both players from -1 to 10, the draw rule depends on them
+_STEPS_KEYS = {"r": _keys[129:141], "a": _keys[141:153]}
+_ROWS = {"r": _byte_sums([coordinates_of(square)[0] for square in range(32)]),
+         "a": _byte_sums([7 - coordinates_of(square)[0] for square in range(32)])}
+
+
+def _lookup(tables: Tuple[Tuple[int, ...], ...], bitboard: int) -> Tuple[int, int, int, int]:
+    return tables[0][bitboard & 255], tables[1][bitboard >> 8 & 255], tables[2][bitboard >> 16 & 255], tables[3][bitboard >> 24]
+
+def zobrist(board: BitboardCheckersBoard, counters: bool =True) -> int:
+    """Returns Zobrist hash of a position: pieces, player to move and counters of moves without hitting.
+
+    Args:
+        board (BitboardCheckersBoard): board.
+        counters (bool, optional): flag that indicates whether or not counters of moves without hitting are hashed,
+        they are not sent by the server. Defaults to True.
+
+    Returns:
+        int: 63-bit hash.
+    """
+    key = 0
+    for tables, bitboard in zip(_ZOBRIST, (board.red & ~board.kings, board.red & board.kings, board.ai & ~board.kings, board.ai & board.kings)):
+        a, b, c, d = _lookup(tables, bitboard)
+        key ^= a ^ b ^ c ^ d
+    if not counters: return key ^ _SIDE if board.current_player == 'a' else key
+    steps = board.steps_without_hitting
+    key ^= _STEPS_KEYS["r"][min(steps["r"], 10) + 1] ^ _STEPS_KEYS["a"][min(steps["a"], 10) + 1]
+    return key ^ _SIDE if board.current_player == 'a' else key
+
+def evaluate(board: BitboardCheckersBoard) -> int:
+    """Returns static score of a position from the point of view of the player to move: material and advancement of men.
+
+    Args:
+        board (BitboardCheckersBoard): board.
+
+    Returns:
+        int: score, positive if the player to move is better.
+    """
+    kings = board.kings
+    red_men, ai_men = board.red & ~kings, board.ai & ~kings
+    score = (_MAN * (bin(red_men).count("1") - bin(ai_men).count("1"))
+             + _KING * (bin(board.red & kings).count("1") - bin(board.ai & kings).count("1"))
+             + _ADVANCE * (sum(_lookup(_ROWS["r"], red_men)) - sum(_lookup(_ROWS["a"], ai_men))))
+    return score if board.current_player == 'r' else -score
+
+def _is_capture(move: Move) -> bool:
+    return abs(coordinates_of(move[1])[0] - coordinates_of(move[0])[0]) == 2
+
+
+class _Timeout(Exception):
+    pass
+
+
+class AlphaBetaSearch:
+    """Iterative deepening negamax search with alpha-beta pruning over BitboardCheckersBoard.
+
+    Positions are hashed with Zobrist keys into a transposition table of a fixed size: an entry is replaced by a search of
+    the same or greater depth, or by any entry of a newer search. Moves are ordered by the move of the table, then by
+    count of captured pieces, then killer moves of the ply and the history heuristic. Chains of captures are searched
+    beyond the nominal depth, since captures are mandatory. The search stops when the time budget is exhausted
+    and returns the best move of the last completed depth. Positions with few pieces are scored by an endgame tablebase,
+    if it is given.
+    """
+
+    def __init__(self, table_size: int =1 << 18, max_depth: int =64, tablebase: Optional[EndgameTablebase] =None) -> None:
+        """Creates a search.
+
+        Args:
+            table_size (int, optional): count of entries of the transposition table, a power of two. Defaults to 1 << 18.
+            max_depth (int, optional): maximal depth of iterative deepening. Defaults to 64.
+            tablebase (Optional[EndgameTablebase], optional): endgame tablebase probed in positions with few pieces. Defaults to None.
+
+        Raises:
+            ValueError: if table_size is not a power of two.
+        """
+        if table_size <= 0 or table_size & (table_size - 1):
+            raise ValueError(f"Size of transposition table has to be a power of two, got: {table_size}")
+        self.max_depth = max_depth
+        self.tablebase = tablebase
+        self.table: List[Optional[Tuple[int, int, int, int, Optional[Move], int]]] = [None] * table_size
+        self.history: Dict[Tuple[int, int], int] = {}
+        self.killers: List[List[Optional[Move]]] = []
+        self.nodes = 0
+        self.depth = 0
+        self.score = 0
+        self.elapsed = 0.0
+        # count of positions of the last search scored by the tablebase
+        self.tablebase_hits = 0
+        # completed depths of the last search with their scores and best moves
+        self.iterations: List[Tuple[int, int, Move]] = []
+        # flag that indicates whether or not the last search ended before its deadline, by mate or at its maximal depth
+        self.finished = False
+        self.__mask = table_size - 1
+        self.__generation = 0
+        self.__deadline = float("inf")
+        self.__interrupted: Optional[Callable[[], bool]] = None
+        # position after the best move of the last search, hashed without counters, and the reply expected in it
+        self.__reply: Optional[Tuple[int, Move]] = None
+
+    @property
+    def nodes_per_second(self) -> float:
+        """Returns nodes per second of the last search."""
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def probe(self, board: BitboardCheckersBoard) -> Optional[Move]:
+        """Returns the best move of a position stored in the transposition table, e.g. the expected reply of the opponent.
+        The position after the best move of the last search matches whatever its counters of moves without hitting are,
+        since the server does not send them.
+
+        Args:
+            board (BitboardCheckersBoard): board.
+
+        Returns:
+            Optional[Move]: the move, None if the position is not in the table.
+        """
+        if self.__reply is not None and self.__reply[0] == zobrist(board, counters=False): return self.__reply[1]
+        key = zobrist(board)
+        entry = self.table[key & self.__mask]
+        return entry[4] if entry is not None and entry[0] == key else None
+
+    def search(self, board: BitboardCheckersBoard, budget: Optional[float] =None, max_depth: Optional[int] =None,
+               moves: Optional[List[Move]] =None, interrupted: Optional[Callable[[], bool]] =None) -> Optional[Move]:
+        """Searches the best move of the player to move.
+
+        Args:
+            board (BitboardCheckersBoard): board, it is restored after the search.
+            budget (Optional[float], optional): time in seconds. Defaults to None, that is, until max_depth.
+            max_depth (Optional[int], optional): maximal depth. Defaults to None, that is, max_depth of the search.
+            moves (Optional[List[Move]], optional): legal moves searched at the root, e.g. a share of a parallel search.
+            Defaults to None, that is, all legal moves, and a single legal move is returned without search.
+            interrupted (Optional[Callable[[], bool]], optional): stops the search like the budget when it returns True,
+            it is checked every 1024 nodes. Defaults to None.
+
+        Returns:
+            Optional[Move]: the best move, None if there are no legal moves.
+        """
+        start = perf_counter()
+        self.__deadline = float("inf") if budget is None else start + budget
+        self.__interrupted = interrupted
+        self.__generation += 1
+        self.nodes = self.depth = self.score = self.tablebase_hits = 0
+        self.iterations = []
+        self.finished = False
+        self.killers = [[None, None] for _ in range(self.max_depth + 64)]
+        forced = moves is None
+        moves = board.moves() if moves is None else moves
+        best = moves[0] if moves else None
+        try:
+            for depth in range(1, (max_depth or self.max_depth) + 1):
+                if forced and len(moves) <= 1: break
+                score, move = self.__root(board, moves, depth, best)
+                self.depth, self.score, best = depth, score, move
+                self.iterations.append((depth, score, move))
+                if abs(score) > _MATE_BOUND: break
+            self.finished = True
+        except _Timeout:
+            pass
+        finally:
+            self.elapsed = perf_counter() - start
+        self.__remember_reply(board, best)
+        return best
+
+    def __remember_reply(self, board: BitboardCheckersBoard, move: Optional[Move]):
+        """Remembers the best move of the table in the position after a move, keyed without counters of moves without hitting."""
+        self.__reply = None
+        if move is None: return
+        board.push(move)
+        try:
+            key = zobrist(board)
+            entry = self.table[key & self.__mask]
+            if entry is not None and entry[0] == key and entry[4] is not None:
+                self.__reply = (zobrist(board, counters=False), entry[4])
+        finally:
+            board.pop()
+
+    def __root(self, board: BitboardCheckersBoard, moves: List[Move], depth: int, previous: Optional[Move]) -> Tuple[int, Move]:
+        alpha, beta = -MATE - 1, MATE + 1
+        best_move = None
+        for move in sorted(moves, key=lambda move: move != previous):
+            board.push(move)
+            try:
+                score = -self.__negamax(board, depth - 1, -beta, -alpha, 1)
+            finally:
+                board.pop()
+            if score > alpha or best_move is None:
+                alpha, best_move = max(alpha, score), move
+        return alpha, best_move
+
+    def __negamax(self, board: BitboardCheckersBoard, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self.nodes += 1
+        if not self.nodes & 1023 and (perf_counter() > self.__deadline or self.__interrupted is not None and self.__interrupted()):
+            raise _Timeout()
+        steps = board.steps_without_hitting
+        if steps["r"] >= 10 and steps["a"] >= 10: return 0
+        moves = board.moves()
+        if not moves: return -MATE + ply
+        if self.tablebase is not None and bin(board.red | board.ai).count("1") <= self.tablebase.pieces:
+            value = self.__probe(board, ply)
+            if value is not None: return value
+        captures = _is_capture(moves[0])
+        if depth <= 0 and not captures: return evaluate(board)
+
+        key = zobrist(board)
+        index = key & self.__mask
+        entry = self.table[index]
+        table_move = None
+        if entry is not None and entry[0] == key:
+            table_move = entry[4]
+            if entry[1] >= depth:
+                value = entry[3] - ply if entry[3] > _MATE_BOUND else entry[3] + ply if entry[3] < -_MATE_BOUND else entry[3]
+                if entry[2] == _EXACT: return value
+                if entry[2] == _LOWER and value >= beta: return value
+                if entry[2] == _UPPER and value <= alpha: return value
+
+        original_alpha = alpha
+        best, best_move = -MATE - 1, None
+        for move in self.__ordered(moves, table_move, ply, captures):
+            board.push(move)
+            try:
+                score = -self.__negamax(board, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                board.pop()
+            if score > best: best, best_move = score, move
+            if score > alpha: alpha = score
+            if alpha >= beta:
+                if not captures and ply < len(self.killers):
+                    killers = self.killers[ply]
+                    if killers[0] != move: killers[0], killers[1] = move, killers[0]
+                    self.history[(move[0], move[-1])] = self.history.get((move[0], move[-1]), 0) + depth * depth
+                break
+
+        flag = _UPPER if best <= original_alpha else _LOWER if best >= beta else _EXACT
+        if entry is None or entry[5] != self.__generation or depth >= entry[1]:
+            stored = best + ply if best > _MATE_BOUND else best - ply if best < -_MATE_BOUND else best
+            self.table[index] = (key, depth, flag, stored, best_move, self.__generation)
+        return best
+
+    def __probe(self, board: BitboardCheckersBoard, ply: int) -> Optional[int]:
+        """Returns the score of the tablebase, None if the position is unknown or the draw by moves without hitting may come first."""
+        value = self.tablebase.probe(board)
+        if value is None: return None
+        result, distance = value
+        if result != DRAW:
+            steps = board.steps_without_hitting
+            mover, other = steps[board.current_player], steps['a' if board.current_player == 'r' else 'r']
+            # both counters have to reach 10 for the draw, the player to move makes the odd plies
+            if mover + (distance + 1) // 2 >= 10 and other + distance // 2 >= 10: return None
+        self.tablebase_hits += 1
+        if result == DRAW: return 0
+        return MATE - ply - distance if result == WIN else -MATE + ply + distance
+
+    def __ordered(self, moves: List[Move], table_move: Optional[Move], ply: int, captures: bool) -> List[Move]:
+        if len(moves) == 1: return moves
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history
+
+        def priority(move: Move) -> int:
+            if move == table_move: return 1 << 40
+            if captures: return len(move) << 32
+            if move == killers[0] or move == killers[1]: return 1 << 30
+            return history.get((move[0], move[-1]), 0)
+        return sorted(moves, key=priority, reverse=True)
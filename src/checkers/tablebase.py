@@ -0,0 +1,239 @@
+"""Endgame tablebase of checkers: distances to the end of the game of every position with few pieces, under the rules
+of CheckersBoard without the draw by moves without hitting, solved by retrograde analysis.
+
+The generator writes a single file, which bots memory-map read-only, so every process probes the same pages of the OS cache:
+
+	python -m src.checkers.tablebase --pieces 3 --output tablebases/checkers_3.bbtb
+"""
+import argparse
+import mmap
+import os
+import struct
+from itertools import combinations
+from math import comb
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .bitboard import _PROMOTION, BitboardCheckersBoard
+
+_MAGIC = b"BBTABLEB"
+_VERSION = 1
+# magic, version, maximal count of pieces, count of material signatures
+_HEADER = struct.Struct("<8sHBH")
+# counts of red men, red kings, ai men and ai kings, offset of values in file
+_ENTRY = struct.Struct("<4BQ")
+# a value is a distance in plies to the end of the game: odd distances are wins and even ones losses of the player to move
+_MAX_DISTANCE = 253
+_UNKNOWN = 254
+_DRAW = 255
+_SQUARES = range(32)
+_BINOMIALS = tuple(tuple(comb(n, k) for k in range(5)) for n in range(33))
+
+WIN, DRAW, LOSS = 1, 0, -1
+
+Signature = Tuple[int, int, int, int]
+
+
+def _groups(red: int, ai: int, kings: int) -> Tuple[int, int, int, int]:
+    return red & ~kings, red & kings, ai & ~kings, ai & kings
+
+def _rank(bitboard: int) -> int:
+    """Returns the rank of the set of squares of a bitboard among sets of the same size, in colexicographic order."""
+    rank, count = 0, 0
+    while bitboard:
+        low = bitboard & -bitboard
+        count += 1
+        rank += _BINOMIALS[low.bit_length() - 1][count]
+        bitboard ^= low
+    return rank
+
+def _size(signature: Signature) -> int:
+    size = 2
+    for count in signature: size *= _BINOMIALS[32][count]
+    return size
+
+def _index(signature: Signature, groups: Tuple[int, int, int, int], player: str) -> int:
+    index = 0
+    for count, group in zip(signature, groups):
+        index = index * _BINOMIALS[32][count] + _rank(group)
+    return 2 * index + (player == 'a')
+
+def _signature(groups: Tuple[int, int, int, int]) -> Signature:
+    return tuple(bin(group).count("1") for group in groups)
+
+
+class EndgameTablebase:
+    """Memory-mapped endgame tablebase, see build_tablebase. A probe reads a single byte of the file.
+
+    Values ignore the draw after 10 moves of both players without hitting; draws are draws under that rule as well,
+    wins and losses hold as long as the distance is shorter than the rule allows, see AlphaBetaSearch.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Maps a file of tablebase.
+
+        Args:
+            path (str): path of file written by build_tablebase.
+
+        Raises:
+            ValueError: if the file is not a tablebase of a supported version.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.pieces, count = _HEADER.unpack_from(self.__map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"File: {path} is not a checkers tablebase of version {_VERSION}")
+        self.__offsets: Dict[Signature, int] = {}
+        for position in range(_HEADER.size, _HEADER.size + count * _ENTRY.size, _ENTRY.size):
+            *signature, offset = _ENTRY.unpack_from(self.__map, position)
+            self.__offsets[tuple(signature)] = offset
+
+    def __len__(self) -> int:
+        """Returns count of material signatures."""
+        return len(self.__offsets)
+
+    def close(self):
+        self.__map.close()
+
+    def probe(self, board: BitboardCheckersBoard) -> Optional[Tuple[int, int]]:
+        """Returns the value of a position from the point of view of the player to move.
+
+        Args:
+            board (BitboardCheckersBoard): board.
+
+        Returns:
+            Optional[Tuple[int, int]]: WIN, DRAW or LOSS and distance in plies to the end of the game, None if the position is not in the tablebase.
+        """
+        groups = _groups(board.red, board.ai, board.kings)
+        signature = _signature(groups)
+        offset = self.__offsets.get(signature, None)
+        if offset is None: return None
+        value = self.__map[offset + _index(signature, groups, board.current_player)]
+        if value == _UNKNOWN: return None
+        if value == _DRAW: return DRAW, 0
+        return (WIN if value & 1 else LOSS), value
+
+
+def _signatures(pieces: int) -> List[Signature]:
+    """Returns signatures with both players on board, ordered so that captures and promotions lead to earlier ones."""
+    signatures = [(rm, rk, am, ak) for rm in range(pieces + 1) for rk in range(pieces + 1) for am in range(pieces + 1) for ak in range(pieces + 1)
+                  if 2 <= rm + rk + am + ak <= pieces and rm + rk and am + ak]
+    return sorted(signatures, key=lambda signature: (sum(signature), signature[0] + signature[2], signature))
+
+def _positions(signature: Signature) -> Iterator[Tuple[int, int, int]]:
+    """Yields bitboards of positions of a signature, men are never on their last row."""
+    red_men = [square for square in _SQUARES if not _PROMOTION["r"] >> square & 1]
+    ai_men = [square for square in _SQUARES if not _PROMOTION["a"] >> square & 1]
+    for rm in combinations(red_men, signature[0]):
+        rm = sum(1 << square for square in rm)
+        for rk in combinations(_SQUARES, signature[1]):
+            rk = sum(1 << square for square in rk)
+            if rm & rk: continue
+            for am in combinations(ai_men, signature[2]):
+                am = sum(1 << square for square in am)
+                if (rm | rk) & am: continue
+                for ak in combinations(_SQUARES, signature[3]):
+                    ak = sum(1 << square for square in ak)
+                    if (rm | rk | am) & ak: continue
+                    yield rm | rk, am | ak, rk | ak
+
+def _solve(signature: Signature, tables: Dict[Signature, bytearray]) -> bytearray:
+    """Returns values of positions of a signature, tables of signatures reached by captures and promotions are given."""
+    table = bytearray([_UNKNOWN]) * _size(signature)
+    parents: Dict[int, List[int]] = {}
+    remaining: Dict[int, int] = {}
+    # parents to update when a child of distance d is resolved, in order of distances
+    buckets: List[List[int]] = [[] for _ in range(_MAX_DISTANCE + 1)]
+    unresolved = []
+    for red, ai, kings in _positions(signature):
+        for player in "ra":
+            index = _index(signature, _groups(red, ai, kings), player)
+            board = BitboardCheckersBoard.from_bitboards(red, ai, kings, player)
+            moves = board.moves()
+            if not moves:
+                table[index] = 0
+                buckets[0].append(index)
+                continue
+            unresolved.append(index)
+            remaining[index] = len(moves)
+            for move in moves:
+                board.push(move)
+                groups = _groups(board.red, board.ai, board.kings)
+                child_signature = _signature(groups)
+                mover = board.red if board.current_player == 'r' else board.ai
+                if child_signature == signature:
+                    parents.setdefault(_index(signature, groups, board.current_player), []).append(index)
+                elif not mover:
+                    buckets[0].append(~index)
+                else:
+                    value = tables[child_signature][_index(child_signature, groups, board.current_player)]
+                    if value <= _MAX_DISTANCE: buckets[value].append(~index)
+                board.pop()
+
+    # a resolved child of this table is pushed as its index, a child of another table as the complemented index of its parent
+    for distance, bucket in enumerate(buckets):
+        child_wins = distance & 1
+        for entry in bucket:
+            for parent in (parents.get(entry, ()) if entry >= 0 else (~entry,)):
+                if table[parent] != _UNKNOWN: continue
+                if child_wins:
+                    remaining[parent] -= 1
+                    if remaining[parent]: continue
+                if distance + 1 > _MAX_DISTANCE:
+                    raise ValueError(f"Distance of a position of {signature} exceeds {_MAX_DISTANCE} plies")
+                table[parent] = distance + 1
+                buckets[distance + 1].append(parent)
+    for index in unresolved:
+        if table[index] == _UNKNOWN: table[index] = _DRAW
+    return table
+
+def build_tablebase(path: str, pieces: int =3, verbose: bool =False) -> EndgameTablebase:
+    """Solves every position with up to a count of pieces and writes the tablebase.
+
+    Args:
+        path (str): path of file, directories are created if needed.
+        pieces (int, optional): maximal count of pieces of both players. Defaults to 3.
+        verbose (bool, optional): flag that indicates whether or not progress is printed. Defaults to False.
+
+    Returns:
+        EndgameTablebase: the written tablebase.
+    """
+    tables: Dict[Signature, bytearray] = {}
+    for signature in _signatures(pieces):
+        start = perf_counter()
+        tables[signature] = _solve(signature, tables)
+        if verbose: print(f"{signature}: {len(tables[signature])} positions in {perf_counter() - start:.1f} s")
+
+    directory = os.path.dirname(path)
+    if directory: os.makedirs(directory, exist_ok=True)
+    offset = _HEADER.size + len(tables) * _ENTRY.size
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, pieces, len(tables)))
+        for signature, table in tables.items():
+            file.write(_ENTRY.pack(*signature, offset))
+            offset += len(table)
+        for table in tables.values():
+            file.write(table)
+    return EndgameTablebase(path)
+
+
+_tablebases: Dict[Tuple[int, str], EndgameTablebase] = {}
+
+def _tablebase_of_process(path: str) -> EndgameTablebase:
+    """Returns the tablebase of a file mapped once by the current process."""
+    key = (os.getpid(), path)
+    tablebase = _tablebases.get(key, None)
+    if tablebase is None:
+        tablebase = _tablebases[key] = EndgameTablebase(path)
+    return tablebase
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pieces", type=int, default=3, help="maximal count of pieces of both players")
+    parser.add_argument("--output", default="tablebases/checkers_3.bbtb")
+    args = parser.parse_args()
+    start = perf_counter()
+    tablebase = build_tablebase(args.output, args.pieces, verbose=True)
+    print(f"Wrote {len(tablebase)} signatures to {args.output} in {perf_counter() - start:.1f} s")
@@ -0,0 +1,6 @@
+from ._game import Game
+from ._agarnt import AgarntGame
+from ._checkers import CheckersGame, initial_board
+from ._server import LocalServer
+
+__all__ = [Game, AgarntGame, CheckersGame, LocalServer, initial_board]
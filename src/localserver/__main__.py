@@ -0,0 +1,33 @@
+"""Runs the local stand-in of the botbattles server.
+
+	python -m src.localserver --port 2137 --http-port 5000 --tick-rate 20 --board 1000 1000 --food 200 --players 10
+"""
+import argparse
+import os
+from functools import partial
+
+from ..base.codec import GzipCodec
+from ._server import LocalServer
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+	parser.add_argument("--host", default="127.0.0.1")
+	parser.add_argument("--port", type=int, default=int(os.environ.get("WS_PORT", 2137)))
+	parser.add_argument("--http-port", type=int, default=int(os.environ.get("PORT", 5000)))
+	parser.add_argument("--tick-rate", type=float, default=20.0)
+	parser.add_argument("--board", type=int, nargs=2, default=(1000, 1000), help="size of agarnt board")
+	parser.add_argument("--food", type=int, default=200, help="count of food in agarnt games")
+	parser.add_argument("--players", type=int, default=0, help="count of players simulated by server in agarnt games")
+	parser.add_argument("--level", type=int, default=1, help="gzip level of frames")
+	parser.add_argument("--game", action="append", nargs=2, metavar=("NAME", "TYPE"), default=[], help="game created at start")
+	args = parser.parse_args()
+
+	server = LocalServer(args.port, args.http_port, args.host, args.tick_rate, args.board, args.food, args.players, partial(GzipCodec, args.level))
+	server.start()
+	server.wait_ready()
+	print(f"Serving on ws://{args.host}:{args.port} and http://{args.host}:{args.http_port}")
+	for name, game_type in args.game:
+		print(f"Created {game_type} game {name}: {server.create_game(name, game_type)}")
+	try:
+		server.join()
+	except KeyboardInterrupt: ...
@@ -0,0 +1,123 @@
+from math import hypot
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ._game import Game
+
+_DIRECTIONS = {"L": (-1.0, 0.0), "R": (1.0, 0.0), "D": (0.0, -1.0), "U": (0.0, 1.0)}
+
+
+class _Player:
+	__slots__ = ("name", "x", "y", "r", "dx", "dy", "alive")
+
+	def __init__(self, name: str, x: float, y: float, r: float) -> None:
+		self.name, self.x, self.y, self.r = name, x, y, r
+		self.dx = self.dy = 0.0
+		self.alive = True
+
+	def encode(self) -> Dict[str, Any]:
+		return {"n": self.name, "x": int(self.x), "y": int(self.y), "r": int(self.r)}
+
+
+class AgarntGame(Game):
+	"""Simplified agarnt: players move in directions chosen by bots, eat food and smaller players.
+
+	A state sent to a player consists of the player "p", other living players "ps", food "f", size of board "b",
+	time of tick "delta" and the flag "d" that tells whether or not the player has been eaten.
+	"""
+
+	game_type = "agarnt"
+
+	def __init__(self, name: str, board: Sequence[int] =(1000, 1000), food: int =200, players: int =0,
+				 radius: float =10.0, speed: float =200.0, food_radius: float =3.0, seed: Optional[int] =None) -> None:
+		"""Creates a game.
+
+		Args:
+			name (str): name of game.
+			board (Sequence[int], optional): width and height of board, "b". Defaults to (1000, 1000).
+			food (int, optional): count of food kept on board, "f". Defaults to 200.
+			players (int, optional): count of players simulated by server, they are visible in "ps" of bots. Defaults to 0.
+			radius (float, optional): initial radius of player. Defaults to 10.0.
+			speed (float, optional): distance per second covered by a player of initial radius, bigger players are slower. Defaults to 200.0.
+			food_radius (float, optional): radius of food, eating food increases area of player by its area. Defaults to 3.0.
+			seed (Optional[int], optional): seed of random generator. Defaults to None.
+		"""
+		super().__init__(name)
+		self.board = [int(board[0]), int(board[1])]
+		self.radius = radius
+		self.speed = speed
+		self.food_radius = food_radius
+		self.rng = np.random.default_rng(seed)
+		self.food = self.__random_positions(food)
+		self.__food: List[List[int]] = self.food.tolist()
+		self.bodies: Dict[str, _Player] = {}
+		self.delta = 0.0
+		self.npcs = [f"npc_{num}" for num in range(players)]
+		for npc in self.npcs:
+			self._add_player(npc)
+
+	def __random_positions(self, count: int) -> np.ndarray:
+		return np.column_stack((self.rng.integers(0, self.board[0], count), self.rng.integers(0, self.board[1], count)))
+
+	def _add_player(self, player_name: str) -> bool:
+		x, y = self.__random_positions(1)[0]
+		self.bodies[player_name] = _Player(player_name, float(x), float(y), self.radius)
+		return True
+
+	def apply(self, player_name: str, action: Dict[str, Any]) -> bool:
+		body = self.bodies.get(player_name, None)
+		directions = action.get("directions", None) if isinstance(action, dict) else None
+		if body is None or not isinstance(directions, dict): return False
+
+		dx = sum(_DIRECTIONS[key][0] for key, active in directions.items() if active and key in _DIRECTIONS)
+		dy = sum(_DIRECTIONS[key][1] for key, active in directions.items() if active and key in _DIRECTIONS)
+		norm = (dx * dx + dy * dy) ** 0.5
+		body.dx, body.dy = (dx / norm, dy / norm) if norm else (0.0, 0.0)
+		return True
+
+	def __steer_npcs(self):
+		for npc in self.npcs:
+			body = self.bodies[npc]
+			if not body.alive:
+				self._add_player(npc)
+			elif self.rng.random() < 0.1:
+				angle = self.rng.uniform(0, 2 * np.pi)
+				body.dx, body.dy = float(np.cos(angle)), float(np.sin(angle))
+
+	def step(self, delta: float):
+		self.delta = delta
+		self.__steer_npcs()
+		living = [body for body in self.bodies.values() if body.alive]
+
+		for body in living:
+			speed = self.speed * (self.radius / body.r) ** 0.5 * delta
+			body.x = min(max(body.x + body.dx * speed, 0.0), self.board[0])
+			body.y = min(max(body.y + body.dy * speed, 0.0), self.board[1])
+
+			if len(self.food):
+				eaten = np.hypot(self.food[:, 0] - body.x, self.food[:, 1] - body.y) < body.r
+				count = int(eaten.sum())
+				if count:
+					body.r = (body.r ** 2 + count * self.food_radius ** 2) ** 0.5
+					self.food[eaten] = self.__random_positions(count)
+
+		for hunter in living:
+			for prey in living:
+				if prey is hunter or not hunter.alive or not prey.alive or hunter.r <= 1.1 * prey.r: continue
+				if hypot(hunter.x - prey.x, hunter.y - prey.y) < hunter.r:
+					hunter.r = (hunter.r ** 2 + prey.r ** 2) ** 0.5
+					prey.alive = False
+		self.__food = self.food.tolist()
+		self.version += 1
+
+	def state_for(self, player_name: str) -> Dict[str, Any]:
+		body = self.bodies.get(player_name, None)
+		return {
+			"p": body.encode() if body else {},
+			"ps": [other.encode() for other in self.bodies.values() if other is not body and other.alive],
+			"f": self.__food,
+			"b": self.board,
+			"delta": self.delta,
+			"d": bool(body and not body.alive),
+		}
@@ -0,0 +1,69 @@
+from typing import Any, Dict
+
+from ..checkers.checkers_board import CheckersBoard, initial_board
+from ._game import Game
+
+_SEATS = ("r", "a")
+
+
+class CheckersGame(Game):
+	"""Checkers of two players with rules of CheckersBoard, other clients join as spectators.
+
+	A state sent to a client consists of "board", the current "player", "last_move", "game_status" (waiting, playing,
+	won, lost or draw from the point of view of the client) and the flag "your_move".
+	"""
+
+	game_type = "checkers"
+
+	def __init__(self, name: str, size: int =8) -> None:
+		"""Creates a game.
+
+		Args:
+			name (str): name of game.
+			size (int, optional): size of board. Defaults to 8.
+		"""
+		super().__init__(name)
+		self.board = CheckersBoard({"board": initial_board(size), "player": _SEATS[0], "last_move": [],
+									"game_status": "waiting", "your_move": False})
+		self.seats: Dict[str, str] = {}
+		self.winner = None
+
+	def _add_player(self, player_name: str) -> bool:
+		if len(self.seats) >= len(_SEATS): return False
+		self.seats[player_name] = _SEATS[len(self.seats)]
+		return True
+
+	@property
+	def status(self) -> str:
+		"""Returns status of the game: waiting, playing or finished.
+
+		Returns:
+			str: status of the game.
+		"""
+		if self.winner: return "finished"
+		return "playing" if len(self.seats) == len(_SEATS) else "waiting"
+
+	def apply(self, player_name: str, action: Dict[str, Any]) -> bool:
+		move = action.get("move", None) if isinstance(action, dict) else None
+		if self.status != "playing" or self.seats.get(player_name, None) != self.board.current_player: return False
+		if not move or move not in self.board.get_possible_moves(): return False
+
+		self.board = self.board.make_move(move)
+		self.winner = self.board.get_win()
+		self.version += 1
+		return True
+
+	def step(self, delta: float):
+		...
+
+	def state_for(self, player_name: str) -> Dict[str, Any]:
+		seat, status = self.seats.get(player_name, None), self.status
+		if status == "finished":
+			status = "draw" if self.winner == "remis" else "won" if self.winner == seat else "lost" if seat else "finished"
+		return {
+			"board": self.board.board,
+			"player": self.board.current_player,
+			"last_move": self.board.last_move,
+			"game_status": status,
+			"your_move": status == "playing" and seat == self.board.current_player
+		}
@@ -0,0 +1,88 @@
+import abc
+from typing import Any, Dict, List
+
+
+class Game(metaclass=abc.ABCMeta):
+	"""Abstract class of a game simulated by the local server. Every change of the game increments its version,
+	so the server sends a new state to a player only if the game has changed since the last sent state.
+	"""
+
+	game_type = ""
+
+	def __init__(self, name: str) -> None:
+		self.name = name
+		self.version = 0
+		self.players: List[str] = []
+		self.spectators: List[str] = []
+
+	def join(self, player_name: str, spectator: bool =False) -> bool:
+		"""Joins a player or a spectator. A player of the same name that joins again resumes its place.
+
+		Args:
+			player_name (str): name of player.
+			spectator (bool, optional): flag that indicates whether or not the client only watches the game. Defaults to False.
+
+		Returns:
+			bool: True if the client has joined.
+		"""
+		if spectator:
+			self.spectators.append(player_name)
+		elif player_name not in self.players:
+			if not self._add_player(player_name): return False
+			self.players.append(player_name)
+		self.version += 1
+		return True
+
+	def info(self) -> Dict[str, Any]:
+		"""Returns description of the game served on /games/{session_id}.
+
+		Returns:
+			Dict[str, Any]: name and type of game and names of players.
+		"""
+		return {"name": self.name, "game_type": self.game_type, "players": list(self.players), "spectators": len(self.spectators)}
+
+	@abc.abstractmethod
+	def _add_player(self, player_name: str) -> bool:
+		"""Adds a player to the game.
+
+		Args:
+			player_name (str): name of player.
+
+		Returns:
+			bool: True if there is a place for the player.
+		"""
+		...
+
+	@abc.abstractmethod
+	def apply(self, player_name: str, action: Dict[str, Any]) -> bool:
+		"""Applies an action sent by a player.
+
+		Args:
+			player_name (str): name of player.
+			action (Dict[str, Any]): decoded action.
+
+		Returns:
+			bool: True if the action is valid.
+		"""
+		...
+
+	@abc.abstractmethod
+	def step(self, delta: float):
+		"""Advances the game by one tick.
+
+		Args:
+			delta (float): time of tick in seconds.
+		"""
+		...
+
+	@abc.abstractmethod
+	def state_for(self, player_name: str) -> Dict[str, Any]:
+		"""Returns the state of game seen by a player or a spectator.
+
+		Args:
+			player_name (str): name of player.
+
+		Returns:
+			Dict[str, Any]: state sent to the client.
+		"""
+		...
@@ -0,0 +1,234 @@
+import asyncio
+import secrets
+import threading
+from functools import partial
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import orjson
+import websockets
+from websockets.legacy.server import WebSocketServerProtocol
+
+from ..base.codec import Codec, GzipCodec
+from .. import _logger
+from ._game import Game
+from ._agarnt import AgarntGame
+from ._checkers import CheckersGame
+
+
+class _Client:
+	"""Connection of a player or a spectator. Only the newest state waits to be sent, so a slow client does not delay others.
+	Every client has its own codec, states are encoded only when they are sent, so a codec that keeps the state
+	of compression stream never encodes a frame that is not delivered.
+	"""
+
+	def __init__(self, name: str, websocket: WebSocketServerProtocol, spectator: bool, codec: Codec) -> None:
+		self.name = name
+		self.websocket = websocket
+		self.spectator = spectator
+		self.codec = codec
+		self.version = -1
+		self.state: Optional[Any] = None
+		self.ready = asyncio.Event()
+
+	def offer(self, state: Any):
+		self.state = state
+		self.ready.set()
+
+	async def send_states(self):
+		while True:
+			await self.ready.wait()
+			self.ready.clear()
+			state, self.state = self.state, None
+			await self.websocket.send(self.codec.encode(state))
+
+
+class _Session:
+
+	def __init__(self, session_id: str, game: Game) -> None:
+		self.session_id = session_id
+		self.game = game
+		self.clients: List[_Client] = []
+		self.task: Optional[asyncio.Task] = None
+
+
+class LocalServer(threading.Thread):
+	"""Local stand-in of the botbattles server. It serves the same endpoints and frames as the public server:
+	websocket endpoints /create_game?name=&type= and /join_to_game?player_name=&session_id=&is_spectator=,
+	states and actions encoded by the wire codec (gzip and JSON by default), and HTTP endpoints /games and /games/{session_id}
+	on both ports. Games are simulated on a single event-loop run by a daemon thread.
+	"""
+
+	def __init__(self, port: int =2137, http_port: Optional[int] =5000, host: str ="127.0.0.1", tick_rate: float =20.0,
+				 board: Sequence[int] =(1000, 1000), food: int =200, players: int =0,
+				 codec_factory: Optional[Callable[[], Codec]] =None, seed: Optional[int] =None) -> None:
+		"""Creates a server, it starts serving after start method is called.
+
+		Args:
+			port (int, optional): port of websocket endpoints. Defaults to 2137.
+			http_port (Optional[int], optional): port of HTTP endpoints, they are available on the websocket port too. Defaults to 5000.
+			host (str, optional): address to bind. Defaults to "127.0.0.1".
+			tick_rate (float, optional): count of ticks of agarnt games per second. Defaults to 20.0.
+			board (Sequence[int], optional): size of agarnt board, "b". Defaults to (1000, 1000).
+			food (int, optional): count of food in agarnt games, "f". Defaults to 200.
+			players (int, optional): count of players simulated by server in every agarnt game, they are visible in "ps". Defaults to 0.
+			codec_factory (Optional[Callable[[], Codec]], optional): function that creates a wire codec of states and actions,
+			it is called for every connection. Defaults to GzipCodec with level 1.
+			seed (Optional[int], optional): seed of games. Defaults to None.
+		"""
+		super().__init__(daemon=True)
+		self.port = port
+		self.http_port = http_port
+		self.host = host
+		self.tick_rate = tick_rate
+		self.codec_factory = codec_factory if codec_factory is not None else partial(GzipCodec, 1)
+		self.actions = 0
+		self.invalid_actions = 0
+		self.connections = 0
+		self.sessions: Dict[str, _Session] = {}
+		self.games: Dict[str, Callable[[str], Game]] = {
+			"agarnt": lambda name: AgarntGame(name, board, food, players, seed=seed),
+			"checkers": lambda name: CheckersGame(name)
+		}
+		self._loop: Optional[asyncio.AbstractEventLoop] = None
+		self._ready = threading.Event()
+
+	def create_game(self, name: str, game_type: str) -> str:
+		"""Creates a new session of game. It may be called from any thread.
+
+		Args:
+			name (str): name of game.
+			game_type (str): type of game, e.g. "agarnt" or "checkers".
+
+		Raises:
+			ValueError: if type of game is unknown.
+
+		Returns:
+			str: session identifier.
+		"""
+		if game_type not in self.games:
+			raise ValueError(f"Unknown type of game: {game_type}, available types: {sorted(self.games)}")
+		session = _Session(f"session_{secrets.token_hex(8)}", self.games[game_type](name))
+		self.sessions[session.session_id] = session
+		self._loop.call_soon_threadsafe(self.__start_ticking, session)
+		return session.session_id
+
+	def __start_ticking(self, session: _Session):
+		session.task = self._loop.create_task(self.__tick(session))
+
+	async def __tick(self, session: _Session):
+		delta = 1.0 / self.tick_rate
+		while True:
+			session.game.step(delta)
+			self.__publish(session)
+			await asyncio.sleep(delta)
+
+	def __publish(self, session: _Session):
+		"""Offers the current state to every client that has not obtained it yet."""
+		game = session.game
+		for client in session.clients:
+			if client.version != game.version:
+				client.version = game.version
+				client.offer(game.state_for(client.name))
+
+	async def __process_request(self, path: str, request_headers) -> Optional[Tuple[HTTPStatus, List[Tuple[str, str]], bytes]]:
+		"""Serves HTTP endpoints, other requests continue the websocket handshake."""
+		url = urlparse(path)
+		parts = url.path.strip("/").split("/")
+		if parts[0] != "games" or len(parts) > 2: return None
+
+		if len(parts) == 1:
+			body = {session_id: session.game.info() for session_id, session in self.sessions.items()}
+		elif parts[1] in self.sessions:
+			body = {"session_id": parts[1], **self.sessions[parts[1]].game.info()}
+		else:
+			return HTTPStatus.NOT_FOUND, [("Content-Type", "application/json")], orjson.dumps({"error": "unknown session"})
+		return HTTPStatus.OK, [("Content-Type", "application/json")], orjson.dumps(body)
+
+	async def __serve(self, websocket: WebSocketServerProtocol, path: str):
+		url = urlparse(path)
+		query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+		if url.path == "/create_game":
+			try:
+				await websocket.send(self.create_game(query.get("name", ""), query.get("type", "")))
+			except ValueError as e:
+				await websocket.close(4000, str(e))
+			return
+
+		session = self.sessions.get(query.get("session_id", ""), None) if url.path == "/join_to_game" else None
+		if session is None:
+			await websocket.close(4004, "unknown endpoint or session")
+			return
+		name, spectator = query.get("player_name", ""), query.get("is_spectator", "False") == "True"
+		if not session.game.join(name, spectator):
+			await websocket.close(4003, "there is no place for a player")
+			return
+
+		client = _Client(name, websocket, spectator, self.codec_factory())
+		session.clients.append(client)
+		self.connections += 1
+		sender = asyncio.ensure_future(client.send_states())
+		self.__publish(session)
+		try:
+			async for message in websocket:
+				self.actions += 1
+				if spectator or not self.__apply(session, client, message):
+					self.invalid_actions += 1
+		except websockets.ConnectionClosed: pass
+		finally:
+			sender.cancel()
+			session.clients.remove(client)
+
+	def __apply(self, session: _Session, client: _Client, message: Any) -> bool:
+		try:
+			action = client.codec.decode(message)
+		except Exception as e:
+			_logger.info(f"Unable to decode an action of {client.name}: {e}")
+			return False
+		if not session.game.apply(client.name, action): return False
+		self.__publish(session)
+		return True
+
+	def run(self):
+		self._loop = asyncio.new_event_loop()
+		asyncio.set_event_loop(self._loop)
+		ports = [self.port] + ([self.http_port] if self.http_port and self.http_port != self.port else [])
+		servers = [self._loop.run_until_complete(websockets.serve(self.__serve, self.host, port, process_request=self.__process_request))
+				   for port in ports]
+		self._ready.set()
+		try:
+			self._loop.run_forever()
+		finally:
+			for session in self.sessions.values():
+				if session.task: session.task.cancel()
+			for server in servers:
+				server.close()
+				self._loop.run_until_complete(server.wait_closed())
+			self._loop.close()
+
+	def wait_ready(self, timeout: float =5.0) -> bool:
+		"""Waits until the server accepts connections.
+
+		Args:
+			timeout (float, optional): maximal time to wait. Defaults to 5.0.
+
+		Returns:
+			bool: True if the server is ready.
+		"""
+		return self._ready.wait(timeout)
+
+	def drop_connections(self):
+		"""Drops all connections without closing handshake, like a reset of network.
+		"""
+		def drop():
+			for session in self.sessions.values():
+				for client in session.clients:
+					client.websocket.transport.abort()
+		self._loop.call_soon_threadsafe(drop)
+
+	def stop(self):
+		"""Stops the event-loop of server.
+		"""
+		self._loop.call_soon_threadsafe(self._loop.stop)
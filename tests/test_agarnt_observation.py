@@ -0,0 +1,90 @@
+import threading
+import unittest
+import numpy as np
+from src import AgarntAction, AgarntObservation, AgarntStateUpdater, CloseFoodAgent
+from src.agarnt.observation import _food_codes
+from src.base.replay import _unwrapped
+
+
+def state(food, players=(), player=(50, 50, 10), dead=False):
+    return {"p": {"n": "bot", "x": player[0], "y": player[1], "r": player[2]},
+            "ps": [{"n": f"p{i}", "x": x, "y": y, "r": r} for i, (x, y, r) in enumerate(players)],
+            "f": [list(f) for f in food], "b": [100, 100], "delta": 0.05, "d": dead}
+
+
+class TestAgarntObservation(unittest.TestCase):
+
+    def test_state_is_converted_into_arrays(self):
+        observation = AgarntObservation().update(state([(1, 2), (3, 4)], [(10, 20, 5), (30, 40, 15)]))
+
+        np.testing.assert_array_equal(observation.food, [[1, 2], [3, 4]])
+        np.testing.assert_array_equal(observation.players_xy, [[10, 20], [30, 40]])
+        np.testing.assert_array_equal(observation.players_r, [5, 15])
+        self.assertListEqual(observation.players_names, ["p0", "p1"])
+        self.assertEqual((observation.x, observation.y, observation.r, observation.board), (50, 50, 10, (100, 100)))
+        self.assertFalse(observation["d"])
+
+    def test_buffers_are_reused_and_grow_if_needed(self):
+        observation = AgarntObservation(food_capacity=4)
+        buffer = observation.update(state([(1, 2)] * 3)).food.base
+        self.assertIs(observation.update(state([(5, 6)] * 4)).food.base, buffer)
+
+        observation.update(state([(7, 8)] * 5))
+
+        self.assertEqual(observation.food.shape, (5, 2))
+        self.assertIsNot(observation.food.base, buffer)
+        self.assertEqual(len(observation.update(state([])).food), 0)
+
+    def test_food_codes_of_negative_and_fractional_positions(self):
+        food = np.array([(0, -1), (-1, 0), (-1, -1), (0, 0), (2**31 - 1, -2**31)], dtype=np.int64)
+        self.assertEqual(len(set(_food_codes(food).tolist())), len(food))
+        with self.assertRaises(ValueError):
+            _food_codes(np.array([(2**31, 0)], dtype=np.int64))
+
+        observation = AgarntObservation(incremental=True).update(state([(0, -1), (-1, 0), (1.0, 2.0)]))
+        self.assertEqual(int(observation.food_slots.alive.sum()), 3)
+        with self.assertRaises(ValueError):
+            observation.update(state([(1.5, 2)]))
+
+    def test_columnar_updater_merges_states(self):
+        updater = AgarntStateUpdater({}, columnar=True)
+        updater(state([(1, 2)]))
+
+        observation = updater({"f": [[3, 4], [5, 6]], "d": True})
+
+        self.assertIsInstance(observation, AgarntObservation)
+        np.testing.assert_array_equal(observation.food, [[3, 4], [5, 6]])
+        self.assertEqual(observation.x, 50)
+        self.assertTrue(observation.dead)
+        self.assertIsInstance(AgarntStateUpdater({})(state([])), dict)
+
+    def test_update_waits_for_readers_holding_lock(self):
+        observation = AgarntObservation().update(state([(1, 2)] * 3, [(10, 20, 5)] * 3))
+        updater = threading.Thread(target=observation.update, args=(state([(3, 4)] * 9, [(30, 40, 15)] * 9),), daemon=True)
+        with observation.lock:
+            updater.start()
+            updater.join(0.1)
+            self.assertTrue(updater.is_alive())
+            self.assertEqual((len(observation.food), len(observation.players_xy), len(observation.players_r)), (3, 3, 3))
+        updater.join()
+        self.assertEqual((len(observation.food), len(observation.players_xy), len(observation.players_r)), (9, 9, 9))
+
+
+class TestCloseFoodAgent(unittest.TestCase):
+
+    def decide(self, msg):
+        agent = CloseFoodAgent(np.random.default_rng(2137))
+        _unwrapped(agent, "handle_new_states")(msg)
+        return _unwrapped(agent, "choose_action")()
+
+    def test_goes_to_the_nearest_food(self):
+        self.assertEqual(self.decide(state([(90, 90), (40, 60)])), AgarntAction.LU)
+
+    def test_prefers_smaller_player_unless_food_is_much_closer(self):
+        players = [(60, 50, 5), (52, 50, 20)]
+        self.assertEqual(self.decide(state([(50, 30)], players)), AgarntAction.R)
+        self.assertEqual(self.decide(state([(50, 45)], players)), AgarntAction.D)
+
+    def test_accepts_columnar_observations(self):
+        observation = AgarntStateUpdater({}, columnar=True)(state([(50, 10)]))
+        self.assertEqual(self.decide(observation), AgarntAction.D)
@@ -0,0 +1,103 @@
+import threading
+import unittest
+import numpy as np
+from src import AgarntObservation, CloseFoodAgent
+from src.agarnt.close_food_agent import _batcher_of_process, close_food_direction, close_food_directions
+from src.base._batching import _MicroBatcher
+from src.base.replay import _unwrapped
+
+
+def random_state(rng, food, players):
+    return {"p": {"n": "bot", "x": int(rng.integers(50)), "y": int(rng.integers(50)), "r": int(rng.integers(5, 20))},
+            "ps": [{"n": f"p{i}", "x": int(rng.integers(50)), "y": int(rng.integers(50)), "r": int(rng.integers(5, 20))}
+                   for i in range(players)],
+            "f": rng.integers(0, 50, (food, 2)).tolist(), "b": [50, 50], "delta": 0.05, "d": False}
+
+
+class TestCloseFoodDirections(unittest.TestCase):
+
+    def test_batch_equals_single_decisions(self):
+        rng = np.random.default_rng(2137)
+        for _ in range(100):
+            observations = [AgarntObservation().update(random_state(rng, int(rng.integers(0, 20)), int(rng.integers(0, 6))))
+                            for _ in range(int(rng.integers(2, 8)))]
+            self.assertListEqual(close_food_directions(observations), [close_food_direction(o) for o in observations])
+
+    def test_empty_observations_have_no_direction(self):
+        rng = np.random.default_rng(1)
+        observations = [AgarntObservation().update(random_state(rng, 0, 0)) for _ in range(3)]
+        self.assertListEqual(close_food_directions(observations), [None] * 3)
+
+
+class TestMicroBatcher(unittest.TestCase):
+
+    def run_members(self, batcher, items):
+        results = [None] * len(items)
+        def submit(i):
+            try:
+                results[i] = batcher(items[i])
+            except ValueError as e:
+                results[i] = e
+        for _ in items: batcher.join()
+        threads = [threading.Thread(target=submit, args=(i,)) for i in range(len(items))]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join(5)
+        return results
+
+    def test_items_of_all_members_are_evaluated_together(self):
+        batches = []
+        def evaluate(items):
+            batches.append(len(items))
+            return [item * 2 for item in items]
+        batcher = _MicroBatcher(evaluate, max_delay=5)
+
+        self.assertListEqual(self.run_members(batcher, list(range(8))), [i * 2 for i in range(8)])
+        self.assertListEqual(batches, [8])
+        self.assertEqual((batcher.batches, batcher.items), (1, 8))
+
+    def test_error_is_raised_in_every_member(self):
+        def evaluate(items):
+            raise ValueError("evaluation failed")
+        results = self.run_members(_MicroBatcher(evaluate, max_delay=5), [1, 2, 3])
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    def test_leader_does_not_wait_longer_than_delay(self):
+        batcher = _MicroBatcher(lambda items: items, max_delay=0.01)
+        batcher.join()
+        batcher.join()
+        self.assertEqual(batcher(1), 1)
+
+    def test_batched_agents_choose_the_same_actions(self):
+        rng = np.random.default_rng(7)
+        states = [random_state(rng, 10, 3) for _ in range(4)]
+        actions = []
+        for batched in (False, True):
+            agents = [CloseFoodAgent(np.random.default_rng(i), batched=batched, batch_delay=5) for i in range(4)]
+            for agent, state in zip(agents, states):
+                _unwrapped(agent, "handle_new_states")(state)
+            chosen = [None] * 4
+            def choose(i):
+                chosen[i] = _unwrapped(agents[i], "choose_action")()
+            threads = [threading.Thread(target=choose, args=(i,)) for i in range(4)]
+            for thread in threads: thread.start()
+            for thread in threads: thread.join(5)
+            actions.append([action.encode() for action in chosen])
+            del agents
+        self.assertListEqual(actions[0], actions[1])
+
+    def test_done_and_closed_agents_leave_the_batch(self):
+        batcher = _batcher_of_process(5)
+        members = batcher.members
+        first, second = CloseFoodAgent(np.random.default_rng(0), batched=True, batch_delay=5), CloseFoodAgent(np.random.default_rng(1), batched=True, batch_delay=5)
+        self.assertEqual(batcher.members, members + 2)
+        first.close()
+        first.close()
+        self.assertEqual(batcher.members, members + 1)
+
+        state = random_state(np.random.default_rng(3), 10, 3)
+        state["d"] = True
+        _unwrapped(second, "handle_new_states")(state)
+        _unwrapped(second, "choose_action")()
+        self.assertEqual(batcher.members, members)
+        del first, second
+        self.assertEqual(batcher.members, members)
@@ -0,0 +1,136 @@
+import unittest
+from functools import partial
+from time import perf_counter, sleep
+import numpy as np
+import src
+from src import spawn_bots, RandomAgent, ZlibCodec, register_codec, _set_var
+from src.localserver import LocalServer
+from src.base._utils import _plan_shards, _MAX_POOL_SIZE
+
+class TestBotsManager(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        _set_var("game_type", "agarnt")
+        cls.server = LocalServer(port=2150, http_port=None, tick_rate=20)
+        cls.server.start()
+        cls.server.wait_ready()
+        cls.session_id = cls.server.create_game("test_bots_manager", "agarnt")
+
+    def teardown_time(self, count: int, bots_per_process: int =1):
+        connections = self.server.connections
+        manager = spawn_bots(f"ws://127.0.0.1:{self.server.port}", self.session_id, RandomAgent, count,
+                             bots_per_process=bots_per_process, generator=np.random.default_rng(2137))
+        for _ in range(100):
+            if self.server.connections - connections >= count: break
+            sleep(0.05)
+        self.assertEqual(self.server.connections - connections, count)
+
+        start = perf_counter()
+        self.assertListEqual(manager.terminate(5), [])
+        return perf_counter() - start
+
+    def test_teardown_time_does_not_grow_with_count_of_bots(self):
+        few, many = self.teardown_time(2), self.teardown_time(16)
+
+        self.assertLess(many, 2.0)
+        self.assertLess(many, few + 1.0)
+
+    def test_teardown_of_bots_sharing_a_process(self):
+        self.assertLess(self.teardown_time(8, bots_per_process=4), 2.0)
+
+    def test_summary_reports_connected_bots_and_actions(self):
+        manager = spawn_bots(f"ws://127.0.0.1:{self.server.port}", self.session_id, RandomAgent, 6,
+                             bots_per_process=None, generator=np.random.default_rng(2137))
+        sleep(1.0)
+        self.assertListEqual(manager.terminate(5), [])
+
+        summary = manager.summary()
+        self.assertEqual(summary["requested_bots"], 6)
+        self.assertEqual(summary["connected_bots"], 6)
+        self.assertEqual(summary["connection_success_rate"], 1.0)
+        self.assertGreater(summary["actions_per_second"], 0.0)
+        self.assertGreater(summary["bot_cost"], 0.0)
+
+    def test_bots_resume_dropped_connections(self):
+        connections = self.server.connections
+        manager = spawn_bots(f"ws://127.0.0.1:{self.server.port}", self.session_id, RandomAgent, 2,
+                             bots_per_process=2, generator=np.random.default_rng(2137))
+        for _ in range(100):
+            if self.server.connections - connections >= 2: break
+            sleep(0.05)
+
+        self.server.drop_connections()
+        for _ in range(100):
+            if self.server.connections - connections >= 4: break
+            sleep(0.05)
+        sleep(0.2)
+        self.assertListEqual(manager.terminate(5), [])
+
+        summary = manager.summary()
+        self.assertEqual(summary["connected_bots"], 2)
+        self.assertEqual(summary["reconnects"], 2)
+
+    def test_resumed_connections_start_new_compression_streams(self):
+        server = LocalServer(port=2151, http_port=None, tick_rate=20, codec_factory=partial(ZlibCodec, stream=True))
+        server.start()
+        server.wait_ready()
+        session_id = server.create_game("test_stream_resume", "agarnt")
+        register_codec("agarnt", ZlibCodec, stream=True)
+        try:
+            manager = spawn_bots(f"ws://127.0.0.1:{server.port}", session_id, RandomAgent, 2,
+                                 bots_per_process=2, generator=np.random.default_rng(2137))
+            for _ in range(100):
+                if server.connections >= 2 and server.actions > 0: break
+                sleep(0.05)
+
+            server.drop_connections()
+            for _ in range(100):
+                if server.connections >= 4: break
+                sleep(0.05)
+            resumed = server.actions
+            sleep(0.5)
+            self.assertListEqual(manager.terminate(5), [])
+        finally:
+            src._CODECS.pop("agarnt", None)
+            server.stop()
+
+        # both directions of resumed connections are decoded: bots obtain states and the server their actions
+        self.assertEqual(server.connections, 4)
+        self.assertGreater(server.actions, resumed)
+        self.assertEqual(server.invalid_actions, 0)
+
+    def test_stats_aggregate_histograms_of_running_bots(self):
+        manager = spawn_bots(f"ws://127.0.0.1:{self.server.port}", self.session_id, RandomAgent, 4,
+                             bots_per_process=2, generator=np.random.default_rng(2137))
+        sleep(1.0)
+        stats, first = manager.stats(), manager.stats([0])
+        manager.terminate(5)
+
+        for stage in ("recv", "decode", "handle", "choose_action", "encode", "send", "decision"):
+            self.assertGreater(stats[f"{stage}_count"], 0, stage)
+            self.assertLessEqual(stats[f"{stage}_p50_ms"], stats[f"{stage}_p99_ms"])
+        self.assertLess(first["decode_count"], stats["decode_count"])
+
+
+class TestPlanShards(unittest.TestCase):
+
+    def test_every_bot_is_planned_once(self):
+        for count, bots_per_process in [(1, 1), (5000, 1), (5000, 7), (999, None)]:
+            with self.subTest(count=count, bots_per_process=bots_per_process):
+                pools = _plan_shards(count, bots_per_process, cores=4)
+                ids = [int_id for pool in pools for process in pool for int_id in process]
+
+                self.assertListEqual(ids, list(range(count)))
+                self.assertTrue(all(len(pool) <= _MAX_POOL_SIZE for pool in pools))
+
+    def test_processes_are_bounded_by_cores(self):
+        pools = _plan_shards(1000, None, cores=4)
+
+        self.assertEqual(sum(len(pool) for pool in pools), 8)
+
+    def test_costly_bots_get_more_processes(self):
+        pools = _plan_shards(1000, None, bot_cost=0.05, cores=4)
+
+        self.assertTrue(all(len(process) <= 20 for pool in pools for process in pool))
+        self.assertEqual(sum(len(pool) for pool in pools), 50)
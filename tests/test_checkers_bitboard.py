@@ -0,0 +1,99 @@
+import unittest
+import numpy as np
+from src.checkers.bitboard import BitboardCheckersBoard, coordinates_of, square_of
+from src.checkers.checkers_board import CheckersBoard
+from src.checkers.checkers_board import initial_board
+
+
+def state(board, player="r"):
+    return {"board": board, "player": player, "last_move": [], "game_status": "playing", "your_move": True}
+
+def board_with(pieces):
+    board = [[" "] * 8 for _ in range(8)]
+    for (x, y), piece in pieces.items():
+        board[x][y] = piece
+    return board
+
+
+class TestBitboardCheckersBoard(unittest.TestCase):
+
+    def assertSameAsReference(self, reference: CheckersBoard, bitboard: BitboardCheckersBoard):
+        self.assertListEqual(bitboard.get_possible_moves(), reference.get_possible_moves())
+        self.assertListEqual(bitboard.board, reference.board)
+        self.assertDictEqual(bitboard.steps_without_hitting, reference.steps_without_hitting)
+        self.assertEqual(bitboard.get_win(), reference.get_win())
+
+    def test_random_games_have_the_same_moves(self):
+        rng = np.random.default_rng(2137)
+        for _ in range(20):
+            reference = CheckersBoard(state(initial_board()))
+            bitboard = BitboardCheckersBoard(state(initial_board()))
+            for _ in range(150):
+                self.assertSameAsReference(reference, bitboard)
+                moves = reference.get_possible_moves()
+                if not moves or reference.get_win(): break
+                move = moves[rng.integers(len(moves))]
+                reference, bitboard = reference.make_move(move), bitboard.make_move(move)
+                self.assertEqual(bitboard.current_player, reference.current_player)
+
+    def test_long_chains_are_followed_to_the_end(self):
+        pieces = {(0, 1): "R", (1, 2): "a", (3, 2): "a", (5, 2): "a", (5, 4): "a", (3, 6): "a", (7, 6): "a"}
+        reference = CheckersBoard(state(board_with(pieces)))
+        bitboard = BitboardCheckersBoard(state(board_with(pieces)))
+
+        self.assertSameAsReference(reference, bitboard)
+        self.assertListEqual(bitboard.get_possible_moves(), [[[0, 1], [2, 3], [4, 1], [6, 3], [4, 5], [2, 7]]])
+
+    def test_chain_returning_to_its_starting_square(self):
+        pieces = {(0, 3): "R", (1, 2): "a", (3, 2): "a", (3, 4): "a", (1, 4): "a"}
+        self.assertSameAsReference(CheckersBoard(state(board_with(pieces))), BitboardCheckersBoard(state(board_with(pieces))))
+
+    def test_man_promoted_during_chain_continues_as_king(self):
+        pieces = {(5, 2): "r", (6, 3): "a", (6, 5): "a", (1, 0): "a"}
+        reference = CheckersBoard(state(board_with(pieces)))
+        bitboard = BitboardCheckersBoard(state(board_with(pieces)))
+
+        self.assertSameAsReference(reference, bitboard)
+        self.assertListEqual(bitboard.get_possible_moves(), [[[5, 2], [7, 4], [5, 6]]])
+        self.assertSameAsReference(reference.make_move([[5, 2], [7, 4], [5, 6]]), bitboard.make_move([[5, 2], [7, 4], [5, 6]]))
+
+    def test_pushed_moves_are_undone(self):
+        bitboard = BitboardCheckersBoard(state(initial_board()))
+        initial = bitboard.to_state()
+        for move in bitboard.moves():
+            bitboard.push(move)
+            bitboard.push(bitboard.moves()[0])
+            bitboard.pop()
+            self.assertEqual(bitboard.current_player, "a")
+            bitboard.pop()
+        self.assertDictEqual(bitboard.to_state(), initial)
+        self.assertDictEqual(bitboard.steps_without_hitting, {"r": 0, "a": 0})
+        with self.assertRaises(IndexError):
+            bitboard.pop()
+
+    def test_jumps_for_positions(self):
+        pieces = {(2, 3): "r", (3, 4): "a", (3, 2): "A", (5, 6): "r"}
+        reference = CheckersBoard(state(board_with(pieces)))
+        bitboard = BitboardCheckersBoard(state(board_with(pieces)))
+        for x in range(8):
+            for y in range(8):
+                for player in "ra":
+                    self.assertListEqual(bitboard.get_possible_jump_for_position(x, y, player),
+                                         reference.get_possible_jump_for_position(x, y, player))
+
+    def test_conversion_to_state_and_back(self):
+        board = board_with({(0, 1): "r", (2, 3): "R", (7, 6): "a", (4, 5): "A"})
+        bitboard = BitboardCheckersBoard(state(board, "a"))
+
+        self.assertListEqual(bitboard.board, board)
+        self.assertDictEqual(bitboard.to_state(), state(board, "a"))
+        self.assertEqual(bin(bitboard.kings).count("1"), 2)
+        self.assertEqual(coordinates_of(square_of(4, 5)), (4, 5))
+
+    def test_unsupported_boards(self):
+        with self.assertRaises(ValueError):
+            BitboardCheckersBoard(state(board_with({(0, 0): "r"})))
+        with self.assertRaises(ValueError):
+            BitboardCheckersBoard(state([[" "] * 10 for _ in range(10)]))
+        with self.assertRaises(ValueError):
+            BitboardCheckersBoard(state(board_with({(0, 1): "x"})))
@@ -0,0 +1,66 @@
+import copy
+import unittest
+from src.checkers.checkers_board import CheckersBoard
+from src.checkers.checkers_board import initial_board
+
+
+def state(board, player="r"):
+    return {"board": board, "player": player, "last_move": [], "game_status": "playing", "your_move": True}
+
+def board_with(pieces):
+    board = [[" "] * 8 for _ in range(8)]
+    for (x, y), piece in pieces.items():
+        board[x][y] = piece
+    return board
+
+
+class TestCheckersBoard(unittest.TestCase):
+
+    def test_chains_longer_than_four_jumps(self):
+        pieces = {(0, 1): "R", (1, 2): "a", (3, 2): "a", (5, 2): "a", (5, 4): "a", (3, 6): "a", (7, 6): "a"}
+        board = CheckersBoard(state(board_with(pieces)))
+        self.assertListEqual(board.get_possible_moves(), [[[0, 1], [2, 3], [4, 1], [6, 3], [4, 5], [2, 7]]])
+
+        after = board.make_move(board.get_possible_moves()[0])
+        self.assertEqual(sum(row.count("a") for row in after.board), 1)
+        self.assertEqual(after.board[2][7], "R")
+
+    def test_chain_of_king_may_return_to_its_starting_square(self):
+        pieces = {(0, 3): "R", (1, 2): "a", (3, 2): "a", (3, 4): "a", (1, 4): "a"}
+        moves = CheckersBoard(state(board_with(pieces))).get_possible_moves()
+        self.assertListEqual(moves, [[[0, 3], [2, 1], [4, 3], [2, 5], [0, 3]], [[0, 3], [2, 5], [4, 3], [2, 1], [0, 3]]])
+
+    def test_push_and_pop_restore_the_board(self):
+        board = CheckersBoard(state(initial_board()))
+        initial = (copy.deepcopy(board.board), dict(board.steps_without_hitting), board.current_player, board.last_move)
+        for move in board.get_possible_moves():
+            expected = board.make_move(move)
+            board.push(move)
+            self.assertListEqual(board.board, expected.board)
+            self.assertEqual(board.current_player, expected.current_player)
+            board.push(board.get_possible_moves()[0])
+            board.pop()
+            board.pop()
+            self.assertEqual((board.board, board.steps_without_hitting, board.current_player, board.last_move), initial)
+        with self.assertRaises(IndexError):
+            board.pop()
+
+    def test_make_move_does_not_change_the_board(self):
+        board = CheckersBoard(state(initial_board()))
+        board.push(board.get_possible_moves()[0])
+        after = board.make_move(board.get_possible_moves()[0])
+        self.assertIsNot(after.board, board.board)
+        board.pop()
+        self.assertEqual(after.current_player, "r")
+        with self.assertRaises(IndexError):
+            after.pop()
+
+    def test_moves_are_yielded_lazily(self):
+        pieces = {(2, 3): "r", (3, 4): "a", (3, 2): "a", (0, 1): "r"}
+        board = CheckersBoard(state(board_with(pieces)))
+        moves = board.iter_moves()
+        self.assertEqual(next(moves), [[2, 3], [4, 1]])
+        self.assertListEqual(list(moves), [[[2, 3], [4, 5]]])
+        self.assertListEqual(list(CheckersBoard(state(initial_board())).iter_moves()), CheckersBoard(state(initial_board())).get_possible_moves())
+        # simple moves are yielded regardless of jumps, iter_moves offers them only if there are no jumps
+        self.assertListEqual(list(board.iter_simple_moves()), [[[0, 1], [1, 0]], [[0, 1], [1, 2]]])
@@ -0,0 +1,93 @@
+import os
+import signal
+import unittest
+from time import perf_counter
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.parallel import _GRACE, ParallelSearch, _search_of_process
+from src.checkers.search import AlphaBetaSearch
+from src.checkers.checkers_board import initial_board
+
+
+def state(board, player="r"):
+    return {"board": board, "player": player, "last_move": [], "game_status": "playing", "your_move": True}
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_combines_at_common_depth(self):
+        search = ParallelSearch(2)
+        combine = search._ParallelSearch__combine
+        first = [(1, 5, (0, 4)), (2, 3, (0, 4)), (3, 9, (0, 4))]
+        second = [(1, 4, (1, 5)), (2, 7, (1, 5))]
+        self.assertEqual(combine([(first, False), (second, False)], [(0, 4), (1, 5)]), (1, 5))
+        self.assertEqual((search.depth, search.score), (2, 7))
+        self.assertEqual(combine([(first, False), (second, True)], [(0, 4), (1, 5)]), (0, 4))
+        self.assertEqual((search.depth, search.score), (3, 9))
+
+    def test_workers_without_completed_depth_are_ignored(self):
+        search = ParallelSearch(3)
+        combine = search._ParallelSearch__combine
+        first = [(1, 5, (0, 4)), (2, 3, (0, 4)), (3, 9, (0, 4))]
+        second = [(1, 4, (1, 5)), (2, 7, (1, 5))]
+        self.assertEqual(combine([(first, False), ([], False), (second, False)], [(8, 12), (0, 4), (1, 5)]), (1, 5))
+        self.assertEqual((search.depth, search.score), (2, 7))
+        self.assertEqual(combine([([], False), ([], True)], [(8, 12), (0, 4)]), (8, 12))
+
+    def test_searches_are_shared_by_equal_arguments(self):
+        search = _search_of_process(2, 1 << 12, 8)
+        self.assertIs(_search_of_process(2, 1 << 12, 8), search)
+        self.assertIsNot(_search_of_process(3, 1 << 12, 8), search)
+        self.assertIsNot(_search_of_process(2, 1 << 10, 8), search)
+
+    def test_waiting_for_workers_is_taken_from_budget(self):
+        search = ParallelSearch(2, 1 << 12)
+        self.addCleanup(search.close)
+        board = BitboardCheckersBoard(state(initial_board()))
+        lock = search._ParallelSearch__lock
+        lock.acquire()
+        try:
+            start = perf_counter()
+            move = search.search(board, 0.2)
+            self.assertLess(perf_counter() - start, 1.0)
+            self.assertIn(move, board.moves())
+        finally:
+            lock.release()
+
+    @unittest.skipUnless(hasattr(signal, "SIGSTOP"), "workers are suspended by SIGSTOP")
+    def test_hung_worker_is_killed(self):
+        search = ParallelSearch(2, 1 << 12)
+        self.addCleanup(search.close)
+        board = BitboardCheckersBoard(state(initial_board()))
+        search.start()
+        os.kill(search._ParallelSearch__processes[0].pid, signal.SIGSTOP)
+        start = perf_counter()
+        move = search.search(board, 0.1)
+        self.assertLess(perf_counter() - start, 0.1 + _GRACE + 2.0)
+        self.assertIn(move, board.moves())
+        self.assertListEqual(search._ParallelSearch__processes, [])
+        self.assertIn(search.search(board, None, 3), board.moves())
+
+    def test_same_score_as_serial_search(self):
+        search = ParallelSearch(2, 1 << 12)
+        self.addCleanup(search.close)
+        board = BitboardCheckersBoard(state(initial_board()))
+        serial = AlphaBetaSearch(1 << 12)
+        for _ in range(2):
+            move = search.search(board, None, 4)
+            serial.search(board, None, 4)
+            self.assertIn(move, board.moves())
+            self.assertEqual((search.depth, search.score), (4, serial.score))
+            board.push(move)
+
+    def test_falls_back_to_serial_search(self):
+        search = ParallelSearch(2, 1 << 12)
+        search.start()
+        search.close()
+        search.start = lambda: (_ for _ in ()).throw(OSError("no workers"))
+        board = BitboardCheckersBoard(state(initial_board()))
+        self.assertIn(search.search(board, None, 3), board.moves())
+        self.assertEqual(search.depth, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
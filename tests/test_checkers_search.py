@@ -0,0 +1,153 @@
+import threading
+import unittest
+from time import perf_counter
+import numpy as np
+from src import AlphaBetaBot
+from src.checkers.bitboard import BitboardCheckersBoard
+from src.checkers.search import MATE, AlphaBetaSearch, evaluate, zobrist
+from src.base._scheduler import _TickScheduler
+from src.base.replay import _unwrapped
+from src.checkers.checkers_board import initial_board
+
+
+def state(board, player="r", your_move=True):
+    return {"board": board, "player": player, "last_move": [], "game_status": "playing", "your_move": your_move}
+
+def board_with(pieces):
+    board = [[" "] * 8 for _ in range(8)]
+    for (x, y), piece in pieces.items():
+        board[x][y] = piece
+    return board
+
+
+class TestAlphaBetaSearch(unittest.TestCase):
+
+    def test_zobrist_of_transpositions(self):
+        first, second = BitboardCheckersBoard(state(initial_board())), BitboardCheckersBoard(state(initial_board()))
+        r1, r2 = first.moves()[0], first.moves()[-1]
+        first.push(r1)
+        a = first.moves()[0]
+        first.push(a)
+        first.push(r2)
+        second.push(r2)
+        second.push(a)
+        second.push(r1)
+        self.assertListEqual(first.board, second.board)
+        self.assertEqual(zobrist(first), zobrist(second))
+        second.pop()
+        self.assertNotEqual(zobrist(first), zobrist(second))
+
+    def test_evaluation_is_relative_to_player_to_move(self):
+        board = BitboardCheckersBoard(state(board_with({(2, 1): "r", (2, 3): "R", (5, 0): "a"})))
+        score = evaluate(board)
+        self.assertGreater(score, 0)
+        board.current_player = "a"
+        self.assertEqual(evaluate(board), -score)
+
+    def test_finds_winning_capture(self):
+        # either capture wins, the other man of "a" is blocked by men at (5, 6) and (4, 5)
+        board = BitboardCheckersBoard(state(board_with({(2, 1): "r", (2, 3): "r", (3, 2): "a", (4, 5): "r", (5, 6): "r", (6, 7): "a"})))
+        search = AlphaBetaSearch(table_size=1 << 10)
+        move = search.search(board, max_depth=4)
+        self.assertListEqual(board.get_possible_moves(), [[[2, 1], [4, 3]], [[2, 3], [4, 1]]])
+        self.assertIn(move, board.moves())
+        self.assertGreater(search.score, MATE - 1000)
+        self.assertEqual(search.depth, 1)
+
+    def test_avoids_losing_a_piece(self):
+        # stepping to (3, 2) or (3, 4) gives the man away, (3, 0) does not
+        board = BitboardCheckersBoard(state(board_with({(2, 1): "r", (4, 3): "a", (7, 0): "a"})))
+        move = AlphaBetaSearch(table_size=1 << 12).search(board, max_depth=4)
+        self.assertListEqual(board.get_possible_moves()[board.moves().index(move)], [[2, 1], [3, 0]])
+
+    def test_budget_is_respected_and_board_restored(self):
+        board = BitboardCheckersBoard(state(initial_board()))
+        search = AlphaBetaSearch(table_size=1 << 12)
+        move = search.search(board, budget=0.2)
+        self.assertIn(move, board.moves())
+        self.assertLess(search.elapsed, 0.5)
+        self.assertGreater(search.nodes_per_second, 0)
+        self.assertGreaterEqual(search.depth, 1)
+        self.assertListEqual(board.board, initial_board())
+        self.assertEqual(board.current_player, "r")
+
+    def test_search_is_interrupted(self):
+        board = BitboardCheckersBoard(state(initial_board()))
+        search = AlphaBetaSearch(table_size=1 << 12)
+        calls = []
+        move = search.search(board, interrupted=lambda: calls.append(None) or len(calls) > 3)
+        self.assertIn(move, board.moves())
+        self.assertFalse(search.finished)
+        self.assertEqual(len(calls), 4)
+        board.push(move)
+        self.assertIn(search.probe(board), board.moves())
+
+    def test_probe_finds_expected_reply_on_board_of_server(self):
+        search = AlphaBetaSearch(1 << 14)
+        board = BitboardCheckersBoard(state(initial_board()))
+        move = search.search(board, max_depth=4)
+        board.push(move)
+        stored = search.table[zobrist(board) & (len(search.table) - 1)]
+        # the server does not send counters of moves without hitting, they start from zero
+        sent = BitboardCheckersBoard(board.to_state())
+
+        self.assertNotEqual(zobrist(sent), zobrist(board))
+        self.assertEqual(search.probe(sent), stored[4])
+        self.assertIn(search.probe(sent), sent.moves())
+
+    def test_table_is_filled_within_its_size(self):
+        search = AlphaBetaSearch(table_size=1 << 6)
+        search.search(BitboardCheckersBoard(state(initial_board())), max_depth=5)
+        self.assertEqual(len(search.table), 1 << 6)
+        self.assertTrue(any(entry is not None for entry in search.table))
+        with self.assertRaises(ValueError):
+            AlphaBetaSearch(table_size=100)
+
+
+class TestAlphaBetaBot(unittest.TestCase):
+
+    def test_chooses_legal_move_on_its_turn(self):
+        bot = AlphaBetaBot(np.random.default_rng(0), budget=0.1)
+        _unwrapped(bot, "handle_new_states")(state(initial_board()))
+        move = _unwrapped(bot, "choose_action")().encode()["move"]
+        self.assertIn(move, BitboardCheckersBoard(state(initial_board())).get_possible_moves())
+
+        _unwrapped(bot, "handle_new_states")(state(initial_board(), your_move=False))
+        self.assertDictEqual(_unwrapped(bot, "choose_action")().encode(), {})
+
+    def test_ponders_on_expected_reply(self):
+        bot = AlphaBetaBot(np.random.default_rng(0), budget=0.1)
+        _unwrapped(bot, "handle_new_states")(state(initial_board()))
+        move = _unwrapped(bot, "choose_action")().encode()["move"]
+        board = BitboardCheckersBoard(state(initial_board()))
+        board = board.make_move(move)
+        waiting = board.to_state()
+        waiting["your_move"] = False
+        _unwrapped(bot, "handle_new_states")(waiting)
+        checks = []
+        bot.ponder(lambda: checks.append(None) or len(checks) > 20)
+        self.assertEqual(bot.ponders, 1)
+        self.assertListEqual(bot.current_state.board, board.board)
+        self.assertIn(bot.ponder_move, board.moves())
+
+        board.push(bot.ponder_move)
+        _unwrapped(bot, "handle_new_states")(board.to_state())
+        _unwrapped(bot, "choose_action")()
+        self.assertEqual(bot.ponder_hits, 1)
+
+    def test_pondering_is_not_cut_off_by_tick_timeout(self):
+        bot = AlphaBetaBot(np.random.default_rng(0), budget=0.1)
+        waiting = state(initial_board(), your_move=False)
+        _unwrapped(bot, "handle_new_states")(waiting)
+        scheduler = _TickScheduler("state", timeout=0.02)
+        scheduler.wait(0)
+        threading.Timer(0.3, scheduler.notify).start()
+        start = perf_counter()
+        bot.ponder(scheduler.has_new_state)
+        self.assertGreater(perf_counter() - start, 0.25)
+        self.assertEqual(bot.ponders, 1)
+
+    def test_unsupported_board_gets_random_move(self):
+        bot = AlphaBetaBot(np.random.default_rng(0), budget=0.1)
+        _unwrapped(bot, "handle_new_states")(state(initial_board(10)))
+        self.assertEqual(len(_unwrapped(bot, "choose_action")().encode()["move"]), 2)
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from src import AlphaBetaBot
+from src.base.replay import _unwrapped
+from src.checkers.bitboard import BitboardCheckersBoard, square_of
+from src.checkers.book import OpeningBook, _book_of_process, build_book
+from src.checkers.search import MATE, AlphaBetaSearch
+from src.checkers.tablebase import DRAW, LOSS, WIN, EndgameTablebase, _positions, build_tablebase
+from src.checkers.checkers_board import initial_board
+
+
+def initial():
+    return {"board": initial_board(), "player": "r", "last_move": [], "game_status": "playing", "your_move": True}
+
+def bits(*squares):
+    return sum(1 << square_of(x, y) for x, y in squares)
+
+
+class TestTablebase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "checkers_2.bbtb")
+        cls.tablebase = build_tablebase(cls.path, pieces=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        cls.directory.cleanup()
+
+    def test_values_agree_with_children(self):
+        for signature in ((0, 1, 0, 1), (1, 0, 0, 1)):
+            for red, ai, kings in _positions(signature):
+                for player in "ra":
+                    board = BitboardCheckersBoard.from_bitboards(red, ai, kings, player)
+                    result, distance = self.tablebase.probe(board)
+                    children = []
+                    for move in board.moves():
+                        board.push(move)
+                        children.append(self.tablebase.probe(board) if board.red and board.ai else (LOSS, 0))
+                        board.pop()
+                    losses = [child[1] for child in children if child[0] == LOSS]
+                    if result == WIN:
+                        self.assertEqual(distance, 1 + min(losses))
+                    elif result == LOSS:
+                        self.assertTrue(all(child[0] == WIN for child in children))
+                        self.assertEqual(distance, 1 + max((child[1] for child in children), default=-1))
+                    else:
+                        self.assertFalse(losses)
+                        self.assertIn(DRAW, [child[0] for child in children])
+
+    def test_capture_of_last_piece(self):
+        board = BitboardCheckersBoard.from_bitboards(bits((3, 2)), bits((4, 3)), bits((3, 2)), "r")
+        self.assertEqual(self.tablebase.probe(board), (WIN, 1))
+        board = BitboardCheckersBoard.from_bitboards(bits((3, 2)), bits((4, 3), (6, 5)), bits((3, 2)), "r")
+        self.assertIsNone(self.tablebase.probe(board))
+
+    def test_search_scores_endgames_by_tablebase(self):
+        # the king catches the man in the corner
+        board = BitboardCheckersBoard.from_bitboards(bits((0, 1)), bits((5, 0)), bits((0, 1)), "r")
+        self.assertEqual(self.tablebase.probe(board), (WIN, 7))
+        search = AlphaBetaSearch(table_size=1 << 10, tablebase=self.tablebase)
+        search.search(board, max_depth=2)
+        self.assertGreater(search.tablebase_hits, 0)
+        self.assertEqual((search.depth, search.score), (1, MATE - 7))
+
+        board.steps_without_hitting = {"r": 9, "a": 9}
+        search.search(board, max_depth=2)
+        self.assertEqual(search.tablebase_hits, 0)
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, "other.bbtb")
+        with open(path, "wb") as file:
+            file.write(b"\0" * 64)
+        with self.assertRaises(ValueError):
+            EndgameTablebase(path)
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.directory.name, "checkers.bbob")
+        build_book(cls.path, games=2, plies=3, budget=0.02, random_plies=1)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def test_book_moves_are_legal(self):
+        book = OpeningBook(self.path)
+        self.assertGreaterEqual(len(book), 3)
+        board = BitboardCheckersBoard(initial())
+        move, games = book.probe(board)
+        self.assertIn(move, board.moves())
+        self.assertIn(games, (1, 2))
+        board.push(board.moves()[-1])
+        board.push(board.moves()[-1])
+        board.push(board.moves()[-1])
+        self.assertIsNone(book.probe(board))
+        book.close()
+
+    def test_bot_plays_book_move_without_search(self):
+        bot = AlphaBetaBot(np.random.default_rng(0), budget=0.1, book=self.path)
+        self.assertIs(bot.book, _book_of_process(self.path))
+        _unwrapped(bot, "handle_new_states")(initial())
+        move = _unwrapped(bot, "choose_action")().chosen_move
+        board = BitboardCheckersBoard(initial())
+        self.assertListEqual(move, [list(square) for square in board.get_possible_moves()[board.moves().index(bot.book.probe(board)[0])]])
+        self.assertEqual(bot.search.nodes, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
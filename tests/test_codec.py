@@ -0,0 +1,32 @@
+import gzip
+import unittest
+import orjson
+from src.base.codec import RawCodec, GzipCodec, ZlibCodec
+
+STATE = {"p": {"n": "bot", "x": 10, "y": 20, "r": 5}, "f": [[1, 2], [3, 4]], "b": [100, 100], "d": False}
+
+class TestCodec(unittest.TestCase):
+
+    def test_round_trip(self):
+        for codec in (RawCodec(), GzipCodec(), ZlibCodec()):
+            with self.subTest(codec=type(codec).__name__):
+                self.assertDictEqual(codec.decode(codec.encode(STATE)), STATE)
+
+    def test_decode_from_memoryview(self):
+        for codec in (RawCodec(), GzipCodec(), ZlibCodec()):
+            with self.subTest(codec=type(codec).__name__):
+                buffer = bytearray(b"xx" + codec.encode(STATE))
+                self.assertDictEqual(codec.decode(memoryview(buffer)[2:]), STATE)
+
+    def test_gzip_codec_is_compatible_with_gzip_frames(self):
+        codec = GzipCodec()
+
+        self.assertDictEqual(codec.decode(gzip.compress(orjson.dumps(STATE))), STATE)
+        self.assertDictEqual(orjson.loads(gzip.decompress(codec.encode(STATE))), STATE)
+
+    def test_stream_mode_reuses_compression_context(self):
+        sender, receiver = ZlibCodec(stream=True), ZlibCodec(stream=True)
+        frames = [sender.encode(dict(STATE, t=tick)) for tick in range(3)]
+
+        self.assertLess(len(frames[1]), len(frames[0]))
+        self.assertListEqual([receiver.decode(frame)["t"] for frame in frames], [0, 1, 2])
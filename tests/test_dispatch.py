@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+import orjson
+from src.base._queues import _FrameQueue
+from src.base._dispatch import _StateDispatcher
+from src.agarnt.stateupdater import AgarntStateUpdater
+
+class TestStateDispatcher(unittest.TestCase):
+
+    def dispatch(self, frames, deliveries: int, conflate: bool, updater=None):
+        queue = _FrameQueue()
+
+        async def _put():
+            for frame in frames:
+                await queue.put((0.0, orjson.dumps(frame)))
+        asyncio.run(_put())
+
+        delivered = []
+        dispatcher = _StateDispatcher(queue, orjson.loads, lambda state: delivered.append(dict(state)), updater, conflate,
+                                      is_closed=lambda: len(delivered) == deliveries, poll_interval=0.01)
+        dispatcher.start()
+        dispatcher.join(1)
+        return dispatcher, delivered
+
+    def test_conflating_dispatcher_merges_every_frame_and_delivers_the_newest(self):
+        frames = [{"f": [[1, 1]], "tick": 0}, {"tick": 1}, {"tick": 2}]
+        dispatcher, delivered = self.dispatch(frames, 1, True, AgarntStateUpdater({}))
+
+        self.assertListEqual(delivered, [{"f": [[1, 1]], "tick": 2}])
+        self.assertEqual(dispatcher.received, 3)
+        self.assertEqual(dispatcher.delivered, 1)
+        self.assertEqual(dispatcher.conflated, 2)
+
+    def test_dispatcher_delivers_every_frame_in_order(self):
+        frames = [{"tick": tick} for tick in range(3)]
+        dispatcher, delivered = self.dispatch(frames, 3, False)
+
+        self.assertListEqual(delivered, frames)
+        self.assertEqual(dispatcher.conflated, 0)
@@ -0,0 +1,76 @@
+import unittest
+import numpy as np
+from src import AgarntStateUpdater, EntitySlots
+
+
+class TestEntitySlots(unittest.TestCase):
+
+    def test_entities_keep_their_slots(self):
+        slots = EntitySlots(2, capacity=2)
+        slots.sync(["a", "b"], [(1, 1), (2, 2)], 0)
+        a, b = slots.slot_of("a"), slots.slot_of("b")
+
+        slots.sync(["b", "c", "a"], [(2, 2), (3, 3), (1, 5)], 1)
+
+        self.assertEqual(slots.slot_of("a"), a)
+        self.assertEqual(slots.slot_of("b"), b)
+        self.assertEqual(len(slots), 3)
+        np.testing.assert_array_equal(slots.values[a], [1, 5])
+        np.testing.assert_array_equal(slots.values[slots.slot_of("c")], [3, 3])
+
+    def test_changes_since_tick(self):
+        slots = EntitySlots(2)
+        slots.sync(["a", "b", "c"], [(1, 1), (2, 2), (3, 3)], 0)
+        a, b, c = (slots.slot_of(key) for key in "abc")
+
+        slots.sync(["a", "b"], [(1, 1), (2, 4)], 1)
+        slots.sync(["a", "b", "d"], [(1, 1), (2, 4), (4, 4)], 2)
+        d = slots.slot_of("d")
+
+        self.assertListEqual(slots.changed_since(-1).tolist(), sorted([a, b, d]))
+        self.assertListEqual(slots.changed_since(0).tolist(), sorted([b, d]))
+        self.assertListEqual(slots.changed_since(1).tolist(), [d])
+        self.assertListEqual(slots.removed_since(0).tolist(), [c])
+        self.assertListEqual(slots.removed_since(1).tolist(), [])
+        # slot of removed entity is reused
+        self.assertEqual(d, c)
+
+    def test_repeated_keys_and_forgotten_history(self):
+        slots = EntitySlots(2, history=2)
+        slots.sync([(5, 5), (5, 5)], [(5, 5), (5, 5)], 0)
+        self.assertEqual(len(slots), 2)
+        self.assertIsNotNone(slots.slot_of(((5, 5), 1)))
+
+        for tick in range(1, 5):
+            slots.sync([(5, 5)], [(5, 5)], tick)
+
+        self.assertEqual(len(slots.active()), 1)
+        with self.assertRaises(ValueError):
+            slots.removed_since(0)
+
+    def test_diff_of_repeated_codes(self):
+        slots = EntitySlots(2, capacity=2)
+        slots.sync_codes(np.array([7, 5, 7]), np.array([[0, 7], [0, 5], [0, 7]]), 0)
+        kept = slots.slot_of(5)
+
+        slots.sync_codes(np.array([5, 7, 9, 9]), np.array([[0, 5], [0, 7], [0, 9], [0, 9]]), 1)
+
+        self.assertEqual(len(slots), 4)
+        self.assertEqual(slots.slot_of(5), kept)
+        self.assertEqual(len(slots.removed_since(0)), 1)
+        np.testing.assert_array_equal(slots.values[slots.changed_since(0)][:, 1], [9, 9])
+        self.assertListEqual(sorted(slots.codes[slots.active()].tolist()), [5, 7, 9, 9])
+
+    def test_incremental_updater_tracks_food_and_players(self):
+        updater = AgarntStateUpdater({}, incremental=True)
+        updater({"p": {"n": "bot", "x": 0, "y": 0, "r": 10}, "ps": [{"n": "a", "x": 5, "y": 5, "r": 5}],
+                 "f": [[1, 1], [2, 2]], "b": [100, 100], "delta": 0.05, "d": False})
+
+        observation = updater({"ps": [{"n": "a", "x": 6, "y": 5, "r": 5}], "f": [[2, 2], [3, 3]]})
+
+        self.assertEqual(observation.tick, 1)
+        food = observation.food_slots
+        np.testing.assert_array_equal(food.values[food.changed_since(0)], [[3, 3]])
+        self.assertEqual(len(food.removed_since(0)), 1)
+        players = observation.players_slots
+        np.testing.assert_array_equal(players.values[players.changed_since(0)], [[6, 5, 5]])
@@ -0,0 +1,148 @@
+import asyncio
+import unittest
+from functools import partial
+from time import sleep
+import numpy as np
+import requests
+import websockets
+from src import spawn_bots, RandomBot, _set_var, _get_var
+from src.base.codec import GzipCodec, ZlibCodec
+from src.localserver import LocalServer, AgarntGame, CheckersGame
+
+
+class TestAgarntGame(unittest.TestCase):
+
+    def test_player_moves_in_chosen_direction(self):
+        game = AgarntGame("test", food=0, seed=2137)
+        game.join("bot")
+        start = game.state_for("bot")["p"]
+
+        self.assertTrue(game.apply("bot", {"directions": {"L": False, "D": False, "R": True, "U": True}}))
+        game.step(0.1)
+        moved = game.state_for("bot")["p"]
+
+        self.assertGreater(moved["x"], start["x"])
+        self.assertGreater(moved["y"], start["y"])
+
+    def test_food_is_eaten_and_respawned(self):
+        game = AgarntGame("test", food=50, seed=2137)
+        game.join("bot")
+        body = game.bodies["bot"]
+        body.x, body.y = map(float, game.food[0])
+
+        game.step(0.05)
+
+        self.assertGreater(body.r, 10)
+        self.assertEqual(len(game.state_for("bot")["f"]), 50)
+
+    def test_bigger_player_eats_smaller_one(self):
+        game = AgarntGame("test", food=0, players=1, seed=2137)
+        game.join("bot")
+        bot, npc = game.bodies["bot"], game.bodies["npc_0"]
+        bot.r, npc.x, npc.y = 30.0, bot.x, bot.y
+
+        game.step(0.0)
+
+        self.assertTrue(game.state_for("npc_0")["d"])
+        self.assertListEqual(game.state_for("bot")["ps"], [])
+
+
+class TestCheckersGame(unittest.TestCase):
+
+    def test_game_starts_with_two_players(self):
+        game = CheckersGame("test")
+        game.join("first")
+        self.assertEqual(game.state_for("first")["game_status"], "waiting")
+
+        game.join("second")
+        self.assertFalse(game.join("third"))
+        self.assertTrue(game.state_for("first")["your_move"])
+        self.assertFalse(game.state_for("second")["your_move"])
+
+    def test_only_legal_moves_are_applied(self):
+        game = CheckersGame("test")
+        game.join("first")
+        game.join("second")
+        move = game.board.get_possible_moves()[0]
+
+        self.assertFalse(game.apply("second", {"move": move}))
+        self.assertFalse(game.apply("first", {"move": [[0, 0], [7, 7]]}))
+        self.assertTrue(game.apply("first", {"move": move}))
+        self.assertEqual(game.state_for("second")["last_move"], move)
+        self.assertTrue(game.state_for("second")["your_move"])
+
+
+class TestLocalServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(port=2180, http_port=2181, tick_rate=50)
+        cls.server.start()
+        cls.server.wait_ready()
+
+    def test_endpoints_of_botbattles_server(self):
+        codec = GzipCodec()
+
+        async def play():
+            async with websockets.connect("ws://127.0.0.1:2180/create_game?name=test&type=agarnt") as websocket:
+                session_id = await websocket.recv()
+            async with websockets.connect(f"ws://127.0.0.1:2180/join_to_game?player_name=bot&session_id={session_id}&is_spectator=False") as websocket:
+                state = codec.decode(await websocket.recv())
+                await websocket.send(codec.encode({"directions": {"L": True, "D": False, "R": False, "U": False}}))
+                await websocket.recv()
+            return session_id, state
+
+        session_id, state = asyncio.run(play())
+        info = requests.get(f"http://127.0.0.1:2181/games/{session_id}").json()
+
+        self.assertSetEqual(set(state), {"p", "ps", "f", "b", "delta", "d"})
+        self.assertEqual(info["game_type"], "agarnt")
+        self.assertListEqual(info["players"], ["bot"])
+        self.assertEqual(requests.get("http://127.0.0.1:2181/games/unknown").status_code, 404)
+
+    def test_every_client_has_its_own_stream_codec(self):
+        server = LocalServer(port=2182, http_port=None, tick_rate=50, codec_factory=partial(ZlibCodec, stream=True))
+        server.start()
+        server.wait_ready()
+        session_id = server.create_game("test", "agarnt")
+
+        async def play(name):
+            codec = ZlibCodec(stream=True)
+            async with websockets.connect(f"ws://127.0.0.1:2182/join_to_game?player_name={name}&session_id={session_id}&is_spectator=False") as websocket:
+                states = []
+                for _ in range(5):
+                    states.append(codec.decode(await websocket.recv()))
+                    await websocket.send(codec.encode({"directions": {"L": True, "D": False, "R": False, "U": False}}))
+                return states
+
+        async def play_together():
+            return await asyncio.gather(play("first"), play("second"))
+
+        try:
+            first, second = asyncio.run(play_together())
+        finally:
+            server.stop()
+
+        self.assertTrue(all(state["p"]["n"] == "first" for state in first))
+        self.assertTrue(all(state["p"]["n"] == "second" for state in second))
+        self.assertEqual(server.actions, 10)
+        self.assertEqual(server.invalid_actions, 0)
+
+    def test_spawned_bots_play_checkers_to_the_end(self):
+        game_type, http_port = _get_var("game_type"), _get_var("http_port")
+        # type of game is read from HTTP endpoint of server
+        _set_var("game_type", "")
+        _set_var("http_port", "2181")
+        try:
+            session_id = self.server.create_game("test", "checkers")
+            manager = spawn_bots("ws://127.0.0.1:2180", session_id, RandomBot, 2, generator=np.random.default_rng(2137))
+            for _ in range(200):
+                if self.server.sessions[session_id].game.winner: break
+                sleep(0.05)
+            manager.terminate(5)
+        finally:
+            _set_var("game_type", game_type)
+            _set_var("http_port", http_port)
+
+        self.assertIsNotNone(self.server.sessions[session_id].game.winner)
+        self.assertEqual(manager.summary()["connected_bots"], 2)
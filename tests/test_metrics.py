@@ -0,0 +1,35 @@
+import unittest
+from src.base._metrics import _BotMetrics, _Histogram, _new_counts, _summarize, _BOUNDS, _SLOT
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles_are_upper_bounds_of_buckets(self):
+        histogram = _Histogram()
+        for _ in range(98): histogram.add(1e-4)
+        histogram.add(1e-2)
+        histogram.add(20.0)
+
+        self.assertGreaterEqual(histogram.percentile(50), 1e-4)
+        self.assertLess(histogram.percentile(50), 2e-4)
+        self.assertGreaterEqual(histogram.percentile(99), 1e-2)
+        self.assertEqual(histogram.percentile(100), float("inf"))
+
+    def test_empty_histogram(self):
+        self.assertEqual(_Histogram().percentile(99), 0.0)
+
+    def test_shared_counters_keep_collected_samples(self):
+        metrics = _BotMetrics()
+        metrics.decode.add(1e-5)
+        shared = _new_counts(2)
+
+        metrics.share(shared[_SLOT:])
+        metrics.decode.add(1e-5)
+
+        self.assertEqual(sum(shared[:_SLOT]), 0)
+        self.assertEqual(_summarize(shared[_SLOT:])["decode_count"], 2)
+        self.assertEqual(metrics.summary()["decode_count"], 2)
+
+    def test_buckets_cover_microseconds_to_seconds(self):
+        self.assertAlmostEqual(_BOUNDS[0], 1e-6)
+        self.assertAlmostEqual(_BOUNDS[-1], 10.0)
@@ -0,0 +1,64 @@
+import itertools
+import unittest
+import numpy as np
+from src.agarnt.planner import DIRECTIONS, LookaheadPlanner, _MOVES
+
+
+def well(target):
+    """Potential with a single minimum at target."""
+    return lambda points: -np.exp(-np.hypot(*(points - np.asarray(target)).T) / 50)
+
+
+class TestLookaheadPlanner(unittest.TestCase):
+
+    def test_full_enumeration_equals_brute_force(self):
+        rng = np.random.default_rng(2137)
+        food = rng.integers(0, 200, (30, 2))
+        potential = lambda points: -np.exp(-np.min(np.hypot(*(points[:, None, :] - food[None]).transpose(2, 0, 1)), axis=1) / 10)
+        planner = LookaheadPlanner(depth=3, discount=0.5)
+        direction = planner.decide((100, 100), 7.5, (199, 199), potential)
+
+        best, best_score = None, np.inf
+        for sequence in itertools.product(range(len(DIRECTIONS)), repeat=3):
+            position, score = np.array([100.0, 100.0]), 0.0
+            for level, move in enumerate(sequence):
+                position = np.clip(position + _MOVES[move] * 7.5, 0, 199)
+                score += 0.5**level * potential(position.astype(np.int64)[None])[0]
+            if score < best_score: best, best_score = sequence, score
+        self.assertEqual(direction, DIRECTIONS[best[0]])
+        self.assertListEqual(planner.plan.tolist(), list(best))
+        self.assertEqual((planner.reached, planner.evaluated), (3, 8 + 64 + 512))
+
+    def test_goes_towards_minimum(self):
+        self.assertEqual(LookaheadPlanner(depth=2).decide((50, 50), 5, (99, 99), well((90, 90))), "RU")
+        self.assertEqual(LookaheadPlanner(depth=4, beam=16).decide((50, 50), 5, (99, 99), well((10, 50))), "L")
+
+    def test_zero_potential_gives_no_direction(self):
+        planner = LookaheadPlanner(depth=2)
+        self.assertIsNone(planner.decide((50, 50), 5, (99, 99), lambda points: np.zeros(len(points))))
+        self.assertEqual(len(planner.plan), 0)
+
+    def test_beam_limits_expanded_sequences(self):
+        planner = LookaheadPlanner(depth=4, beam=10)
+        planner.decide((50, 50), 5, (99, 99), well((90, 10)))
+        self.assertEqual(planner.evaluated, 8 + 64 + 80 + 80)
+
+    def test_previous_plan_is_reused_when_budget_is_exhausted(self):
+        planner = LookaheadPlanner(depth=3)
+        self.assertEqual(planner.decide((50, 50), 5, (99, 99), well((90, 50))), "R")
+        plan = planner.plan.tolist()
+        planner.budget = 0
+        self.assertEqual(planner.decide((55, 50), 5, (99, 99), lambda points: self.fail("potential evaluated")), DIRECTIONS[plan[1]])
+        self.assertListEqual(planner.plan.tolist(), plan[1:])
+
+    def test_budget_reduces_depth(self):
+        def slow(points):
+            for _ in range(len(points)): np.exp(np.zeros(1000))
+            return np.ones(len(points))
+        planner = LookaheadPlanner(depth=6, budget=0.01)
+        planner.decide((50, 50), 5, (99, 99), slow)
+        self.assertLess(planner.reached, 6)
+
+    def test_depth_has_to_be_positive(self):
+        with self.assertRaises(ValueError):
+            LookaheadPlanner(depth=0)
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+from src import AgarntObservation, GradAgent
+from src.agarnt.potential import FoodPotential, PlayersPotential, gaussian
+from src.base.replay import _unwrapped
+
+
+def state(food, players=(), board=100):
+    return {"p": {"n": "bot", "x": 50, "y": 50, "r": 5},
+            "ps": [{"n": f"p{i}", "x": x, "y": y, "r": r} for i, (x, y, r) in enumerate(players)],
+            "f": [list(f) for f in food], "b": [board, board], "delta": 0.05, "d": False}
+
+
+class TestFoodPotential(unittest.TestCase):
+
+    def test_sparse_values_equal_dense_field(self):
+        rng = np.random.default_rng(2137)
+        field = FoodPotential()
+        for _ in range(50):
+            board = int(rng.integers(30, 150))
+            food = rng.integers(0, board, (int(rng.integers(0, 40)), 2))
+            points = rng.integers(0, board, (16, 2))
+            dense = field.dense(food, (board, board))
+            np.testing.assert_array_equal(field.at(food, points), dense[points[:, 0], points[:, 1]])
+
+    def test_food_near_edges_of_board(self):
+        field = FoodPotential(radius=5, fwhm=5)
+        food = np.array([[0, 0], [5, 29], [29, 14]])
+        dense = field.dense(food, (30, 30))
+        points = np.argwhere(np.ones((30, 30), dtype=bool))
+        np.testing.assert_array_equal(field.at(food, points), dense.ravel())
+
+    def test_no_food_or_points(self):
+        field = FoodPotential()
+        np.testing.assert_array_equal(field.at(np.zeros((0, 2)), [[1, 2], [3, 4]]), [0.0, 0.0])
+        self.assertEqual(field.at([[1, 2]], np.zeros((0, 2))).shape, (0,))
+
+    def test_food_near_points_is_read_from_index(self):
+        rng = np.random.default_rng(7)
+        food = rng.integers(0, 300, (500, 2)).tolist()
+        observation = AgarntObservation(incremental=True)
+        field = FoodPotential()
+        for _ in range(5):
+            for _ in range(10):
+                food[rng.integers(len(food))] = rng.integers(0, 300, 2).tolist()
+            observation.update(state(food, board=300))
+            points = rng.integers(100, 200, (8, 2))
+            np.testing.assert_array_equal(field.near(observation.food_index, points), field.at(observation.food, points))
+
+    def test_kernels_are_cached_and_read_only(self):
+        self.assertIs(gaussian(40, 20, (20, 20), -1), FoodPotential().kernel)
+        with self.assertRaises(ValueError):
+            FoodPotential().kernel[0, 0] = 0
+
+
+class TestPlayersPotential(unittest.TestCase):
+
+    def test_closed_form_equals_rasterized_gaussians(self):
+        players_xy, players_r = np.array([[10, 20], [30, 5], [25, 25]]), np.array([8, 3, 12])
+        x = np.arange(40, dtype=np.float64)
+        repulsion, attraction = np.zeros((40, 40)), np.zeros((40, 40))
+        for (px, py), r in zip(players_xy, players_r):
+            threat = r >= 8
+            values = (5 if threat else -5) * np.exp(-4 * np.log(2) * ((x[:, None] - px)**2 + (x[None, :] - py)**2) / (r * (2 if threat else 15))**2)
+            if threat: repulsion += values
+            else: attraction = np.fmin(attraction, values)
+        points = np.argwhere(np.ones((40, 40), dtype=bool))
+
+        sums, minima = PlayersPotential().at(players_xy, players_r, 8, points)
+        np.testing.assert_allclose(sums, repulsion.ravel())
+        np.testing.assert_allclose(minima, attraction.ravel())
+
+    def test_no_players(self):
+        sums, minima = PlayersPotential().at(np.zeros((0, 2)), np.zeros(0), 10, [[1, 2]])
+        np.testing.assert_array_equal(sums, [0.0])
+        np.testing.assert_array_equal(minima, [0.0])
+
+
+class TestGradAgent(unittest.TestCase):
+
+    def choose(self, agent, food, players=()):
+        _unwrapped(agent, "handle_new_states")(state(food, players))
+        return _unwrapped(agent, "choose_action")().encode()["directions"]
+
+    def test_goes_towards_food(self):
+        for incremental in (False, True):
+            self.assertTrue(self.choose(GradAgent(np.random.default_rng(0), incremental=incremental), [[75, 50]])["R"])
+
+    def test_avoids_bigger_and_chases_smaller_players(self):
+        self.assertTrue(self.choose(GradAgent(np.random.default_rng(0)), [], [(60, 50, 20)])["L"])
+        self.assertTrue(self.choose(GradAgent(np.random.default_rng(0)), [], [(50, 30, 2)])["D"])
+        self.assertTrue(self.choose(GradAgent(np.random.default_rng(0), players=False), [[75, 50]], [(60, 50, 20)])["R"])
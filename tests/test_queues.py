@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import unittest
+from src.base._queues import _SendQueue, _FrameQueue
+
+class TestSendQueue(unittest.TestCase):
+
+    def drain(self, queue: _SendQueue, count: int):
+        async def _drain():
+            return [(await queue.get())[0] for _ in range(count)]
+        return asyncio.run(_drain())
+
+    def test_actions_of_same_tick_are_coalesced(self):
+        queue = _SendQueue(maxsize=4)
+        queue.put(1, b"a")
+        queue.put(1, b"b")
+        queue.put(2, b"c")
+
+        self.assertEqual(queue.pending, 2)
+        self.assertEqual(queue.coalesced, 1)
+        self.assertListEqual(self.drain(queue, 2), [b"b", b"c"])
+
+    def test_drop_policy_drops_the_oldest_action(self):
+        queue = _SendQueue(maxsize=2, policy="drop")
+        for tick in range(4):
+            self.assertTrue(queue.put(tick, bytes([tick])))
+
+        self.assertEqual(queue.dropped, 2)
+        self.assertListEqual(self.drain(queue, 2), [b"\x02", b"\x03"])
+
+    def test_block_policy_times_out_if_queue_is_full(self):
+        queue = _SendQueue(maxsize=1, policy="block")
+        queue.put(0, b"a")
+
+        self.assertTrue(queue.full)
+        self.assertFalse(queue.put(1, b"b", timeout=0.01))
+        self.assertEqual(queue.dropped, 1)
+
+    def test_clear_drops_pending_actions(self):
+        queue = _SendQueue(maxsize=4)
+        queue.put(0, b"a")
+        queue.put(1, b"b")
+
+        self.assertEqual(queue.clear(), 2)
+        self.assertEqual(queue.pending, 0)
+        queue.put(2, b"c")
+        self.assertListEqual(self.drain(queue, 1), [b"c"])
+
+    def test_get_waits_for_action_of_another_thread(self):
+        queue = _SendQueue()
+
+        async def _get():
+            waiting = asyncio.ensure_future(queue.get())
+            await asyncio.sleep(0.01)
+            threading.Thread(target=queue.put, args=(0, b"a")).start()
+            return await asyncio.wait_for(waiting, 1)
+
+        self.assertTupleEqual(asyncio.run(_get()), (b"a", None))
+        self.assertEqual(queue.sent, 1)
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            _SendQueue(policy="unknown")
+
+
+class TestFrameQueue(unittest.TestCase):
+
+    def test_take_returns_all_pending_frames_in_order(self):
+        queue = _FrameQueue()
+
+        async def _put():
+            for frame in (b"a", b"b", b"c"):
+                await queue.put(frame)
+        asyncio.run(_put())
+
+        self.assertListEqual(queue.take(0), [b"a", b"b", b"c"])
+        self.assertListEqual(queue.take(0), [])
+
+    def test_put_waits_for_dispatcher_if_queue_is_full(self):
+        queue = _FrameQueue(maxsize=1)
+
+        async def _put():
+            await queue.put(b"a")
+            threading.Timer(0.01, queue.take).start()
+            await asyncio.wait_for(queue.put(b"b"), 1)
+        asyncio.run(_put())
+
+        self.assertEqual(queue.stalls, 1)
+        self.assertListEqual(queue.take(0), [b"b"])
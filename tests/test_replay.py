@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from time import sleep
+import numpy as np
+from src import spawn_bots, set_connection_options, _get_connection_options, _set_var, _get_var
+from src import Agent, AgarntAction, CloseFoodAgent, RandomAgent
+from src.base.codec import GzipCodec, RawCodec
+from src.base.replay import Recorder, Recording, replay
+from src.localserver import AgarntGame, LocalServer
+
+
+class CountingAgent(Agent):
+
+    def __init__(self, limit: int =None):
+        super().__init__(AgarntAction)
+        self.states = []
+        self.limit = limit
+
+    def choose_action(self):
+        return self.action_provider.decode({"directions": {"L": True, "D": False, "R": False, "U": False}})
+
+    def handle_new_states(self, msg):
+        self.states.append(msg)
+
+    @property
+    def is_done(self):
+        return self.limit is not None and len(self.states) >= self.limit
+
+    def update(self):
+        ...
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "bot.bbr")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def __record(self, states, codec=RawCodec()):
+        with Recorder(self.path, "test") as recorder:
+            for tick, state in enumerate(states):
+                recorder.write(10.0 + 0.01 * tick, codec.encode(state))
+
+    def test_frames_and_arrival_times_are_kept(self):
+        with Recorder(self.path, "checkers") as recorder:
+            recorder.write(5.0, b"\x00binary")
+            recorder.write(5.5, '{"text": true}')
+
+        with Recording(self.path) as recording:
+            self.assertEqual(recording.game_type, "checkers")
+            self.assertListEqual(recording.times, [0.0, 0.5])
+            frames = [frame if isinstance(frame, str) else bytes(frame) for _, frame in recording]
+        self.assertListEqual(frames, [b"\x00binary", '{"text": true}'])
+
+    def test_truncated_record_is_skipped(self):
+        self.__record([{"t": 0}, {"t": 1}])
+        with open(self.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.path) - 2)
+
+        with Recording(self.path) as recording:
+            self.assertEqual(len(recording), 1)
+
+    def test_not_a_recording(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not a recording at all")
+
+        with self.assertRaises(ValueError):
+            Recording(self.path)
+
+    def test_replay_feeds_agent_without_connection(self):
+        states = [{"p": {"n": "bot", "x": tick, "y": 0, "r": 10}, "ps": [], "f": [], "b": [100, 100], "d": False} for tick in range(5)]
+        self.__record(states)
+        agent = CountingAgent()
+
+        with Recording(self.path) as recording:
+            result = replay(agent, recording, codec=RawCodec())
+
+        self.assertListEqual(agent.states, states)
+        self.assertEqual(result["frames"], 5)
+        self.assertEqual(result["decisions"], 5)
+        self.assertEqual(result["decision_count"], 5)
+
+    def test_replay_keeps_pace_and_stops_when_agent_is_done(self):
+        self.__record([{"t": tick} for tick in range(10)])
+        agent = CountingAgent(limit=4)
+
+        with Recording(self.path) as recording:
+            result = replay(agent, recording, pace=1.0, codec=RawCodec())
+
+        self.assertEqual(result["frames"], 4)
+        self.assertGreaterEqual(result["wall_time"], 0.03)
+
+
+class TestRecordingOfBots(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalServer(port=2190, http_port=None, tick_rate=20, food=50, seed=2137)
+        cls.server.start()
+        cls.server.wait_ready()
+
+    def test_recorded_game_is_replayed(self):
+        options, game_type = _get_connection_options(), _get_var("game_type")
+        with tempfile.TemporaryDirectory() as directory:
+            _set_var("game_type", "agarnt")
+            set_connection_options(record_path=os.path.join(directory, "{pid}_{bot}.bbr"))
+            try:
+                session_id = self.server.create_game("test_replay", "agarnt")
+                manager = spawn_bots("ws://127.0.0.1:2190", session_id, RandomAgent, 1, generator=np.random.default_rng(2137))
+                sleep(1.0)
+                manager.terminate(5)
+            finally:
+                set_connection_options(**options)
+                _set_var("game_type", game_type)
+
+            paths = os.listdir(directory)
+            self.assertEqual(len(paths), 1)
+            with Recording(os.path.join(directory, paths[0])) as recording:
+                self.assertGreater(len(recording), 5)
+                first = GzipCodec().decode(recording[0])
+                result = replay(CloseFoodAgent(np.random.default_rng(2137)), recording)
+
+        self.assertSetEqual(set(first), {"p", "ps", "f", "b", "delta", "d"})
+        self.assertGreater(result["decisions"], 0)
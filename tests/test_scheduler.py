@@ -0,0 +1,64 @@
+import threading
+import unittest
+from time import perf_counter
+from src.base._scheduler import _TickScheduler
+
+class TestTickScheduler(unittest.TestCase):
+
+    def test_agent_is_woken_up_by_new_state(self):
+        scheduler = _TickScheduler("state", timeout=10)
+        self.assertTrue(scheduler.wait(0))
+        self.assertFalse(scheduler.wait(0.01))
+
+        threading.Timer(0.01, scheduler.notify, args=({"delta": 0.05},)).start()
+        start = perf_counter()
+        self.assertTrue(scheduler.wait(1))
+        self.assertLess(perf_counter() - start, 0.5)
+
+    def test_agent_decides_without_state_after_timeout(self):
+        scheduler = _TickScheduler("state", timeout=0.02)
+        scheduler.wait(0)
+
+        self.assertTrue(scheduler.wait(1))
+
+    def test_max_rate_limits_decisions(self):
+        scheduler = _TickScheduler("state", max_rate=20, timeout=10)
+        scheduler.wait(0)
+        scheduler.notify()
+
+        self.assertFalse(scheduler.wait(0.01))
+        self.assertTrue(scheduler.wait(0.1))
+
+    def test_pace_is_derived_from_delta(self):
+        scheduler = _TickScheduler("pace", pace=2, timeout=10)
+        scheduler.notify({"delta": 0.02})
+        scheduler.wait(0)
+
+        self.assertFalse(scheduler.wait(0.02))
+        self.assertTrue(scheduler.wait(0.1))
+
+    def test_new_state_does_not_consume_decision(self):
+        scheduler = _TickScheduler("state", timeout=10)
+        scheduler.wait(0)
+        self.assertFalse(scheduler.has_new_state())
+
+        scheduler.notify()
+        self.assertTrue(scheduler.has_new_state())
+        self.assertTrue(scheduler.wait(0))
+        self.assertFalse(scheduler.has_new_state())
+        scheduler.stop()
+        self.assertTrue(scheduler.has_new_state())
+
+    def test_pondering_outlasts_timeout_until_new_state(self):
+        scheduler = _TickScheduler("state", timeout=0.02)
+        scheduler.wait(0)
+        threading.Timer(0.15, scheduler.notify).start()
+        start = perf_counter()
+        while not scheduler.has_new_state():
+            self.assertLess(perf_counter() - start, 5)
+        self.assertGreater(perf_counter() - start, 0.1)
+        self.assertTrue(scheduler.wait(0))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            _TickScheduler("random")
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+from src import AgarntObservation
+from src.agarnt.spatial import GridIndex
+
+
+def by_distance(identifiers, points, point):
+    dists = np.hypot(points[identifiers, 0] - point[0], points[identifiers, 1] - point[1])
+    return identifiers[np.lexsort((identifiers, dists))]
+
+
+class TestGridIndex(unittest.TestCase):
+
+    def test_queries_match_scan(self):
+        rng = np.random.default_rng(2137)
+        for trial in range(100):
+            points = rng.integers(0, 1000, (int(rng.integers(1, 300)), 3))
+            index = GridIndex(None if trial % 2 else float(rng.choice([16, 64, 200])))
+            index.rebuild(points)
+            point, k, radius = rng.uniform(-100, 1100, 2), int(rng.integers(1, 5)), float(rng.uniform(0, 300))
+            every = by_distance(np.arange(len(points)), points, point)
+            smaller = every[points[every, 2] < 500]
+            inside = every[np.hypot(points[every, 0] - point[0], points[every, 1] - point[1]) < radius]
+
+            with self.subTest(trial=trial):
+                np.testing.assert_array_equal(index.nearest(point, k), every[:k])
+                np.testing.assert_array_equal(index.nearest(point, 1, lambda rows: rows[:, 2] < 500), smaller[:1])
+                np.testing.assert_array_equal(index.within(point, radius), inside)
+
+    def test_empty_index(self):
+        index = GridIndex()
+        index.rebuild(np.zeros((0, 2), dtype=np.int64))
+
+        self.assertEqual(len(index.nearest((1, 1))), 0)
+        self.assertEqual(len(index.within((1, 1), 10)), 0)
+
+    def test_index_of_incremental_observation_follows_changes(self):
+        rng = np.random.default_rng(2137)
+        observation = AgarntObservation(incremental=True)
+        food = rng.integers(0, 1000, (300, 2)).tolist()
+        for tick in range(60):
+            food[rng.integers(len(food))] = rng.integers(0, 1000, 2).tolist()
+            if tick % 3 == 0: food.append(rng.integers(0, 1000, 2).tolist())
+            if tick % 5 == 0: food.pop(0)
+            observation.update({"p": {"n": "bot", "x": 0, "y": 0, "r": 10}, "ps": [], "f": food, "b": [1000, 1000], "delta": 0.05, "d": False})
+            if tick % 7: continue
+
+            slots, point = observation.food_slots, rng.uniform(0, 1000, 2)
+            with self.subTest(tick=tick):
+                np.testing.assert_array_equal(observation.food_index.nearest(point, 3), by_distance(slots.active(), slots.values, point)[:3])
+                self.assertEqual(len(observation.food_index), len(slots))
+
+    def test_players_index_of_columnar_observation(self):
+        observation = AgarntObservation().update({"p": {"n": "bot", "x": 50, "y": 50, "r": 10}, "f": [], "b": [100, 100], "d": False,
+            "ps": [{"n": "big", "x": 52, "y": 50, "r": 30}, {"n": "small", "x": 60, "y": 50, "r": 5}], "delta": 0.05})
+
+        nearest = observation.players_index.nearest(observation.position, predicate=lambda rows: rows[:, 2] < observation.r)
+
+        self.assertEqual(observation.players_names[nearest[0]], "small")